@@ -4,10 +4,22 @@ PDF Logic module for the RTMC Scraper.
 This module provides functionality for downloading and extracting data from PDF files.
 """
 from .downloader import download_pdfs
+from .session import create_session
+from .manifest import DownloadManifest
+from .validation import is_valid_pdf_file
+from .content_store import ContentStore
+from .rate_limiter import AdaptiveRateLimiter
+from .link_discovery import discover_pdf_links
 from .pdf_reader import extract_year_from_pdf, extract_tables_from_pdf, extract_accident_data_from_tables, process_pdf_files
 
 __all__ = [
     'download_pdfs',
+    'create_session',
+    'DownloadManifest',
+    'is_valid_pdf_file',
+    'ContentStore',
+    'AdaptiveRateLimiter',
+    'discover_pdf_links',
     'extract_year_from_pdf',
     'extract_tables_from_pdf',
     'extract_accident_data_from_tables',
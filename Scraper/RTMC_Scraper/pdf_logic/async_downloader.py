@@ -0,0 +1,327 @@
+"""
+Asyncio PDF Downloader module for the RTMC Scraper.
+
+This module provides an asyncio implementation of the downloader built on aiohttp. A single
+event loop keeps many transfers in flight without a thread per download, and it follows the
+same contract as download_pdfs: the same manifest, resumable streaming, validation and
+ordered list of local paths. Disk writes, validation and hashing run in worker threads so
+they never stall the other transfers on the loop.
+"""
+import os
+import asyncio
+import random
+import threading
+from typing import List, Optional, Tuple
+from .session import DEFAULT_HEADERS
+from .manifest import DownloadManifest
+from .validation import is_valid_pdf_file
+from .rate_limiter import AdaptiveRateLimiter
+from .link_discovery import LinkCache, DEFAULT_LINK_CACHE_TTL
+from .downloader import (_build_jobs, _use_local_copy, _local_copy_after_failed_request, _add_to_store,
+                         _print_overall_progress, DEFAULT_ASYNC_CONCURRENCY)
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is an optional dependency
+    aiohttp = None
+
+
+def _require_aiohttp() -> None:
+    if aiohttp is None:
+        raise ImportError("The asyncio downloader requires aiohttp, install it with 'pip install aiohttp'")
+
+
+def _read_timeout(timeout: float) -> "aiohttp.ClientTimeout":
+    # Like the requests path, bound the connect and every read rather than the whole request,
+    # so time spent waiting for a per-host connection slot or on a large report does not count
+    return aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+
+
+async def fetch_pdf_links_async(client: "aiohttp.ClientSession", pdf_url: str, pdf_dir: str, headers: dict,
+                                timeout: int = 30, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                                ttl: float = DEFAULT_LINK_CACHE_TTL) -> List[str]:
+    """
+    Get the PDF links on the listing, from the link cache when it is fresh enough.
+
+    Args:
+        client: The aiohttp session to use
+        pdf_url: The URL of the listing page
+        pdf_dir: The directory that holds the link cache
+        headers: The headers to use for the request
+        timeout: The timeout in seconds for connecting and for each read
+        rate_limiter: The shared rate limiter
+        ttl: How long cached links are used without contacting the server, in seconds
+
+    Returns:
+        The hrefs ending in .pdf, in page order
+    """
+    cache = LinkCache(pdf_dir)
+    links = cache.lookup(pdf_url, ttl)
+    if links is not None:
+        return links
+
+    request_headers = dict(headers)
+    request_headers.update(cache.conditional_headers(pdf_url))
+    host = AdaptiveRateLimiter.host_of(pdf_url)
+    try:
+        if rate_limiter is not None:
+            await asyncio.sleep(rate_limiter.reserve(host))
+        async with client.get(pdf_url, headers=request_headers,
+                              timeout=_read_timeout(timeout)) as response:
+            if rate_limiter is not None:
+                rate_limiter.record_response(host, response.status, response.headers.get('Retry-After'))
+            if response.status == 304 and cache.cached_links(pdf_url) is not None:
+                return await asyncio.to_thread(cache.not_modified, pdf_url)
+            response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+            html = await response.text()
+            response_headers = dict(response.headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        stale_links = cache.stale_links(pdf_url)
+        if stale_links is None:
+            raise
+        return stale_links
+
+    # Parsing the listing and writing the cache would block the other transfers
+    return await asyncio.to_thread(cache.update, pdf_url, html, response_headers)
+
+
+async def download_single_pdf_async(client: "aiohttp.ClientSession", pdf_url: str, local_path: str, headers: dict,
+                                    max_retries: int = 3, timeout: int = 60, backoff_factor: float = 0.5,
+                                    manifest: Optional[DownloadManifest] = None,
+                                    deep_validation: bool = False,
+                                    rate_limiter: Optional[AdaptiveRateLimiter] = None) -> Tuple[bool, str]:
+    """
+    Download a single PDF file with retries, resuming interrupted transfers with Range requests.
+
+    Args:
+        client: The aiohttp session to use
+        pdf_url: The URL to download the PDF from
+        local_path: The local path to save the PDF to
+        headers: The headers to use for the request
+        max_retries: The maximum number of retries
+        timeout: The timeout in seconds for connecting and for each read
+        backoff_factor: The backoff factor for retries
+        manifest: The download manifest to read validators from and record the download in
+        deep_validation: Whether to fully parse the PDF instead of only checking its structure
+        rate_limiter: The shared rate limiter that paces requests and bandwidth per host
+
+    Returns:
+        A tuple of (success, message)
+    """
+    _require_aiohttp()
+    host = AdaptiveRateLimiter.host_of(pdf_url)
+    conditional_headers = manifest.conditional_headers(pdf_url, local_path) if manifest is not None else {}
+    part_path = f"{local_path}.part"
+    part_validator = None
+
+    # A partial file left by an earlier run cannot be matched to a server version, so start fresh
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
+    for attempt in range(max_retries):
+        try:
+            if attempt > 0:
+                sleep_time = backoff_factor * (2 ** attempt) + random.uniform(0, 0.1)
+                print(f"[RTMC] Retry {attempt}/{max_retries} after {sleep_time:.2f}s for {pdf_url}")
+                await asyncio.sleep(sleep_time)
+
+            request_headers = dict(headers)
+            resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if resume_from > 0 and part_validator:
+                request_headers['Range'] = f"bytes={resume_from}-"
+                request_headers['If-Range'] = part_validator
+            else:
+                resume_from = 0
+                request_headers.update(conditional_headers)
+
+            if rate_limiter is not None:
+                await asyncio.sleep(rate_limiter.reserve(host))
+
+            async with client.get(pdf_url, headers=request_headers,
+                                  timeout=_read_timeout(timeout)) as response:
+                if rate_limiter is not None:
+                    rate_limiter.record_response(host, response.status, response.headers.get('Retry-After'))
+
+                if response.status == 304 and manifest is not None:
+                    await asyncio.to_thread(manifest.touch, os.path.basename(local_path))
+                    return True, "Not modified"
+
+                if response.status == 416:
+                    os.remove(part_path)
+                    part_validator = None
+                    continue
+
+                if response.status == 206 and resume_from > 0:
+                    if not response.headers.get('Content-Range', '').startswith(f"bytes {resume_from}-"):
+                        os.remove(part_path)
+                        part_validator = None
+                        continue
+                    mode = 'ab'
+                elif response.status == 200:
+                    resume_from = 0
+                    mode = 'wb'
+                else:
+                    continue  # Try again if not 200
+
+                part_validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                total_size = int(response.headers.get('Content-Length', 0))
+                if total_size > 0:
+                    total_size += resume_from
+
+                downloaded = resume_from
+                with open(part_path, mode) as f:
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        await asyncio.to_thread(f.write, chunk)
+                        downloaded += len(chunk)
+                        if rate_limiter is not None:
+                            pause = rate_limiter.reserve_bytes(host, len(chunk))
+                            if pause > 0:
+                                await asyncio.sleep(pause)
+
+                if total_size > 0 and downloaded < total_size:
+                    print(f"[RTMC] Incomplete download of {pdf_url} ({downloaded}/{total_size} bytes)")
+                    continue
+
+                if not await asyncio.to_thread(is_valid_pdf_file, part_path, deep_validation):
+                    os.remove(part_path)
+                    return False, "Invalid PDF content"
+
+                os.replace(part_path, local_path)
+
+                if manifest is not None:
+                    await asyncio.to_thread(manifest.record, pdf_url, local_path, dict(response.headers))
+
+                return True, "Success"
+
+        except asyncio.TimeoutError:
+            print(f"[RTMC] Timeout downloading {pdf_url}")
+        except aiohttp.ClientError as e:
+            # Keep any partial file, the next attempt resumes from it
+            print(f"[RTMC] Connection error downloading {pdf_url}: {e}")
+        except Exception as e:
+            print(f"[RTMC] Unexpected error downloading {pdf_url}: {e}")
+
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    return False, f"Failed after {max_retries} attempts"
+
+
+async def download_pdfs_async(pdf_url: str, pdf_dir: str, max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY, max_per_host: int = 4,
+                              deep_validation: bool = False,
+                              rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                              link_cache_ttl: float = DEFAULT_LINK_CACHE_TTL) -> List[str]:
+    """
+    Download PDF files from the RTMC website on the running event loop.
+
+    Args:
+        pdf_url: The URL to download PDFs from
+        pdf_dir: The directory to save downloaded PDFs
+        max_concurrency: The maximum number of transfers in flight
+        max_per_host: The maximum number of concurrent connections per host
+        deep_validation: Whether to fully parse every PDF instead of the cached structural check
+        rate_limiter: The shared rate limiter; a default AdaptiveRateLimiter is used if None
+        link_cache_ttl: How long the cached listing is used without fetching it again, in seconds
+
+    Returns:
+        A list of paths to downloaded PDF files, in listing order, or an empty list if no PDFs were found
+    """
+    _require_aiohttp()
+    if rate_limiter is None:
+        rate_limiter = AdaptiveRateLimiter()
+    try:
+        os.makedirs(pdf_dir, exist_ok=True)
+        headers = dict(DEFAULT_HEADERS)
+        manifest = DownloadManifest(pdf_dir)
+        max_concurrency = max(1, max_concurrency)
+
+        # The connector pools keep-alive connections and enforces the per-host cap
+        connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=max(1, max_per_host))
+        async with aiohttp.ClientSession(connector=connector) as client:
+            try:
+                pdf_links = await fetch_pdf_links_async(client, pdf_url, pdf_dir, headers, rate_limiter=rate_limiter,
+                                                        ttl=link_cache_ttl)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[RTMC] Error fetching PDF links: {e}")
+                return []
+
+            if not pdf_links:
+                print(f"[RTMC] No PDF files found at {pdf_url}")
+                return []
+
+            print(f"[RTMC] Found {len(pdf_links)} PDF files")
+            jobs = _build_jobs(pdf_links, pdf_url, pdf_dir)
+            total_pdfs = len(jobs)
+            print(f"[RTMC] Starting download of {total_pdfs} PDF files ({max_concurrency} in flight, asyncio)")
+
+            semaphore = asyncio.Semaphore(max_concurrency)
+            done = 0
+
+            async def fetch(pdf_link: str, local_path: str) -> bool:
+                nonlocal done
+                filename = os.path.basename(local_path)
+                async with semaphore:
+                    if await asyncio.to_thread(_use_local_copy, pdf_link, local_path, manifest, deep_validation):
+                        success = True
+                    else:
+                        success, message = await download_single_pdf_async(
+                            client, pdf_link, local_path, headers, manifest=manifest,
+                            deep_validation=deep_validation, rate_limiter=rate_limiter)
+                        if not success:
+                            print(f"[RTMC] Failed to download {filename}: {message}")
+                            success = await asyncio.to_thread(_local_copy_after_failed_request, local_path,
+                                                              deep_validation)
+                done += 1
+                if success:
+                    print(f"[RTMC] Successfully downloaded {filename} ({done}/{total_pdfs})")
+                return success
+
+            results = await asyncio.gather(*(fetch(pdf_link, local_path) for pdf_link, local_path in jobs),
+                                           return_exceptions=True)
+
+        downloaded_pdfs = [local_path for (_, local_path), success in zip(jobs, results) if success is True]
+        _add_to_store(downloaded_pdfs, pdf_dir, manifest)
+        _print_overall_progress(total_pdfs, total_pdfs)
+        print(f"[RTMC] Successfully downloaded {len(downloaded_pdfs)}/{total_pdfs} PDF files")
+        print(f"[RTMC] Exact scraping location: {pdf_url}")
+        return downloaded_pdfs
+
+    except Exception as e:
+        print(f"[RTMC] Error downloading PDFs from {pdf_url}: {e}")
+        return []
+
+
+def run_download_pdfs_async(pdf_url: str, pdf_dir: str, max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY, max_per_host: int = 4,
+                            deep_validation: bool = False,
+                            rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                            link_cache_ttl: float = DEFAULT_LINK_CACHE_TTL) -> List[str]:
+    """
+    Run download_pdfs_async to completion from synchronous code.
+
+    When called from a thread that already runs an event loop (for example a Jupyter
+    notebook), the download runs on a fresh loop in a helper thread.
+
+    Args:
+        pdf_url: The URL to download PDFs from
+        pdf_dir: The directory to save downloaded PDFs
+        max_concurrency: The maximum number of transfers in flight
+        max_per_host: The maximum number of concurrent connections per host
+        deep_validation: Whether to fully parse every PDF instead of the cached structural check
+        rate_limiter: The shared rate limiter
+        link_cache_ttl: How long the cached listing is used without fetching it again, in seconds
+
+    Returns:
+        A list of paths to downloaded PDF files, in listing order
+    """
+    _require_aiohttp()
+    coroutine = download_pdfs_async(pdf_url, pdf_dir, max_concurrency, max_per_host, deep_validation, rate_limiter,
+                                    link_cache_ttl)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(asyncio.run(coroutine)))
+    thread.start()
+    thread.join()
+    return result[0] if result else []
@@ -0,0 +1,173 @@
+"""
+Extraction backend registry for the RTMC Scraper.
+
+This module keeps the table extraction backends (text layer, native tables, tabula, cell OCR,
+full-page OCR) in a registry with an estimated cost and a viability check each. A cheap probe
+of the PDF (page count, pages with a text layer, image coverage) decides which backends can
+work on a report and in which order to try them, so a scanned report never pays for a tabula
+pass and a born-digital one never reaches OCR. The outcome is remembered per content hash, so
+later runs go straight to the backend that worked and skip the ones that failed.
+"""
+import os
+import json
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+import fitz  # PyMuPDF
+from .content_store import ContentStore
+from .ocr import MIN_TEXT_LAYER_CHARS
+
+
+# Bump when backends or their costs change so remembered decisions are made again
+DECISION_VERSION = 1
+# A page without a text layer counts as scanned when images cover this much of it
+SCANNED_IMAGE_COVERAGE = 0.5
+
+
+class ExtractionBackend:
+    """
+    A way of extracting tables from a PDF.
+
+    Args:
+        name: The name used in config.txt and in remembered decisions
+        extract: Called with (pdf_path, full_document), returns a list of DataFrames
+        cost: Called with a probe, returns the estimated seconds to extract the report
+        viable: Called with a probe, returns whether the backend can find anything in the report
+    """
+    def __init__(self, name: str, extract: Callable[[str, bool], List[pd.DataFrame]],
+                 cost: Callable[[dict], float], viable: Callable[[dict], bool]):
+        self.name = name
+        self.extract = extract
+        self.cost = cost
+        self.viable = viable
+
+
+# Registered backends by name
+BACKENDS: Dict[str, ExtractionBackend] = {}
+
+
+def register_backend(backend: ExtractionBackend) -> None:
+    """
+    Add a backend to the registry, replacing any backend with the same name.
+
+    Args:
+        backend: The backend
+    """
+    BACKENDS[backend.name] = backend
+
+
+def probe_pdf(pdf_path: str) -> Optional[dict]:
+    """
+    Measure the cheap properties of a PDF that decide which backends can read it.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        A dictionary with page_count, text_pages, scanned_pages and image_coverage (the mean
+        fraction of a page covered by images), or None if PyMuPDF cannot open the PDF
+    """
+    try:
+        with fitz.open(pdf_path) as pdf_document:
+            text_pages = scanned_pages = 0
+            coverage = 0.0
+            for page in pdf_document:
+                area = abs(page.rect) or 1.0
+                covered = sum(abs(fitz.Rect(image['bbox']) & page.rect) for image in page.get_image_info())
+                page_coverage = min(1.0, covered / area)
+                coverage += page_coverage
+                if len(''.join(page.get_text().split())) >= MIN_TEXT_LAYER_CHARS:
+                    text_pages += 1
+                elif page_coverage >= SCANNED_IMAGE_COVERAGE:
+                    scanned_pages += 1
+            page_count = len(pdf_document)
+    except Exception as e:
+        print(f"[RTMC] Error probing {pdf_path}: {e}")
+        return None
+    return {
+        'page_count': page_count,
+        'text_pages': text_pages,
+        'scanned_pages': scanned_pages,
+        'image_coverage': coverage / page_count if page_count else 0.0,
+    }
+
+
+def rank_backends(probe: Optional[dict], preferred: Optional[str] = None) -> List[ExtractionBackend]:
+    """
+    Order the viable backends for a report from cheapest to most expensive.
+
+    Args:
+        probe: The probe of the report, or None if it could not be probed
+        preferred: A backend to try first regardless of cost
+
+    Returns:
+        The backends to try, in order. Without a probe every backend is viable and the
+        registration order is kept.
+    """
+    if probe is None:
+        backends = list(BACKENDS.values())
+    else:
+        backends = sorted((backend for backend in BACKENDS.values() if backend.viable(probe)),
+                          key=lambda backend: backend.cost(probe))
+    if preferred in BACKENDS:
+        backends = [BACKENDS[preferred]] + [backend for backend in backends if backend.name != preferred]
+    return backends
+
+
+class BackendDecision:
+    """
+    The remembered outcome of extracting one report.
+
+    Args:
+        path: The decision file, or None if it cannot be stored
+        probe: The probe of the report
+        backend: The backend that found tables, or None
+        failed: Backends that ran without errors but found no accident tables in this report
+    """
+    def __init__(self, path: Optional[str], probe: Optional[dict] = None, backend: Optional[str] = None,
+                 failed: Optional[List[str]] = None):
+        self.path = path
+        self.probe = probe
+        self.backend = backend
+        self.failed = failed or []
+
+    @classmethod
+    def for_pdf(cls, pdf_path: str, scope: str) -> "BackendDecision":
+        """
+        Load the decision for a PDF from the content store, or start an empty one.
+
+        Args:
+            pdf_path: Path to the PDF file
+            scope: "full" or "selected", decisions depend on the pages extracted
+
+        Returns:
+            The BackendDecision for the PDF's content
+        """
+        try:
+            store = ContentStore.for_pdf(pdf_path)
+            path = os.path.join(store.cache_dir("backends"), f"{store.hash_for(pdf_path)}.{scope}.json")
+        except Exception as e:
+            print(f"[RTMC] Error locating backend decision for {pdf_path}: {e}")
+            return cls(None)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == DECISION_VERSION:
+                return cls(path, data.get('probe'), data.get('backend'), data.get('failed'))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[RTMC] Error reading backend decision for {pdf_path}: {e}")
+        return cls(path)
+
+    def save(self) -> None:
+        """Write the decision to the content store."""
+        if not self.path:
+            return
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': DECISION_VERSION, 'probe': self.probe,
+                           'backend': self.backend, 'failed': self.failed}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[RTMC] Error saving backend decision: {e}")
@@ -0,0 +1,202 @@
+"""
+Table cell OCR module for the RTMC Scraper.
+
+This module finds the cells of a table on a scanned page geometrically and OCRs them one
+line at a time instead of reading the whole page as free text. Label cells (the header row
+and the first column) are read with the normal alphabet; the figures are read with a digit
+whitelist, in one batch per page. The result is a DataFrame per table that can go straight to
+extract_accident_data_from_tables.
+"""
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import fitz  # PyMuPDF
+from PIL import Image
+from .ocr import render_page, pixmap_to_image
+from .ocr_engine import DEFAULT_OCR_ENGINE, get_ocr_engine
+from .preprocess import adaptive_threshold, to_grayscale
+
+
+DIGIT_WHITELIST = "0123456789"
+# DPI cells are rendered at, digits need more resolution than page text
+CELL_OCR_DPI = 300
+# Rows or columns inked over more than this fraction of their length are ruling lines
+RULING_FRACTION = 0.6
+# Horizontal gap separating two columns, as a fraction of the page width
+COLUMN_GAP_FRACTION = 0.02
+# Tables need at least this many rows and columns to be read as tables
+MIN_TABLE_ROWS = 2
+MIN_TABLE_COLUMNS = 2
+
+
+def _runs(mask: np.ndarray, min_gap: int = 1) -> List[Tuple[int, int]]:
+    """Find the [start, end) runs of True in a 1D mask, merging runs closer than min_gap."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    runs = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if runs and start - runs[-1][1] < min_gap:
+            runs[-1] = (runs[-1][0], int(end))
+        else:
+            runs.append((int(start), int(end)))
+    return runs
+
+
+def remove_ruling_lines(ink: np.ndarray) -> np.ndarray:
+    """
+    Remove the ruling lines of a table so only the cell contents remain.
+
+    Args:
+        ink: A 2D boolean array that is True for ink
+
+    Returns:
+        A copy of ink with long horizontal and vertical lines cleared
+    """
+    ink = ink.copy()
+    height, width = ink.shape
+    ink[ink.sum(axis=1) > RULING_FRACTION * width, :] = False
+    ink[:, ink.sum(axis=0) > RULING_FRACTION * height] = False
+    return ink
+
+
+def detect_table_cells(ink: np.ndarray, min_column_gap: int = 0) -> List[List[Optional[Tuple[int, int, int, int]]]]:
+    """
+    Find the grid of cells of a table on a page.
+
+    Text lines are found from the row projection of the ink. Lines that split into at least
+    two widely spaced segments belong to the table, and its columns are the runs of the
+    union of those segments.
+
+    Args:
+        ink: A 2D boolean array that is True for ink
+        min_column_gap: The blank width that separates columns (0 derives it from the page width)
+
+    Returns:
+        A list of rows, each a list with the (left, top, right, bottom) box of every column,
+        or None where the cell is empty. An empty list if no table was found.
+    """
+    ink = remove_ruling_lines(ink)
+    height, width = ink.shape
+    if not min_column_gap:
+        min_column_gap = max(8, int(width * COLUMN_GAP_FRACTION))
+
+    table_lines = []
+    occupied = np.zeros(width, dtype=bool)
+    for top, bottom in _runs(ink.any(axis=1)):
+        segments = _runs(ink[top:bottom].any(axis=0), min_gap=min_column_gap)
+        if len(segments) >= MIN_TABLE_COLUMNS:
+            table_lines.append((top, bottom))
+            for left, right in segments:
+                occupied[left:right] = True
+
+    columns = _runs(occupied, min_gap=min_column_gap)
+    if len(table_lines) < MIN_TABLE_ROWS or len(columns) < MIN_TABLE_COLUMNS:
+        return []
+
+    grid = []
+    for top, bottom in table_lines:
+        row = []
+        for left, right in columns:
+            cell = ink[top:bottom, left:right]
+            if not cell.any():
+                row.append(None)
+                continue
+            # Shrink the box to the ink of the cell
+            cols = np.flatnonzero(cell.any(axis=0))
+            row.append((left + int(cols[0]), top, left + int(cols[-1]) + 1, bottom))
+        grid.append(row)
+    return grid
+
+
+def _pad(box: Tuple[int, int, int, int], size: Tuple[int, int], padding: int = 4) -> Tuple[int, int, int, int]:
+    left, top, right, bottom = box
+    return max(0, left - padding), max(0, top - padding), min(size[0], right + padding), min(size[1], bottom + padding)
+
+
+def parse_number(text: str) -> Optional[int]:
+    """
+    Parse an OCRed figure, ignoring thousands separators and stray spaces.
+
+    Args:
+        text: The text of a cell
+
+    Returns:
+        The integer value, or None if the cell holds no digits
+    """
+    digits = re.sub(r'[^0-9]', '', text)
+    return int(digits) if digits else None
+
+
+def grid_to_dataframe(labels: List[List[str]], values: List[List[Optional[int]]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from an OCRed grid.
+
+    Args:
+        labels: The text of every cell, used for the header row and the first column
+        values: The parsed figures of every cell
+
+    Returns:
+        A DataFrame with the header row as columns, the first column as text and the other
+        columns as figures
+    """
+    header = []
+    for i, name in enumerate(labels[0]):
+        name = name or f"column_{i}"
+        header.append(name if name not in header else f"{name}_{i}")
+    rows = []
+    for label_row, value_row in zip(labels[1:], values[1:]):
+        rows.append([label_row[0]] + value_row[1:])
+    return pd.DataFrame(rows, columns=header)
+
+
+def ocr_table_cells(pdf_path: str, pages: List[int], dpi: int = CELL_OCR_DPI,
+                    tesseract_cmd: Optional[str] = None, engine: str = DEFAULT_OCR_ENGINE) -> List[pd.DataFrame]:
+    """
+    OCR the tables on the given pages cell by cell.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: Zero-based page numbers to read
+        dpi: DPI for rendering the pages
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        engine: The OCR engine to use (see get_ocr_engine)
+
+    Returns:
+        A DataFrame for each table found
+    """
+    ocr_engine = get_ocr_engine(engine, tesseract_cmd)
+    tables = []
+    with fitz.open(pdf_path) as pdf_document:
+        for page_number in pages:
+            pix = render_page(pdf_document[page_number], dpi)
+            view = pixmap_to_image(pix)
+            try:
+                # Binarize the page so background noise does not end up in the cells
+                ink = adaptive_threshold(to_grayscale(view))
+            finally:
+                view.close()
+            image = Image.fromarray(np.where(ink, 0, 255).astype(np.uint8))
+
+            grid = detect_table_cells(ink)
+            if not grid:
+                continue
+
+            label_cells = [(r, c) for r, row in enumerate(grid) for c, box in enumerate(row)
+                           if box is not None and (r == 0 or c == 0)]
+            figure_cells = [(r, c) for r, row in enumerate(grid) for c, box in enumerate(row)
+                            if box is not None and r > 0 and c > 0]
+
+            labels = [[""] * len(row) for row in grid]
+            values = [[None] * len(row) for row in grid]
+            label_texts = ocr_engine.recognize_cells(image, [_pad(grid[r][c], image.size) for r, c in label_cells])
+            for (r, c), text in zip(label_cells, label_texts):
+                labels[r][c] = text
+            figure_texts = ocr_engine.recognize_cells(image, [_pad(grid[r][c], image.size) for r, c in figure_cells],
+                                                      whitelist=DIGIT_WHITELIST)
+            for (r, c), text in zip(figure_cells, figure_texts):
+                values[r][c] = parse_number(text)
+
+            tables.append(grid_to_dataframe(labels, values))
+            print(f"[RTMC] Read a {len(grid)}x{len(grid[0])} table on page {page_number + 1} of {pdf_path} by cell OCR")
+    return tables
@@ -0,0 +1,199 @@
+"""
+Content-addressed PDF store for the RTMC Scraper.
+
+This module stores downloaded reports once per SHA-256 digest under pdf_downloads/.store,
+keeps an index from report filename to digest, and gives downstream stages (OCR text,
+extracted tables) a place to cache results by content instead of by filename.
+"""
+import os
+import json
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+from .manifest import file_sha256
+
+
+STORE_DIRNAME = ".store"
+INDEX_FILENAME = "index.json"
+
+# Maps an absolute path to ((size, mtime_ns), sha256) so unchanged files are hashed once per process
+_hash_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_hash_cache_lock = threading.Lock()
+
+
+def content_hash(path: str) -> str:
+    """
+    Get the SHA-256 digest of a file, reusing the result while the file is unchanged.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        The hex digest of the file content
+    """
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _hash_cache_lock:
+        cached = _hash_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    digest = file_sha256(path)
+    with _hash_cache_lock:
+        _hash_cache[key] = (signature, digest)
+    return digest
+
+
+class ContentStore:
+    """
+    Store of report PDFs keyed by SHA-256, with a name to hash index.
+
+    Each distinct document is kept once under objects/, and every name it was downloaded
+    under is hard-linked to that object. Downstream caches live in sibling directories
+    of objects/ and are keyed by the same digest.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, INDEX_FILENAME)
+        self.index: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def for_pdf(cls, pdf_path: str) -> "ContentStore":
+        """
+        Get the store that belongs to the directory a PDF lives in.
+
+        Args:
+            pdf_path: Path to a PDF in the download directory
+
+        Returns:
+            The ContentStore for that directory
+        """
+        return cls(os.path.join(os.path.dirname(os.path.abspath(pdf_path)), STORE_DIRNAME))
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except Exception as e:
+            print(f"[RTMC] Error reading content store index {self.index_path}: {e}")
+            self.index = {}
+
+    def _save_index(self) -> None:
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, digest: str) -> str:
+        """
+        Get the path of the stored object for a digest.
+
+        Args:
+            digest: The SHA-256 hex digest
+
+        Returns:
+            The path of the object file
+        """
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.pdf")
+
+    def cache_dir(self, kind: str) -> str:
+        """
+        Get (and create) the directory for a content-keyed downstream cache.
+
+        Args:
+            kind: The name of the cache, e.g. "ocr" or "tables"
+
+        Returns:
+            The path of the cache directory
+        """
+        path = os.path.join(self.root, kind)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def add(self, path: str, sha256: Optional[str] = None) -> str:
+        """
+        Add a downloaded PDF to the store and link its name to the stored object.
+
+        If a document with the same content is already stored, the file at path is replaced
+        by a hard link to the existing object so the bytes are only kept once on disk.
+
+        Args:
+            path: Path to the PDF in the download directory
+            sha256: The content hash if already known, otherwise it is computed
+
+        Returns:
+            The SHA-256 hex digest of the PDF
+        """
+        digest = sha256 or content_hash(path)
+        object_path = self.object_path(digest)
+        name = os.path.basename(path)
+
+        with self._lock:
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                self._link_or_copy(path, object_path)
+            elif not os.path.samefile(path, object_path):
+                # Same content under another name: keep one copy and link this name to it
+                tmp_path = f"{path}.link"
+                try:
+                    os.link(object_path, tmp_path)
+                    os.replace(tmp_path, path)
+                except OSError:
+                    # Hard links are not available here, keep the separate copy
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+            if self.index.get(name) != digest:
+                self.index[name] = digest
+                self._save_index()
+
+        with _hash_cache_lock:
+            stat = os.stat(path)
+            _hash_cache[os.path.abspath(path)] = ((stat.st_size, stat.st_mtime_ns), digest)
+        return digest
+
+    @staticmethod
+    def _link_or_copy(source: str, target: str) -> None:
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    def hash_for(self, path: str) -> str:
+        """
+        Get the content hash of a PDF, trusting the index while the file is still linked to its object.
+
+        Args:
+            path: Path to the PDF
+
+        Returns:
+            The SHA-256 hex digest of the PDF
+        """
+        digest = self.index.get(os.path.basename(path))
+        if digest:
+            object_path = self.object_path(digest)
+            try:
+                if os.path.samefile(path, object_path):
+                    return digest
+            except OSError:
+                pass
+        return content_hash(path)
+
+    def names_for(self, digest: str) -> List[str]:
+        """
+        Get every report name that has the given content.
+
+        Args:
+            digest: The SHA-256 hex digest
+
+        Returns:
+            The sorted list of names linked to the digest
+        """
+        return sorted(name for name, value in self.index.items() if value == digest)
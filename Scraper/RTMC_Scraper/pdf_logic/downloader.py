@@ -5,38 +5,41 @@ This module provides functionality for downloading PDF files from the RTMC websi
 """
 import os
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Optional, Tuple
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 from requests.exceptions import RequestException, Timeout, ConnectionError
-import PyPDF2
-from io import BytesIO
+from .session import DEFAULT_HEADERS, create_session
+from .manifest import DownloadManifest
+from .validation import is_valid_pdf_file
+from .content_store import ContentStore, STORE_DIRNAME
+from .rate_limiter import AdaptiveRateLimiter
+from .link_discovery import discover_pdf_links, DEFAULT_LINK_CACHE_TTL
 
 
-def is_valid_pdf(content: bytes) -> bool:
-    """
-    Check if the content is a valid PDF file.
-
-    Args:
-        content: The content to check
-
-    Returns:
-        True if the content is a valid PDF, False otherwise
-    """
-    try:
-        # Try to open the PDF file
-        PyPDF2.PdfReader(BytesIO(content))
-        return True
-    except Exception:
-        return False
+# Transfers in flight on the event loop when use_async is set without max_workers
+DEFAULT_ASYNC_CONCURRENCY = 8
 
 
 def download_single_pdf(pdf_url: str, local_path: str, headers: dict, max_retries: int = 3, 
-                        timeout: int = 30, backoff_factor: float = 0.5) -> Tuple[bool, str]:
+                        timeout: int = 30, backoff_factor: float = 0.5,
+                        show_progress: bool = True, session: Optional[requests.Session] = None,
+                        manifest: Optional[DownloadManifest] = None,
+                        deep_validation: bool = False,
+                        rate_limiter: Optional[AdaptiveRateLimiter] = None) -> Tuple[bool, str]:
     """
     Download a single PDF file with retries and timeouts.
 
+    The response is streamed to a temporary ".part" file next to local_path. A retry after
+    a dropped connection resumes from the bytes already received with an HTTP Range request,
+    and the file is only moved into place with an atomic rename once it validates.
+
+    When a manifest is given and it holds validators for the file already on disk, the
+    request is made conditional and a 304 Not Modified response leaves the file untouched.
+
     Args:
         pdf_url: The URL to download the PDF from
         local_path: The local path to save the PDF to
@@ -44,10 +47,26 @@ def download_single_pdf(pdf_url: str, local_path: str, headers: dict, max_retrie
         max_retries: The maximum number of retries
         timeout: The timeout in seconds
         backoff_factor: The backoff factor for retries
+        show_progress: Whether to print a per-chunk progress bar
+        session: The pooled session to download with (a one-off connection is used if None)
+        manifest: The download manifest to read validators from and record the download in
+        deep_validation: Whether to fully parse the PDF instead of only checking its structure
+        rate_limiter: The shared rate limiter that paces requests and bandwidth per host
 
     Returns:
         A tuple of (success, message)
     """
+    http = session if session is not None else requests
+    host = AdaptiveRateLimiter.host_of(pdf_url)
+    conditional_headers = manifest.conditional_headers(pdf_url, local_path) if manifest is not None else {}
+    part_path = f"{local_path}.part"
+    # Validator of the response the partial file came from, used as If-Range when resuming
+    part_validator = None
+
+    # A partial file left by an earlier run cannot be matched to a server version, so start fresh
+    if os.path.exists(part_path):
+        os.remove(part_path)
+
     for attempt in range(max_retries):
         try:
             # Add jitter to avoid overwhelming the server
@@ -56,51 +75,102 @@ def download_single_pdf(pdf_url: str, local_path: str, headers: dict, max_retrie
                 print(f"[RTMC] Retry {attempt}/{max_retries} after {sleep_time:.2f}s for {pdf_url}")
                 time.sleep(sleep_time)
 
-            # Stream the download to show progress and handle large files
-            with requests.get(pdf_url, headers=headers, stream=True, timeout=timeout) as response:
-                if response.status_code != 200:
+            request_headers = dict(headers)
+            resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if resume_from > 0 and part_validator:
+                # Resume the interrupted transfer, but only if the server still has the same version
+                request_headers['Range'] = f"bytes={resume_from}-"
+                request_headers['If-Range'] = part_validator
+            else:
+                resume_from = 0
+                request_headers.update(conditional_headers)
+
+            if rate_limiter is not None:
+                rate_limiter.acquire(host)
+
+            # Stream the download to disk to keep memory flat for large files
+            with http.get(pdf_url, headers=request_headers, stream=True, timeout=timeout) as response:
+                if rate_limiter is not None:
+                    rate_limiter.record_response(host, response.status_code, response.headers.get('Retry-After'))
+
+                if response.status_code == 304 and manifest is not None:
+                    manifest.touch(os.path.basename(local_path))
+                    return True, "Not modified"
+
+                if response.status_code == 416:
+                    # The range is unusable, drop the partial file and fetch from the start
+                    os.remove(part_path)
+                    part_validator = None
+                    continue
+
+                if response.status_code == 206 and resume_from > 0:
+                    content_range = response.headers.get('Content-Range', '')
+                    if not content_range.startswith(f"bytes {resume_from}-"):
+                        os.remove(part_path)
+                        part_validator = None
+                        continue
+                    mode = 'ab'
+                elif response.status_code == 200:
+                    # Either a fresh download or the server ignored the range request
+                    resume_from = 0
+                    mode = 'wb'
+                else:
                     continue  # Try again if not 200
 
+                part_validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+
                 # Get file size if available
                 total_size = int(response.headers.get('content-length', 0))
                 if total_size > 0:
-                    print(f"[RTMC] Downloading {os.path.basename(local_path)} ({total_size/1024/1024:.2f} MB)")
+                    total_size += resume_from
+                    action = "Resuming" if resume_from else "Downloading"
+                    print(f"[RTMC] {action} {os.path.basename(local_path)} ({total_size/1024/1024:.2f} MB)")
 
                 # Download with progress tracking
-                content = bytearray()
-                downloaded = 0
-                chunk_size = 8192  # 8KB chunks
+                downloaded = resume_from
+                chunk_size = 8192  # 8KB chunks, so little is lost when a connection drops
                 last_progress = 0
                 progress_bar_width = 50  # Width of the progress bar in characters
 
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        content.extend(chunk)
-                        downloaded += len(chunk)
-
-                        # Show detailed progress for every download
-                        if total_size > 0:
-                            progress = int(100 * downloaded / total_size)
-                            # Update progress more frequently (every 2%)
-                            if progress >= last_progress + 2 or downloaded == total_size:
-                                # Create a visual progress bar
-                                filled_length = int(progress_bar_width * downloaded // total_size)
-                                bar = '█' * filled_length + '░' * (progress_bar_width - filled_length)
-
-                                print(f"\r[RTMC] Downloading: |{bar}| {progress}% ({downloaded/1024/1024:.2f}/{total_size/1024/1024:.2f} MB)", end="")
-                                last_progress = progress
-
-                                # Print a newline when download is complete
-                                if downloaded == total_size:
-                                    print()
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            if rate_limiter is not None:
+                                rate_limiter.consume_bytes(host, len(chunk))
+
+                            # Show detailed progress for every download
+                            if show_progress and total_size > 0:
+                                progress = int(100 * downloaded / total_size)
+                                # Update progress more frequently (every 2%)
+                                if progress >= last_progress + 2 or downloaded == total_size:
+                                    # Create a visual progress bar
+                                    filled_length = int(progress_bar_width * downloaded // total_size)
+                                    bar = '█' * filled_length + '░' * (progress_bar_width - filled_length)
+
+                                    print(f"\r[RTMC] Downloading: |{bar}| {progress}% ({downloaded/1024/1024:.2f}/{total_size/1024/1024:.2f} MB)", end="")
+                                    last_progress = progress
+
+                                    # Print a newline when download is complete
+                                    if downloaded == total_size:
+                                        print()
+
+                if total_size > 0 and downloaded < total_size:
+                    # The connection closed early, keep the partial file and resume on the next attempt
+                    print(f"[RTMC] Incomplete download of {pdf_url} ({downloaded}/{total_size} bytes)")
+                    continue
 
                 # Validate the PDF
-                if not is_valid_pdf(content):
+                if not is_valid_pdf_file(part_path, deep=deep_validation):
+                    os.remove(part_path)
                     return False, "Invalid PDF content"
 
-                # Save the file
-                with open(local_path, 'wb') as f:
-                    f.write(content)
+                # Move the complete file into place
+                os.replace(part_path, local_path)
+
+                if manifest is not None:
+                    manifest.record(pdf_url, local_path, response.headers)
 
                 return True, "Success"
 
@@ -113,127 +183,254 @@ def download_single_pdf(pdf_url: str, local_path: str, headers: dict, max_retrie
         except Exception as e:
             print(f"[RTMC] Unexpected error downloading {pdf_url}: {e}")
 
+    if os.path.exists(part_path):
+        os.remove(part_path)
     return False, f"Failed after {max_retries} attempts"
 
 
-def download_pdfs(pdf_url: str, pdf_dir: str) -> List[str]:
+def _resolve_pdf_link(pdf_link: str, pdf_url: str) -> str:
+    """
+    Construct the full URL for a PDF link found on the listing page.
+
+    Args:
+        pdf_link: The href found on the listing page
+        pdf_url: The URL of the listing page
+
+    Returns:
+        The absolute URL of the PDF
+    """
+    if pdf_link.startswith('http'):
+        return pdf_link
+    if pdf_link.startswith('/'):
+        return f"https://www.rtmc.co.za{pdf_link}"
+    return f"{pdf_url}/{pdf_link}"
+
+
+def _fetch_pdf(pdf_link: str, local_path: str, headers: dict, show_progress: bool = True,
+               session: Optional[requests.Session] = None, manifest: Optional[DownloadManifest] = None,
+               deep_validation: bool = False, rate_limiter: Optional[AdaptiveRateLimiter] = None) -> bool:
+    """
+    Make sure a single PDF is present locally, downloading it if needed.
+
+    Files whose manifest entry carries an ETag or Last-Modified are revalidated with a
+    conditional GET. Files the manifest already knows without validators are trusted while
+    their size matches, and unknown files are checked once and then added to the manifest.
+    If the request fails, a valid local copy is still used.
+
+    Args:
+        pdf_link: The absolute URL of the PDF
+        local_path: The local path to save the PDF to
+        headers: The headers to use for the request
+        show_progress: Whether to print a per-file progress bar
+        session: The pooled session to download with
+        manifest: The download manifest
+        deep_validation: Whether to fully parse PDFs instead of only checking their structure
+        rate_limiter: The shared rate limiter
+
+    Returns:
+        True if the PDF is available at local_path, False otherwise
+    """
+    if _use_local_copy(pdf_link, local_path, manifest, deep_validation):
+        return True
+
+    # Download the PDF file with retries and progress tracking
+    filename = os.path.basename(local_path)
+    success, message = download_single_pdf(pdf_link, local_path, headers, max_retries=3, timeout=60,
+                                           backoff_factor=0.5, show_progress=show_progress, session=session,
+                                           manifest=manifest, deep_validation=deep_validation,
+                                           rate_limiter=rate_limiter)
+    if not success:
+        print(f"[RTMC] Failed to download {filename}: {message}")
+        return _local_copy_after_failed_request(local_path, deep_validation)
+    if message == "Not modified":
+        print(f"[RTMC] File {filename} not modified on the server, keeping local copy")
+    return success
+
+
+def _use_local_copy(pdf_link: str, local_path: str, manifest: Optional[DownloadManifest] = None,
+                    deep_validation: bool = False) -> bool:
+    """
+    Decide whether an existing local PDF can be used without contacting the server.
+
+    Invalid local files are deleted so they are downloaded again.
+
+    Args:
+        pdf_link: The absolute URL of the PDF
+        local_path: The local path of the PDF
+        manifest: The download manifest
+        deep_validation: Whether to fully parse PDFs instead of only checking their structure
+
+    Returns:
+        True if the local copy is usable as is, False if a (conditional) request is needed
+    """
+    filename = os.path.basename(local_path)
+    entry = manifest.get(filename) if manifest is not None else None
+    revalidate = bool(manifest is not None and manifest.conditional_headers(pdf_link, local_path))
+
+    if (not revalidate and entry and entry.get('url') == pdf_link and os.path.exists(local_path)
+            and os.path.getsize(local_path) == entry.get('size')):
+        # Known file without validators: trust the manifest instead of re-reading it
+        print(f"[RTMC] File {filename} is unchanged according to the manifest, skipping download")
+        return True
+
+    # Check if file already exists and is valid
+    if not revalidate and os.path.exists(local_path):
+        try:
+            if is_valid_pdf_file(local_path, deep=deep_validation):
+                print(f"[RTMC] File {filename} already exists and is valid, skipping download")
+                if manifest is not None:
+                    manifest.record(pdf_link, local_path)
+                return True
+            else:
+                print(f"[RTMC] File {filename} exists but is invalid, re-downloading")
+                # Delete the invalid file
+                os.remove(local_path)
+        except Exception as e:
+            print(f"[RTMC] Error checking existing file {filename}: {e}")
+            # Delete the potentially corrupted file
+            if os.path.exists(local_path):
+                os.remove(local_path)
+
+    return False
+
+
+def _local_copy_after_failed_request(local_path: str, deep_validation: bool = False) -> bool:
+    """
+    Fall back to an existing local PDF when the request for it failed.
+
+    A report that was only being revalidated stays usable while the server is down or keeps
+    refusing requests.
+
+    Args:
+        local_path: The local path of the PDF
+        deep_validation: Whether to fully parse PDFs instead of only checking their structure
+
+    Returns:
+        True if a valid local copy exists, False otherwise
+    """
+    if os.path.exists(local_path) and is_valid_pdf_file(local_path, deep=deep_validation):
+        print(f"[RTMC] Using local copy of {os.path.basename(local_path)}, revalidation failed")
+        return True
+    return False
+
+
+def _build_jobs(pdf_links: List[str], pdf_url: str, pdf_dir: str) -> List[Tuple[str, str]]:
+    """
+    Resolve the full URL and local path of every PDF link.
+
+    Args:
+        pdf_links: The hrefs found on the listing page
+        pdf_url: The URL of the listing page
+        pdf_dir: The directory to save downloaded PDFs
+
+    Returns:
+        A list of (url, local_path) tuples
+    """
+    jobs = []
+    for pdf_link in pdf_links:
+        pdf_link = _resolve_pdf_link(pdf_link, pdf_url)
+        # Extract the filename from the URL
+        filename = os.path.basename(pdf_link)
+        jobs.append((pdf_link, os.path.join(pdf_dir, filename)))
+    return jobs
+
+
+def download_pdfs(pdf_url: str, pdf_dir: str, max_workers: Optional[int] = None, max_per_host: int = 4,
+                  session: Optional[requests.Session] = None, deep_validation: bool = False,
+                  use_async: bool = False, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                  link_cache_ttl: float = DEFAULT_LINK_CACHE_TTL) -> List[str]:
     """
     Download PDF files from the RTMC website.
 
+    With max_workers greater than 1 the files are fetched concurrently by a thread pool,
+    while max_per_host caps how many transfers may be in flight against any one host.
+    The index fetch and all downloads share one pooled session so connections are reused.
+    A manifest in pdf_dir records each report's validators so unchanged reports are
+    confirmed with a conditional GET instead of being downloaded again. All requests are
+    paced by an adaptive per-host rate limiter that backs off on 429/503 and Retry-After.
+
     Args:
         pdf_url: The URL to download PDFs from
         pdf_dir: The directory to save downloaded PDFs
+        max_workers: The number of downloads to run at once (1 downloads sequentially); defaults to 1,
+            or to DEFAULT_ASYNC_CONCURRENCY transfers in flight with use_async
+        max_per_host: The maximum number of concurrent downloads per host
+        session: The pooled session to use; a temporary one is created and closed if None. Unused
+            with use_async, where aiohttp keeps its own connection pool
+        deep_validation: Whether to fully parse every PDF with PyPDF2 instead of the cached
+            structural check
+        use_async: Whether to use the asyncio implementation, with max_workers as the number of
+            transfers in flight on a single event loop (requires aiohttp, the threaded downloader
+            is used if it is not installed)
+        rate_limiter: The shared rate limiter; a default AdaptiveRateLimiter is used if None
+        link_cache_ttl: How long the cached listing is used without fetching it again, in seconds
+            (0 always revalidates it)
 
     Returns:
-        A list of paths to downloaded PDF files, or an empty list if no PDFs were found
+        A list of paths to downloaded PDF files, in listing order, or an empty list if no PDFs were found
     """
+    if rate_limiter is None:
+        rate_limiter = AdaptiveRateLimiter()
+
+    if use_async:
+        if max_workers is None:
+            max_workers = DEFAULT_ASYNC_CONCURRENCY
+        try:
+            from .async_downloader import run_download_pdfs_async
+            return run_download_pdfs_async(pdf_url, pdf_dir, max_concurrency=max_workers, max_per_host=max_per_host,
+                                           deep_validation=deep_validation, rate_limiter=rate_limiter,
+                                           link_cache_ttl=link_cache_ttl)
+        except ImportError as e:
+            print(f"[RTMC] {e}, falling back to {max_workers} download threads")
+
+    if max_workers is None:
+        max_workers = 1
+
+    owns_session = session is None
+    if owns_session:
+        session = create_session(pool_maxsize=max(max_per_host, 1))
+
     try:
         # Create directory for PDF downloads if it doesn't exist
         os.makedirs(pdf_dir, exist_ok=True)
 
-        # List to store paths to downloaded PDFs
-        downloaded_pdfs = []
-
         # Set up headers for the request
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
+        headers = dict(DEFAULT_HEADERS)
+        manifest = DownloadManifest(pdf_dir)
 
-        # Make a request to the PDF URL with timeout
-        print(f"[RTMC] Fetching PDF links from: {pdf_url}")
+        # Get the PDF links from the listing, or from the link cache while it is fresh
         try:
-            response = requests.get(pdf_url, headers=headers, timeout=30)
-            response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+            pdf_links = discover_pdf_links(pdf_url, pdf_dir, session, headers, rate_limiter=rate_limiter,
+                                           ttl=link_cache_ttl)
         except (RequestException, Timeout, ConnectionError) as e:
             print(f"[RTMC] Error fetching PDF links: {e}")
             return []
 
-        # Parse the HTML to find links to PDF files
-        soup = BeautifulSoup(response.text, 'html.parser')
-        pdf_links = []
-
-        # Find all links that end with .pdf
-        for link in soup.find_all('a'):
-            href = link.get('href')
-            if href and href.lower().endswith('.pdf'):
-                pdf_links.append(href)
-
         if not pdf_links:
             print(f"[RTMC] No PDF files found at {pdf_url}")
             return []
 
         print(f"[RTMC] Found {len(pdf_links)} PDF files")
         total_pdfs = len(pdf_links)
-        successful_downloads = 0
+
+        # Resolve the full URL and local path of every PDF up front
+        jobs = _build_jobs(pdf_links, pdf_url, pdf_dir)
 
         # Download each PDF file with progress information
         print(f"[RTMC] Starting download of {total_pdfs} PDF files")
-        progress_bar_width = 50  # Width of the overall progress bar
-
-        for i, pdf_link in enumerate(pdf_links, 1):
-            # Show overall progress
-            overall_progress = int(100 * (i-1) / total_pdfs)
-            filled_length = int(progress_bar_width * (i-1) // total_pdfs)
-            bar = '█' * filled_length + '░' * (progress_bar_width - filled_length)
-            print(f"\r[RTMC] Overall progress: |{bar}| {overall_progress}% ({i-1}/{total_pdfs} files)", end="")
-            print()  # New line after the progress bar
-
-            # Construct the full URL if it's a relative link
-            if not pdf_link.startswith('http'):
-                if pdf_link.startswith('/'):
-                    pdf_link = f"https://www.rtmc.co.za{pdf_link}"
-                else:
-                    pdf_link = f"{pdf_url}/{pdf_link}"
+        if max_workers > 1:
+            results = _download_concurrently(jobs, headers, max_workers, max_per_host, session, manifest,
+                                             deep_validation, rate_limiter)
+        else:
+            results = _download_sequentially(jobs, headers, session, manifest, deep_validation, rate_limiter)
 
-            # Extract the filename from the URL
-            filename = os.path.basename(pdf_link)
-            local_path = os.path.join(pdf_dir, filename)
-
-            # Check if corresponding .txt file exists (indicating OCR has been done)
-            txt_path = os.path.splitext(local_path)[0] + "_ocr.txt"
-            # We don't skip downloads just because a .txt file exists
-            # We only skip if the PDF file itself exists and is valid
-
-            # Check if file already exists and is valid
-            if os.path.exists(local_path):
-                try:
-                    with open(local_path, 'rb') as f:
-                        content = f.read()
-                    if is_valid_pdf(content):
-                        print(f"[RTMC] File {filename} already exists and is valid, skipping download")
-                        downloaded_pdfs.append(local_path)
-                        successful_downloads += 1
-                        continue
-                    else:
-                        print(f"[RTMC] File {filename} exists but is invalid, re-downloading")
-                        # Delete the invalid file
-                        os.remove(local_path)
-                except Exception as e:
-                    print(f"[RTMC] Error checking existing file {filename}: {e}")
-                    # Delete the potentially corrupted file
-                    if os.path.exists(local_path):
-                        os.remove(local_path)
-
-            # Download the PDF file with retries and progress tracking
-            print(f"[RTMC] Downloading file {i}/{total_pdfs}: {filename}")
-            success, message = download_single_pdf(pdf_link, local_path, headers, max_retries=3, timeout=60, backoff_factor=0.5)
-
-            if success:
-                downloaded_pdfs.append(local_path)
-                successful_downloads += 1
-                print(f"[RTMC] Successfully downloaded {filename} ({successful_downloads}/{total_pdfs})")
-            else:
-                print(f"[RTMC] Failed to download {filename}: {message}")
-
-            # Add a small delay between downloads to avoid overwhelming the server
-            if i < total_pdfs:
-                time.sleep(random.uniform(0.5, 2.0))
+        # Keep the listing order regardless of the order in which downloads finished
+        downloaded_pdfs = [local_path for (_, local_path), success in zip(jobs, results) if success]
+        successful_downloads = len(downloaded_pdfs)
+        _add_to_store(downloaded_pdfs, pdf_dir, manifest)
 
         # Show final overall progress
-        overall_progress = 100
-        bar = '█' * progress_bar_width
-        print(f"\r[RTMC] Overall progress: |{bar}| {overall_progress}% ({total_pdfs}/{total_pdfs} files)", end="")
-        print()  # New line after the progress bar
+        _print_overall_progress(total_pdfs, total_pdfs)
 
         print(f"[RTMC] Successfully downloaded {successful_downloads}/{total_pdfs} PDF files")
         print(f"[RTMC] Exact scraping location: {pdf_url}")
@@ -243,3 +440,147 @@ def download_pdfs(pdf_url: str, pdf_dir: str) -> List[str]:
     except Exception as e:
         print(f"[RTMC] Error downloading PDFs from {pdf_url}: {e}")
         return []
+    finally:
+        if owns_session:
+            session.close()
+
+
+def _add_to_store(pdf_paths: List[str], pdf_dir: str, manifest: DownloadManifest) -> None:
+    """
+    Add downloaded PDFs to the content-addressed store so duplicates are kept once.
+
+    Args:
+        pdf_paths: Paths to the downloaded PDFs
+        pdf_dir: The directory the PDFs were saved to
+        manifest: The download manifest, used to reuse already computed hashes
+    """
+    try:
+        store = ContentStore(os.path.join(pdf_dir, STORE_DIRNAME))
+        first_name = {}
+        for pdf_path in pdf_paths:
+            filename = os.path.basename(pdf_path)
+            entry = manifest.get(filename)
+            known_hash = None
+            if entry and entry.get('size') == os.path.getsize(pdf_path):
+                known_hash = entry.get('sha256')
+            digest = store.add(pdf_path, sha256=known_hash)
+            if digest in first_name:
+                print(f"[RTMC] {filename} has the same content as {first_name[digest]}, stored once")
+            else:
+                first_name[digest] = filename
+    except Exception as e:
+        print(f"[RTMC] Error adding PDFs to the content store: {e}")
+
+
+def _print_overall_progress(done: int, total: int) -> None:
+    """
+    Print the overall download progress bar.
+
+    Args:
+        done: The number of files handled so far
+        total: The total number of files
+    """
+    progress_bar_width = 50  # Width of the overall progress bar
+    overall_progress = int(100 * done / total)
+    filled_length = int(progress_bar_width * done // total)
+    bar = '█' * filled_length + '░' * (progress_bar_width - filled_length)
+    print(f"\r[RTMC] Overall progress: |{bar}| {overall_progress}% ({done}/{total} files)", end="")
+    print()  # New line after the progress bar
+
+
+def _download_sequentially(jobs: List[Tuple[str, str]], headers: dict,
+                           session: Optional[requests.Session] = None,
+                           manifest: Optional[DownloadManifest] = None,
+                           deep_validation: bool = False,
+                           rate_limiter: Optional[AdaptiveRateLimiter] = None) -> List[bool]:
+    """
+    Download PDFs one after another, paced by the rate limiter.
+
+    Args:
+        jobs: A list of (url, local_path) tuples
+        headers: The headers to use for the requests
+        session: The pooled session to download with
+        manifest: The download manifest
+        deep_validation: Whether to fully parse PDFs instead of only checking their structure
+        rate_limiter: The shared rate limiter
+
+    Returns:
+        A list of success flags, one per job
+    """
+    total_pdfs = len(jobs)
+    results = []
+    successful_downloads = 0
+
+    for i, (pdf_link, local_path) in enumerate(jobs, 1):
+        # Show overall progress
+        _print_overall_progress(i - 1, total_pdfs)
+
+        filename = os.path.basename(local_path)
+        print(f"[RTMC] Downloading file {i}/{total_pdfs}: {filename}")
+        success = _fetch_pdf(pdf_link, local_path, headers, session=session, manifest=manifest,
+                             deep_validation=deep_validation, rate_limiter=rate_limiter)
+        results.append(success)
+
+        if success:
+            successful_downloads += 1
+            print(f"[RTMC] Successfully downloaded {filename} ({successful_downloads}/{total_pdfs})")
+
+    return results
+
+
+def _download_concurrently(jobs: List[Tuple[str, str]], headers: dict, max_workers: int,
+                           max_per_host: int, session: Optional[requests.Session] = None,
+                           manifest: Optional[DownloadManifest] = None,
+                           deep_validation: bool = False,
+                           rate_limiter: Optional[AdaptiveRateLimiter] = None) -> List[bool]:
+    """
+    Download PDFs on a thread pool, limiting the number of concurrent requests per host.
+
+    Args:
+        jobs: A list of (url, local_path) tuples
+        headers: The headers to use for the requests
+        max_workers: The number of worker threads
+        max_per_host: The maximum number of concurrent downloads per host
+        session: The pooled session shared by all worker threads
+        manifest: The download manifest shared by all worker threads
+        deep_validation: Whether to fully parse PDFs instead of only checking their structure
+        rate_limiter: The rate limiter shared by all worker threads
+
+    Returns:
+        A list of success flags, one per job, in the same order as jobs
+    """
+    total_pdfs = len(jobs)
+    host_slots = {}
+    host_slots_lock = threading.Lock()
+
+    def host_slot(url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with host_slots_lock:
+            if host not in host_slots:
+                host_slots[host] = threading.BoundedSemaphore(max(1, max_per_host))
+            return host_slots[host]
+
+    def worker(pdf_link: str, local_path: str) -> bool:
+        with host_slot(pdf_link):
+            # Per-chunk progress bars would interleave between threads, so only report per file
+            return _fetch_pdf(pdf_link, local_path, headers, show_progress=False, session=session,
+                              manifest=manifest, deep_validation=deep_validation, rate_limiter=rate_limiter)
+
+    results = [False] * total_pdfs
+    print(f"[RTMC] Using {max_workers} download workers ({max_per_host} per host)")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(worker, pdf_link, local_path): index
+                   for index, (pdf_link, local_path) in enumerate(jobs)}
+        done = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            filename = os.path.basename(jobs[index][1])
+            done += 1
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                print(f"[RTMC] Unexpected error downloading {filename}: {e}")
+            if results[index]:
+                print(f"[RTMC] Successfully downloaded {filename} ({done}/{total_pdfs})")
+
+    return results
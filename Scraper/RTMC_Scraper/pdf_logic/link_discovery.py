@@ -0,0 +1,277 @@
+"""
+Link discovery module for the RTMC Scraper.
+
+This module finds the PDF links on the RTMC report listing. Only anchor tags are parsed, with
+lxml when it is installed, and the resulting link set is cached in the download directory with
+a TTL and the listing's ETag/Last-Modified, so warm runs can skip the listing request entirely.
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from .rate_limiter import AdaptiveRateLimiter
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+LINK_CACHE_FILENAME = "links_cache.json"
+# How long a cached listing is used without contacting the server
+DEFAULT_LINK_CACHE_TTL = 24 * 60 * 60
+
+
+def extract_pdf_links(html: str) -> List[str]:
+    """
+    Find the links to PDF files on a listing page.
+
+    Args:
+        html: The HTML of the listing page
+
+    Returns:
+        The hrefs ending in .pdf, in page order
+    """
+    # Only build the tree for anchors that carry an href
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=SoupStrainer('a', href=True))
+    pdf_links = []
+
+    # Find all links that end with .pdf
+    for link in soup.find_all('a'):
+        href = link.get('href')
+        if href and href.lower().endswith('.pdf'):
+            pdf_links.append(href)
+    return pdf_links
+
+
+class LinkCache:
+    """
+    Persisted cache of the PDF links found on each listing URL.
+    """
+    def __init__(self, pdf_dir: str):
+        self.path = os.path.join(pdf_dir, LINK_CACHE_FILENAME)
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"[RTMC] Error reading link cache {self.path}: {e}")
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def cached_links(self, pdf_url: str) -> Optional[List[str]]:
+        """
+        Get the cached links for a listing regardless of their age.
+
+        Args:
+            pdf_url: The URL of the listing page
+
+        Returns:
+            The cached links, or None if the listing was never cached
+        """
+        with self._lock:
+            entry = self.entries.get(pdf_url)
+            return list(entry['links']) if entry else None
+
+    def fresh_links(self, pdf_url: str, ttl: float) -> Optional[List[str]]:
+        """
+        Get the cached links for a listing if they are younger than ttl.
+
+        Args:
+            pdf_url: The URL of the listing page
+            ttl: The maximum age in seconds
+
+        Returns:
+            The cached links, or None if they are missing or expired
+        """
+        with self._lock:
+            entry = self.entries.get(pdf_url)
+            if not entry or time.time() - entry.get('fetched_at', 0) > ttl:
+                return None
+            return list(entry['links'])
+
+    def conditional_headers(self, pdf_url: str) -> dict:
+        """
+        Build the conditional request headers for revalidating a cached listing.
+
+        Args:
+            pdf_url: The URL of the listing page
+
+        Returns:
+            A dictionary with If-None-Match and/or If-Modified-Since, or an empty dictionary
+        """
+        with self._lock:
+            entry = self.entries.get(pdf_url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, pdf_url: str, links: List[str], response_headers: Optional[dict] = None) -> None:
+        """
+        Cache the links found on a listing.
+
+        Args:
+            pdf_url: The URL of the listing page
+            links: The PDF links found on it
+            response_headers: The headers of the listing response
+        """
+        response_headers = response_headers or {}
+        with self._lock:
+            self.entries[pdf_url] = {
+                'links': list(links),
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+            }
+            self._save()
+
+    def touch(self, pdf_url: str) -> None:
+        """
+        Restart the TTL of a cached listing after a 304 Not Modified response.
+
+        Args:
+            pdf_url: The URL of the listing page
+        """
+        with self._lock:
+            if pdf_url in self.entries:
+                self.entries[pdf_url]['fetched_at'] = time.time()
+                self._save()
+
+    def lookup(self, pdf_url: str, ttl: float) -> Optional[List[str]]:
+        """
+        Get the links of a listing without a request while the cache is fresh enough.
+
+        Args:
+            pdf_url: The URL of the listing page
+            ttl: How long cached links are used without contacting the server, in seconds
+
+        Returns:
+            The cached links, or None if the listing has to be fetched
+        """
+        links = self.fresh_links(pdf_url, ttl)
+        if links is not None:
+            print(f"[RTMC] Using cached PDF links for {pdf_url}")
+        else:
+            print(f"[RTMC] Fetching PDF links from: {pdf_url}")
+        return links
+
+    def not_modified(self, pdf_url: str) -> Optional[List[str]]:
+        """
+        Handle a 304 Not Modified response to a conditional listing request.
+
+        Args:
+            pdf_url: The URL of the listing page
+
+        Returns:
+            The cached links with their TTL restarted, or None if nothing is cached
+        """
+        links = self.cached_links(pdf_url)
+        if links is not None:
+            print("[RTMC] PDF listing not modified, using cached links")
+            self.touch(pdf_url)
+        return links
+
+    def stale_links(self, pdf_url: str) -> Optional[List[str]]:
+        """
+        Get the cached links of a listing that could not be fetched.
+
+        Args:
+            pdf_url: The URL of the listing page
+
+        Returns:
+            The cached links regardless of their age, or None if nothing is cached
+        """
+        links = self.cached_links(pdf_url)
+        if links is not None:
+            print("[RTMC] Could not refresh PDF listing, using previously cached links")
+        return links
+
+    def update(self, pdf_url: str, html: str, response_headers: Optional[dict] = None) -> List[str]:
+        """
+        Extract the links from a fetched listing and cache them.
+
+        A listing without links, such as a maintenance or error page served with a 200, is not
+        cached, so it cannot hide the reports; the previously cached links are used instead.
+
+        Args:
+            pdf_url: The URL of the listing page
+            html: The HTML of the listing page
+            response_headers: The headers of the listing response
+
+        Returns:
+            The hrefs ending in .pdf, in page order
+        """
+        links = extract_pdf_links(html)
+        if not links:
+            previous_links = self.cached_links(pdf_url)
+            if previous_links:
+                print("[RTMC] PDF listing has no links, using previously cached links")
+                return previous_links
+            return links
+        self.store(pdf_url, links, response_headers)
+        return links
+
+
+def discover_pdf_links(pdf_url: str, pdf_dir: str, session: requests.Session, headers: dict,
+                       rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                       ttl: float = DEFAULT_LINK_CACHE_TTL, timeout: int = 30) -> List[str]:
+    """
+    Get the PDF links on the listing, from the cache when it is fresh enough.
+
+    An expired cache entry is revalidated with a conditional GET. If the listing cannot be
+    fetched, stale cached links are used when available.
+
+    Args:
+        pdf_url: The URL of the listing page
+        pdf_dir: The directory that holds the link cache
+        session: The session to fetch the listing with
+        headers: The headers to use for the request
+        rate_limiter: The shared rate limiter
+        ttl: How long cached links are used without contacting the server, in seconds
+        timeout: The timeout in seconds
+
+    Returns:
+        The hrefs ending in .pdf, in page order
+
+    Raises:
+        requests.exceptions.RequestException: If the listing cannot be fetched and nothing is cached
+    """
+    cache = LinkCache(pdf_dir)
+    links = cache.lookup(pdf_url, ttl)
+    if links is not None:
+        return links
+
+    request_headers = dict(headers)
+    request_headers.update(cache.conditional_headers(pdf_url))
+    host = AdaptiveRateLimiter.host_of(pdf_url)
+    try:
+        if rate_limiter is not None:
+            rate_limiter.acquire(host)
+        response = session.get(pdf_url, headers=request_headers, timeout=timeout)
+        if rate_limiter is not None:
+            rate_limiter.record_response(host, response.status_code, response.headers.get('Retry-After'))
+
+        if response.status_code == 304 and cache.cached_links(pdf_url) is not None:
+            return cache.not_modified(pdf_url)
+
+        response.raise_for_status()  # Raise an exception for 4XX/5XX responses
+    except requests.exceptions.RequestException:
+        stale_links = cache.stale_links(pdf_url)
+        if stale_links is None:
+            raise
+        return stale_links
+
+    return cache.update(pdf_url, response.text, response.headers)
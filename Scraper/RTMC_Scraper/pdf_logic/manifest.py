@@ -0,0 +1,163 @@
+"""
+Download manifest module for the RTMC Scraper.
+
+This module keeps a JSON manifest in the PDF download directory that records the URL, ETag,
+Last-Modified, size and SHA-256 of every downloaded report, so refreshes can use conditional
+GET requests instead of downloading unchanged reports again.
+"""
+import os
+import json
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 hex digest of a file without reading it into memory at once.
+
+    Args:
+        path: Path to the file
+        chunk_size: The number of bytes to read at a time
+
+    Returns:
+        The hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    Persisted record of the validators and content hash of each downloaded PDF.
+
+    Entries are keyed by the local filename. The manifest is safe to share between
+    download threads and is written to disk atomically after every change.
+    """
+    def __init__(self, pdf_dir: str):
+        self.path = os.path.join(pdf_dir, MANIFEST_FILENAME)
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load the manifest from disk, starting empty if it is missing or unreadable.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            print(f"[RTMC] Error reading download manifest {self.path}: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """
+        Write the manifest to disk atomically.
+        """
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, filename: str) -> Optional[dict]:
+        """
+        Get the manifest entry for a file.
+
+        Args:
+            filename: The local filename of the PDF
+
+        Returns:
+            The entry as a dictionary, or None if the file is not in the manifest
+        """
+        with self._lock:
+            entry = self.entries.get(filename)
+            return dict(entry) if entry else None
+
+    def conditional_headers(self, pdf_url: str, local_path: str) -> dict:
+        """
+        Build the conditional request headers for a PDF that is already on disk.
+
+        Headers are only returned when the manifest entry belongs to the same URL and the
+        file on disk still has the recorded size, so a truncated or replaced file is fetched
+        in full.
+
+        Args:
+            pdf_url: The URL of the PDF
+            local_path: The local path of the PDF
+
+        Returns:
+            A dictionary with If-None-Match and/or If-Modified-Since, or an empty dictionary
+        """
+        entry = self.get(os.path.basename(local_path))
+        if not entry or entry.get('url') != pdf_url or not os.path.exists(local_path):
+            return {}
+        if os.path.getsize(local_path) != entry.get('size'):
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, pdf_url: str, local_path: str, response_headers: Optional[dict] = None,
+               sha256: Optional[str] = None) -> dict:
+        """
+        Record a downloaded or verified PDF and persist the manifest.
+
+        Args:
+            pdf_url: The URL the PDF was downloaded from
+            local_path: The local path of the PDF
+            response_headers: The headers of the response the PDF came from, if any
+            sha256: The content hash if already known, otherwise it is computed from the file
+
+        Returns:
+            The stored entry
+        """
+        filename = os.path.basename(local_path)
+        response_headers = response_headers or {}
+        entry = {
+            'url': pdf_url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'size': os.path.getsize(local_path),
+            'sha256': sha256 or file_sha256(local_path),
+            'checked_at': time.time(),
+        }
+        with self._lock:
+            previous = self.entries.get(filename, {})
+            # Keep validators from an earlier response if this one did not send any
+            if not entry['etag'] and previous.get('sha256') == entry['sha256']:
+                entry['etag'] = previous.get('etag')
+            if not entry['last_modified'] and previous.get('sha256') == entry['sha256']:
+                entry['last_modified'] = previous.get('last_modified')
+            self.entries[filename] = entry
+            self._save_locked()
+        return dict(entry)
+
+    def touch(self, filename: str) -> None:
+        """
+        Mark an entry as checked after a 304 Not Modified response.
+
+        Args:
+            filename: The local filename of the PDF
+        """
+        with self._lock:
+            if filename in self.entries:
+                self.entries[filename]['checked_at'] = time.time()
+                self._save_locked()
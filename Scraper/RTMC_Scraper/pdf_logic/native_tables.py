@@ -0,0 +1,93 @@
+"""
+Native table extraction module for the RTMC Scraper.
+
+This module reads tables from the text layer of a PDF with PyMuPDF's geometric table finder,
+without starting a Java VM. Ruled tables are found from their vector lines; pages without
+ruled tables are searched again for tables aligned on text alone. The result has the same
+shape as tabula's, a list of DataFrames with the header row as columns.
+"""
+import re
+from typing import List, Optional
+import pandas as pd
+import fitz  # PyMuPDF
+
+
+# Strategies tried on each page, in order, until one finds a table
+TABLE_STRATEGIES = ("lines", "text")
+# Tables need at least this many rows (header included) and columns to be kept
+MIN_TABLE_ROWS = 2
+MIN_TABLE_COLUMNS = 2
+# A cell that only holds a figure, with optional thousands separators
+FIGURE_PATTERN = re.compile(r'\d{1,3}(?:[ , ]\d{3})+|\d+')
+
+
+def _clean_cell(value):
+    """Collapse the line breaks of a cell and turn figures into integers and blanks into None like tabula."""
+    if not isinstance(value, str):
+        return value
+    value = " ".join(value.split())
+    if not value:
+        return None
+    if FIGURE_PATTERN.fullmatch(value):
+        return int(re.sub(r'\D', '', value))
+    return value
+
+
+def _clean_table(table: pd.DataFrame) -> pd.DataFrame:
+    """Clean the header and cells of a table read by PyMuPDF."""
+    columns = []
+    for i, name in enumerate(table.columns):
+        # PyMuPDF names columns without a header "Col<n>", give them tabula's "Unnamed: <n>"
+        name = " ".join(str(name).split())
+        if not name or re.fullmatch(r'Col\d+', name):
+            name = f"Unnamed: {i}"
+        columns.append(name if name not in columns else f"{name}.{i}")
+    table = table.map(_clean_cell) if hasattr(table, "map") else table.applymap(_clean_cell)
+    table.columns = columns
+    # Text-aligned tables get a blank row for every gap between lines
+    return table.dropna(how="all").reset_index(drop=True)
+
+
+def find_page_tables(page: fitz.Page) -> List[pd.DataFrame]:
+    """
+    Find the tables on one page.
+
+    Args:
+        page: The PDF page
+
+    Returns:
+        A DataFrame for each table, or an empty list if the page has none
+    """
+    for strategy in TABLE_STRATEGIES:
+        found = page.find_tables(strategy=strategy)
+        tables = [table for table in found.tables
+                  if table.row_count >= MIN_TABLE_ROWS and table.col_count >= MIN_TABLE_COLUMNS]
+        if tables:
+            return [_clean_table(table.to_pandas()) for table in tables]
+    return []
+
+
+def extract_native_tables(pdf_path: str, pages: Optional[List[int]] = None) -> List[pd.DataFrame]:
+    """
+    Extract the tables of a PDF from its text layer with PyMuPDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: Zero-based page numbers to read, or None for every page
+
+    Returns:
+        A list of pandas DataFrames containing the extracted tables
+    """
+    tables = []
+    with fitz.open(pdf_path) as pdf_document:
+        page_numbers = pages if pages is not None else range(pdf_document.page_count)
+        for page_number in page_numbers:
+            page = pdf_document[page_number]
+            # Scanned pages have no words to build tables from
+            if not page.get_text("words"):
+                continue
+            try:
+                tables.extend(find_page_tables(page))
+            except Exception as e:
+                print(f"[RTMC] Error finding tables on page {page_number + 1} of {pdf_path}: {e}")
+    return tables
@@ -0,0 +1,219 @@
+"""
+OCR module for the RTMC Scraper.
+
+This module extracts page text for the RTMC Scraper. Pages of born-digital reports keep a
+native text layer that PyMuPDF reads in milliseconds, so only pages without usable text are
+rendered and run through the OCR engine of the worker. Pages are rendered straight to
+8-bit grayscale and handed to Tesseract as a view of the pixmap's sample buffer, without a
+PNG encode/decode round trip. Pages can be spread across a process pool so a long scanned
+report keeps several cores busy; each worker opens the PDF once and OCRs a contiguous batch
+of pages.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+import fitz  # PyMuPDF
+from PIL import Image
+from .ocr_engine import DEFAULT_OCR_ENGINE, get_ocr_engine
+from .ocr_cache import OcrPageCache
+from .preprocess import preprocess_page
+
+
+# Pages with fewer non-whitespace characters in their text layer than this are OCRed
+MIN_TEXT_LAYER_CHARS = 20
+# In adaptive mode, pages whose mean word confidence is below this are OCRed again at full DPI
+DEFAULT_MIN_CONFIDENCE = 75.0
+
+def default_ocr_workers(config: Optional[dict] = None) -> int:
+    """
+    Get the number of OCR worker processes to use.
+
+    Args:
+        config: The scraper configuration, which may set ocr_workers
+
+    Returns:
+        The ocr_workers setting if present, otherwise the number of CPUs
+    """
+    if config and config.get('ocr_workers'):
+        try:
+            return max(1, int(config['ocr_workers']))
+        except ValueError:
+            print(f"[RTMC] Ignoring invalid ocr_workers setting: {config['ocr_workers']}")
+    return os.cpu_count() or 1
+
+
+def text_layer_pages(pdf_path: str, min_chars: int = MIN_TEXT_LAYER_CHARS) -> Tuple[int, Dict[int, str]]:
+    """
+    Read the native text layer of every page that has one.
+
+    Args:
+        pdf_path: Path to the PDF file
+        min_chars: The minimum number of non-whitespace characters for a text layer to be usable
+
+    Returns:
+        A tuple of the page count and a dictionary mapping page number to text for the pages
+        whose text layer is usable
+    """
+    texts = {}
+    with fitz.open(pdf_path) as pdf_document:
+        total_pages = len(pdf_document)
+        for page_number in range(total_pages):
+            page_text = pdf_document[page_number].get_text()
+            if len(''.join(page_text.split())) >= min_chars:
+                texts[page_number] = page_text
+    return total_pages, texts
+
+
+def render_page(page: fitz.Page, dpi: int = 150) -> fitz.Pixmap:
+    """
+    Rasterize a PDF page to a single-channel grayscale pixmap.
+
+    Args:
+        page: The page to render
+        dpi: The resolution to render at
+
+    Returns:
+        An 8-bit grayscale pixmap without alpha
+    """
+    return page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+
+
+def pixmap_to_image(pix: fitz.Pixmap) -> Image.Image:
+    """
+    Wrap the samples of a grayscale pixmap in a PIL image without copying them.
+
+    The image shares the pixmap's memory, so it must be closed before the pixmap is released.
+
+    Args:
+        pix: A grayscale pixmap from render_page
+
+    Returns:
+        A read-only mode "L" image backed by the pixmap samples
+    """
+    return Image.frombuffer("L", (pix.width, pix.height), pix.samples_mv, "raw", "L", pix.stride, 1)
+
+
+def _recognize(ocr_engine, page: fitz.Page, dpi: int, with_confidence: bool,
+               preprocess: bool = False) -> Tuple[str, Optional[float]]:
+    # Render page as a grayscale image
+    pix = render_page(page, dpi)
+    image = pixmap_to_image(pix)
+    try:
+        if preprocess:
+            # The cleaned page is a new image, so the view of the samples can be released now
+            cleaned = preprocess_page(image)
+            image.close()
+            image = cleaned
+        # Perform OCR on the image
+        if with_confidence:
+            return ocr_engine.image_to_string_with_confidence(image)
+        return ocr_engine.image_to_string(image), None
+    finally:
+        # Release the view of the samples before the pixmap is freed
+        image.close()
+
+
+def ocr_page_batch(pdf_path: str, page_numbers: List[int], dpi: int = 150,
+                   tesseract_cmd: Optional[str] = None, engine: str = DEFAULT_OCR_ENGINE,
+                   page_cache: Optional[OcrPageCache] = None, adaptive_dpi: Optional[int] = None,
+                   min_confidence: float = DEFAULT_MIN_CONFIDENCE, preprocess: bool = False) -> List[Tuple[int, str]]:
+    """
+    OCR a batch of pages of one PDF.
+
+    This is the unit of work sent to OCR worker processes, so it only takes picklable arguments.
+    In adaptive mode each page is first OCRed at adaptive_dpi and rendered again at dpi only
+    when its mean word confidence is below min_confidence.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: Zero-based page numbers to OCR
+        dpi: DPI for rendering PDF pages as images
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        engine: The OCR engine to use (see get_ocr_engine)
+        page_cache: The cache each page's text is written to as soon as it is recognised
+        adaptive_dpi: The low DPI of the first pass, or None to OCR every page at dpi
+        min_confidence: The mean word confidence below which a page is OCRed again at dpi
+        preprocess: Whether to binarize, deskew and crop pages before OCR (see preprocess_page)
+
+    Returns:
+        A list of (page_number, text) tuples in the order of page_numbers
+    """
+    ocr_engine = get_ocr_engine(engine, tesseract_cmd)
+
+    results = []
+    with fitz.open(pdf_path) as pdf_document:
+        for page_number in page_numbers:
+            page = pdf_document[page_number]
+            start = time.perf_counter()
+            if adaptive_dpi and adaptive_dpi < dpi:
+                used_dpi = adaptive_dpi
+                page_text, confidence = _recognize(ocr_engine, page, adaptive_dpi, True, preprocess)
+                if confidence < min_confidence:
+                    used_dpi = dpi
+                    page_text, confidence = _recognize(ocr_engine, page, dpi, True, preprocess)
+            else:
+                used_dpi = dpi
+                page_text, confidence = _recognize(ocr_engine, page, dpi, False, preprocess)
+            if page_cache is not None:
+                page_cache.put(page_number, page_text, dpi=used_dpi, confidence=confidence,
+                               seconds=time.perf_counter() - start)
+            results.append((page_number, page_text))
+    return results
+
+
+def _split_batches(page_numbers: List[int], workers: int) -> List[List[int]]:
+    # A few batches per worker keeps the pool balanced when some pages are slower than others
+    batch_count = min(len(page_numbers), workers * 4)
+    batch_size = -(-len(page_numbers) // batch_count)
+    return [page_numbers[i:i + batch_size] for i in range(0, len(page_numbers), batch_size)]
+
+
+def ocr_pages(pdf_path: str, page_numbers: List[int], dpi: int = 150, tesseract_cmd: Optional[str] = None,
+              workers: int = 1, on_page_done: Optional[Callable[[int, str], None]] = None,
+              engine: str = DEFAULT_OCR_ENGINE, page_cache: Optional[OcrPageCache] = None,
+              adaptive_dpi: Optional[int] = None, min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+              preprocess: bool = False) -> Dict[int, str]:
+    """
+    OCR the given pages of a PDF, in parallel when more than one worker is requested.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: Zero-based page numbers to OCR
+        dpi: DPI for rendering PDF pages as images
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        workers: The number of worker processes (1 runs in this process)
+        on_page_done: Called with (page_number, text) as each page finishes, in completion order
+        engine: The OCR engine to use (see get_ocr_engine)
+        page_cache: The cache each page's text is written to as soon as it is recognised
+        adaptive_dpi: The low DPI of the first pass, or None to OCR every page at dpi
+        min_confidence: The mean word confidence below which a page is OCRed again at dpi
+        preprocess: Whether to binarize, deskew and crop pages before OCR (see preprocess_page)
+
+    Returns:
+        A dictionary mapping page number to OCR text
+    """
+    results = {}
+    if not page_numbers:
+        return results
+    options = {'engine': engine, 'page_cache': page_cache, 'adaptive_dpi': adaptive_dpi,
+               'min_confidence': min_confidence, 'preprocess': preprocess}
+
+    if workers <= 1 or len(page_numbers) == 1:
+        for page_number in page_numbers:
+            for number, text in ocr_page_batch(pdf_path, [page_number], dpi, tesseract_cmd, **options):
+                results[number] = text
+                if on_page_done:
+                    on_page_done(number, text)
+        return results
+
+    batches = _split_batches(page_numbers, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        futures = [executor.submit(ocr_page_batch, pdf_path, batch, dpi, tesseract_cmd, **options)
+                   for batch in batches]
+        for future in as_completed(futures):
+            for number, text in future.result():
+                results[number] = text
+                if on_page_done:
+                    on_page_done(number, text)
+    return results
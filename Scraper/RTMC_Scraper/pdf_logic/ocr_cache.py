@@ -0,0 +1,188 @@
+"""
+Per-page OCR cache for the RTMC Scraper.
+
+This module caches the OCR text of each page in the content store, keyed by the PDF's
+content hash, the page index, the DPI, the OCR engine and its version, and the engine
+configuration. Pages are written as soon as they are recognised, so an interrupted run
+resumes at the first uncached page and a change of parameters only redoes the pages it affects.
+Each entry also records the DPI the page was finally recognised at, its mean word confidence
+and the time it took, so the adaptive DPI trade-off can be tuned from real reports.
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, Optional
+from .content_store import ContentStore
+
+
+# Bump when the page rendering or entry format changes so cached page text is not reused
+OCR_CACHE_VERSION = 2
+
+
+def document_cache_dir(pdf_path: str) -> str:
+    """
+    Get the directory holding the cached OCR pages of a PDF for every set of parameters.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        The cache directory of the PDF's content
+    """
+    store = ContentStore.for_pdf(pdf_path)
+    return os.path.join(store.cache_dir("ocr_pages"), store.hash_for(pdf_path))
+
+
+def cached_page_texts(pdf_path: str, page_numbers: Optional[Iterable[int]] = None) -> Dict[int, str]:
+    """
+    Get whatever OCR text is cached for the pages of a PDF, under any OCR parameters.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: The zero-based page numbers to look up, or None for every cached page
+
+    Returns:
+        A dictionary mapping page number to the text recognised at the highest DPI
+    """
+    wanted = set(page_numbers) if page_numbers is not None else None
+    best = {}
+    try:
+        directory = document_cache_dir(pdf_path)
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"[RTMC] Error listing cached OCR pages of {pdf_path}: {e}")
+        return {}
+    for name in names:
+        # Entries are named <page>.<key>.json, temporary files end in .tmp
+        page, _, suffix = name.partition(".")
+        if not page.isdigit() or not suffix.endswith(".json") or (wanted is not None and int(page) not in wanted):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception:
+            continue
+        dpi = entry.get('dpi') or 0
+        if int(page) not in best or dpi > best[int(page)][0]:
+            best[int(page)] = (dpi, entry.get('text', ""))
+    return {page: text for page, (_, text) in best.items()}
+
+
+class OcrPageCache:
+    """
+    OCR text of the pages of one document for one set of OCR parameters.
+
+    Instances only hold paths so they can be sent to OCR worker processes, which write pages
+    to the cache themselves.
+
+    Args:
+        directory: The cache directory of the document
+        dpi: The DPI pages are rendered at
+        engine_id: The OCR engine name and version, e.g. "tesserocr-5.3.0"
+        config: Any other engine configuration that changes the output
+    """
+    def __init__(self, directory: str, dpi: int, engine_id: str, config: str = ""):
+        self.directory = directory
+        parameters = json.dumps([OCR_CACHE_VERSION, dpi, engine_id, config])
+        self.key = hashlib.sha1(parameters.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def for_pdf(cls, pdf_path: str, dpi: int, engine_id: str, config: str = "") -> "OcrPageCache":
+        """
+        Get the page cache of a PDF in the content store of its directory.
+
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: The DPI pages are rendered at
+            engine_id: The OCR engine name and version
+            config: Any other engine configuration that changes the output
+
+        Returns:
+            The OcrPageCache for the PDF's content
+        """
+        return cls(document_cache_dir(pdf_path), dpi, engine_id, config)
+
+    def path(self, page_number: int) -> str:
+        """
+        Get the cache file of a page.
+
+        Args:
+            page_number: The zero-based page number
+
+        Returns:
+            The path of the cache file
+        """
+        return os.path.join(self.directory, f"{page_number:05d}.{self.key}.json")
+
+    def get_entry(self, page_number: int) -> Optional[dict]:
+        """
+        Get the cache entry of a page.
+
+        Args:
+            page_number: The zero-based page number
+
+        Returns:
+            A dictionary with text, dpi, confidence and seconds, or None if the page is not cached
+        """
+        try:
+            with open(self.path(page_number), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[RTMC] Error reading cached OCR text of page {page_number + 1}: {e}")
+            return None
+
+    def get(self, page_number: int) -> Optional[str]:
+        """
+        Get the cached text of a page.
+
+        Args:
+            page_number: The zero-based page number
+
+        Returns:
+            The cached text, or None if the page is not cached
+        """
+        entry = self.get_entry(page_number)
+        return entry['text'] if entry else None
+
+    def get_many(self, page_numbers: Iterable[int]) -> Dict[int, str]:
+        """
+        Get the cached text of several pages.
+
+        Args:
+            page_numbers: The zero-based page numbers
+
+        Returns:
+            A dictionary mapping page number to text for the pages that are cached
+        """
+        texts = {}
+        for page_number in page_numbers:
+            text = self.get(page_number)
+            if text is not None:
+                texts[page_number] = text
+        return texts
+
+    def put(self, page_number: int, text: str, dpi: Optional[int] = None,
+            confidence: Optional[float] = None, seconds: Optional[float] = None) -> None:
+        """
+        Cache the text of a page.
+
+        Args:
+            page_number: The zero-based page number
+            text: The OCR text of the page
+            dpi: The DPI the text was recognised at
+            confidence: The mean word confidence of the text, if it was measured
+            seconds: How long rendering and recognising the page took
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(page_number)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'text': text, 'dpi': dpi, 'confidence': confidence, 'seconds': seconds}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[RTMC] Error caching OCR text of page {page_number + 1}: {e}")
@@ -0,0 +1,296 @@
+"""
+OCR engine module for the RTMC Scraper.
+
+This module hides which Tesseract binding is used behind a small engine interface. The
+tesserocr engine keeps one Tesseract API handle per worker with the language model loaded
+once and reuses it for every page; the pytesseract engine launches the tesseract executable
+per page and is used when tesserocr is not installed.
+"""
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+from PIL import Image
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+DEFAULT_OCR_ENGINE = "auto"
+DEFAULT_OCR_LANG = "eng"
+# Tesseract page segmentation modes used for table cells
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+# White space around and between cells stacked into one image for pytesseract
+CELL_PADDING = 12
+
+Box = Tuple[int, int, int, int]
+
+
+class PytesseractEngine:
+    """
+    OCR engine that runs the tesseract executable for every image.
+
+    Args:
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        lang: The Tesseract language
+    """
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: Optional[str] = None, lang: str = DEFAULT_OCR_LANG):
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.lang = lang
+
+    @property
+    def version(self) -> str:
+        """The version of the Tesseract executable."""
+        try:
+            return str(pytesseract.get_tesseract_version())
+        except Exception:
+            return "unknown"
+
+    def image_to_string(self, image: Image.Image) -> str:
+        """
+        Recognize the text in an image.
+
+        Args:
+            image: The page image
+
+        Returns:
+            The recognized text
+        """
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def image_to_string_with_confidence(self, image: Image.Image) -> Tuple[str, float]:
+        """
+        Recognize the text in an image along with the mean word confidence.
+
+        Args:
+            image: The page image
+
+        Returns:
+            A tuple of the recognized text and the mean word confidence from 0 to 100
+        """
+        data = pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if not word.strip() or confidence < 0:
+                continue
+            confidences.append(confidence)
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(key, []).append(word)
+
+        # Rebuild the text line by line, with a blank line between paragraphs like image_to_string
+        text_lines = []
+        previous_paragraph = None
+        for (block, paragraph, _), words in lines.items():
+            if previous_paragraph is not None and (block, paragraph) != previous_paragraph:
+                text_lines.append("")
+            text_lines.append(" ".join(words))
+            previous_paragraph = (block, paragraph)
+        return "\n".join(text_lines), mean_confidence(confidences)
+
+    def _config(self, psm: int, whitelist: Optional[str]) -> str:
+        config = f"--psm {psm}"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        return config
+
+    def recognize_cells(self, image: Image.Image, boxes: Sequence[Box],
+                        whitelist: Optional[str] = None) -> List[str]:
+        """
+        Recognize single-line table cells of a page image.
+
+        The cells are stacked into one image and recognized with a single tesseract run, one
+        line per cell. If the number of lines does not match the number of cells, every cell
+        is recognized on its own instead.
+
+        Args:
+            image: The page image
+            boxes: The (left, top, right, bottom) box of each cell
+            whitelist: The only characters the cells may contain
+
+        Returns:
+            The text of each cell in the order of boxes
+        """
+        crops = [image.crop(box) for box in boxes]
+        # Blank cells would not produce a line, so they are left out of the stack
+        inked = [i for i, crop in enumerate(crops) if crop.getextrema()[0] < 128]
+        texts = [""] * len(boxes)
+        if not inked:
+            return texts
+
+        width = max(crops[i].width for i in inked) + 2 * CELL_PADDING
+        height = sum(crops[i].height + CELL_PADDING for i in inked) + CELL_PADDING
+        stack = Image.new("L", (width, height), 255)
+        top = CELL_PADDING
+        for i in inked:
+            stack.paste(crops[i], (CELL_PADDING, top))
+            top += crops[i].height + CELL_PADDING
+
+        output = pytesseract.image_to_string(stack, lang=self.lang, config=self._config(PSM_SINGLE_BLOCK, whitelist))
+        lines = [line.strip() for line in output.splitlines() if line.strip()]
+        if len(lines) == len(inked):
+            for i, line in zip(inked, lines):
+                texts[i] = line
+            return texts
+
+        config = self._config(PSM_SINGLE_LINE, whitelist)
+        for i in inked:
+            texts[i] = pytesseract.image_to_string(crops[i], lang=self.lang, config=config).strip()
+        return texts
+
+    def close(self) -> None:
+        """Release the engine's resources."""
+
+
+class TesserocrEngine:
+    """
+    OCR engine that keeps a Tesseract API handle open across images.
+
+    Args:
+        tesseract_cmd: Path to the tesseract executable, used to find its tessdata directory
+        lang: The Tesseract language
+
+    Raises:
+        ImportError: If tesserocr is not installed
+        RuntimeError: If Tesseract cannot be initialised
+    """
+    name = "tesserocr"
+
+    def __init__(self, tesseract_cmd: Optional[str] = None, lang: str = DEFAULT_OCR_LANG):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed, install it with: pip install tesserocr")
+        kwargs = {'lang': lang}
+        tessdata = _tessdata_dir(tesseract_cmd)
+        if tessdata:
+            kwargs['path'] = tessdata
+        self.lang = lang
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    @property
+    def version(self) -> str:
+        """The version of the Tesseract library."""
+        return str(tesserocr.tesseract_version()).splitlines()[0]
+
+    def image_to_string(self, image: Image.Image) -> str:
+        """
+        Recognize the text in an image.
+
+        Args:
+            image: The page image
+
+        Returns:
+            The recognized text
+        """
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def image_to_string_with_confidence(self, image: Image.Image) -> Tuple[str, float]:
+        """
+        Recognize the text in an image along with the mean word confidence.
+
+        Args:
+            image: The page image
+
+        Returns:
+            A tuple of the recognized text and the mean word confidence from 0 to 100
+        """
+        self._api.SetImage(image)
+        text = self._api.GetUTF8Text()
+        return text, mean_confidence(self._api.AllWordConfidences())
+
+    def recognize_cells(self, image: Image.Image, boxes: Sequence[Box],
+                        whitelist: Optional[str] = None) -> List[str]:
+        """
+        Recognize single-line table cells of a page image.
+
+        The page is handed to Tesseract once and each cell is recognized as a rectangle of it.
+
+        Args:
+            image: The page image
+            boxes: The (left, top, right, bottom) box of each cell
+            whitelist: The only characters the cells may contain
+
+        Returns:
+            The text of each cell in the order of boxes
+        """
+        self._api.SetPageSegMode(tesserocr.PSM.SINGLE_LINE)
+        self._api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        try:
+            self._api.SetImage(image)
+            texts = []
+            for left, top, right, bottom in boxes:
+                self._api.SetRectangle(left, top, right - left, bottom - top)
+                texts.append(self._api.GetUTF8Text().strip())
+            return texts
+        finally:
+            self._api.SetPageSegMode(tesserocr.PSM.AUTO)
+            self._api.SetVariable("tessedit_char_whitelist", "")
+
+    def close(self) -> None:
+        """Release the Tesseract API handle."""
+        self._api.End()
+
+
+def mean_confidence(confidences) -> float:
+    """
+    Average word confidences, treating a page without any words as unreadable.
+
+    Args:
+        confidences: The word confidences from 0 to 100
+
+    Returns:
+        The mean confidence, or 0.0 if there are no words
+    """
+    confidences = list(confidences)
+    return sum(confidences) / len(confidences) if confidences else 0.0
+
+
+def _tessdata_dir(tesseract_cmd: Optional[str]) -> Optional[str]:
+    # A custom Tesseract install keeps its models next to the executable
+    if os.environ.get('TESSDATA_PREFIX') or not tesseract_cmd:
+        return None
+    tessdata = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+    return tessdata if os.path.isdir(tessdata) else None
+
+
+# Engines are created once per worker thread and reused for every page it OCRs
+_engines = threading.local()
+
+
+def get_ocr_engine(engine: str = DEFAULT_OCR_ENGINE, tesseract_cmd: Optional[str] = None,
+                   lang: str = DEFAULT_OCR_LANG):
+    """
+    Get the OCR engine for this worker, creating it on first use.
+
+    Args:
+        engine: "tesserocr", "pytesseract", or "auto" to use tesserocr when it is installed
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        lang: The Tesseract language
+
+    Returns:
+        An engine with name, version, image_to_string(image),
+        image_to_string_with_confidence(image) and recognize_cells(image, boxes, whitelist)
+    """
+    cache = getattr(_engines, 'cache', None)
+    if cache is None:
+        cache = _engines.cache = {}
+    key = (engine, tesseract_cmd, lang)
+    if key not in cache:
+        cache[key] = _create_engine(engine, tesseract_cmd, lang)
+    return cache[key]
+
+
+def _create_engine(engine: str, tesseract_cmd: Optional[str], lang: str):
+    if engine in ("auto", "tesserocr") and (tesserocr is not None or engine == "tesserocr"):
+        try:
+            return TesserocrEngine(tesseract_cmd, lang)
+        except Exception as e:
+            print(f"[RTMC] Could not start tesserocr, falling back to pytesseract: {e}")
+    return PytesseractEngine(tesseract_cmd, lang)
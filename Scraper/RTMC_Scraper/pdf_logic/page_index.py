@@ -0,0 +1,190 @@
+"""
+Keyword page index for the RTMC Scraper.
+
+This module maps the keywords that mark the provincial crash tables (province names, crash
+metrics, the column headings extract_accident_data_from_tables looks for, and table of
+contents headings) to the pages that mention them. The index is built from the text layer and
+from whatever OCR text is already cached, stored per content hash, and only extended with the
+pages that gained OCR text since, so page selection and the table extractors look pages up
+instead of re-reading the document.
+"""
+import os
+import re
+import json
+from typing import Dict, List, Optional, Set
+from .content_store import ContentStore
+from .ocr import text_layer_pages
+from .ocr_cache import cached_page_texts
+
+
+# Bump when the keywords change so stored indexes are rebuilt
+PAGE_INDEX_VERSION = 1
+PROVINCES = ["eastern cape", "free state", "gauteng", "kwazulu", "limpopo", "mpumalanga",
+             "north west", "northern cape", "western cape"]
+# Words that mark a table of crash figures rather than a mention of a province in prose
+METRIC_PATTERN = re.compile(r'\b(crash|crashes|fatal|fatalities|accidents?|deaths?|killed)\b')
+# Column headings of the tables extract_accident_data_from_tables can read
+HEADING_PATTERNS = {'province': re.compile(r'provinc'), 'region': re.compile(r'\bregion')}
+# Table of contents pages, whose text is kept to resolve their entries
+TOC_PAGE_PATTERN = re.compile(r'(contents|list of tables|list of figures)', re.IGNORECASE)
+# The number of distinct provinces a page has to name to be a candidate
+MIN_PROVINCES = 4
+
+
+def page_keywords(text: str) -> Set[str]:
+    """
+    Find the index keywords in the text of a page.
+
+    Args:
+        text: The text of the page
+
+    Returns:
+        The provinces, crash metric words and column headings the page mentions
+    """
+    lowered = text.lower()
+    keywords = {province for province in PROVINCES if province in lowered}
+    keywords.update(match.group(1) for match in METRIC_PATTERN.finditer(lowered))
+    keywords.update(name for name, pattern in HEADING_PATTERNS.items() if pattern.search(lowered))
+    return keywords
+
+
+class PageIndex:
+    """
+    Keywords of the pages of one report.
+
+    Args:
+        path: The index file, or None if it cannot be stored
+        total_pages: The number of pages in the report
+    """
+    def __init__(self, path: Optional[str], total_pages: int = 0):
+        self.path = path
+        self.total_pages = total_pages
+        self.keywords: Dict[str, List[int]] = {}
+        self.indexed: Set[int] = set()
+        self.toc_texts: Dict[int, str] = {}
+        self.changed = False
+
+    @classmethod
+    def for_pdf(cls, pdf_path: str) -> "PageIndex":
+        """
+        Get the index of a PDF, building it from the text layer on first use and adding the
+        pages whose OCR text has been cached since.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            The PageIndex for the PDF's content
+        """
+        try:
+            store = ContentStore.for_pdf(pdf_path)
+            path = os.path.join(store.cache_dir("page_index"), f"{store.hash_for(pdf_path)}.json")
+        except Exception as e:
+            print(f"[RTMC] Error locating page index for {pdf_path}: {e}")
+            path = None
+
+        index = cls._load(path) if path else None
+        if index is None:
+            total_pages, texts = text_layer_pages(pdf_path)
+            index = cls(path, total_pages)
+            index.add_pages(texts)
+            index.changed = True
+
+        missing = index.unindexed_pages()
+        if missing:
+            index.add_pages(cached_page_texts(pdf_path, missing))
+        index.save()
+        return index
+
+    @classmethod
+    def _load(cls, path: str) -> Optional["PageIndex"]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[RTMC] Error reading page index {path}: {e}")
+            return None
+        if data.get('version') != PAGE_INDEX_VERSION:
+            return None
+        index = cls(path, data['total_pages'])
+        index.keywords = data['keywords']
+        index.indexed = set(data['indexed'])
+        index.toc_texts = {int(page): text for page, text in data['toc_texts'].items()}
+        return index
+
+    def add_pages(self, texts: Dict[int, str]) -> None:
+        """
+        Index the text of some pages.
+
+        Args:
+            texts: A dictionary mapping zero-based page number to text
+        """
+        for page_number, text in texts.items():
+            if page_number in self.indexed:
+                continue
+            for keyword in page_keywords(text):
+                pages = self.keywords.setdefault(keyword, [])
+                pages.append(page_number)
+                pages.sort()
+            if TOC_PAGE_PATTERN.search(text):
+                self.toc_texts[page_number] = text
+            self.indexed.add(page_number)
+            self.changed = True
+
+    def pages_with(self, *keywords: str) -> List[int]:
+        """
+        Get the pages that mention any of the keywords.
+
+        Args:
+            *keywords: Index keywords, e.g. "gauteng", "fatal" or "province"
+
+        Returns:
+            The sorted zero-based page numbers
+        """
+        pages = set()
+        for keyword in keywords:
+            pages.update(self.keywords.get(keyword, []))
+        return sorted(pages)
+
+    def table_pages(self, min_provinces: int = MIN_PROVINCES) -> List[int]:
+        """
+        Get the pages that look like a provincial crash or fatality table.
+
+        Args:
+            min_provinces: The number of distinct provinces a page has to name
+
+        Returns:
+            The sorted zero-based page numbers of pages naming enough provinces and a crash metric
+        """
+        province_counts: Dict[int, int] = {}
+        for province in PROVINCES:
+            for page_number in self.keywords.get(province, []):
+                province_counts[page_number] = province_counts.get(page_number, 0) + 1
+        metric_pages = set(self.pages_with(*(keyword for keyword in self.keywords if METRIC_PATTERN.fullmatch(keyword))))
+        return sorted(n for n, count in province_counts.items() if count >= min_provinces and n in metric_pages)
+
+    def unindexed_pages(self) -> List[int]:
+        """
+        Get the pages without a text layer or cached OCR text.
+
+        Returns:
+            The sorted zero-based page numbers
+        """
+        return [n for n in range(self.total_pages) if n not in self.indexed]
+
+    def save(self) -> None:
+        """Write the index to the content store if it changed."""
+        if not self.path or not self.changed:
+            return
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PAGE_INDEX_VERSION, 'total_pages': self.total_pages,
+                           'keywords': self.keywords, 'indexed': sorted(self.indexed),
+                           'toc_texts': self.toc_texts}, f)
+            os.replace(tmp_path, self.path)
+            self.changed = False
+        except Exception as e:
+            print(f"[RTMC] Error saving page index: {e}")
@@ -0,0 +1,132 @@
+"""
+Page selection module for the RTMC Scraper.
+
+This module picks the pages of a report that are likely to hold the provincial crash and
+fatality tables, so only those pages go through table extraction and full-resolution OCR.
+Candidates come from the cheapest source that has them: the keyword page index (built from
+the native text layer and any cached OCR text), the report's table of contents (outline or
+"Contents"/"List of Tables" pages), and finally a fast low-resolution OCR pre-pass over the
+pages the index has no text for.
+"""
+import re
+from typing import Dict, List, Optional, Set
+import fitz  # PyMuPDF
+from .ocr import ocr_pages
+from .ocr_cache import OcrPageCache
+from .ocr_engine import DEFAULT_OCR_ENGINE, get_ocr_engine
+from .page_index import PageIndex, PROVINCES, METRIC_PATTERN, TOC_PAGE_PATTERN, MIN_PROVINCES
+
+
+# Table of contents entries that point at the provincial tables
+TOC_TITLE_PATTERN = re.compile(r'provinc|fatal|crash|region', re.IGNORECASE)
+# "Table 4: Fatal crashes per province ........ 23"
+TOC_ENTRY_PATTERN = re.compile(r'^(?P<title>.*?\w.*?)[\s.·…_-]{2,}(?P<page>\d{1,3})\s*$')
+# DPI of the OCR pre-pass over scanned pages, just enough to spot province names
+PREPASS_DPI = 72
+
+
+def is_table_page(text: str, min_provinces: int = MIN_PROVINCES) -> bool:
+    """
+    Check whether the text of a page looks like a provincial crash or fatality table.
+
+    Args:
+        text: The text of the page
+        min_provinces: The number of distinct provinces the page has to name
+
+    Returns:
+        True if the page names enough provinces and a crash metric
+    """
+    lowered = text.lower()
+    provinces = sum(1 for province in PROVINCES if province in lowered)
+    return provinces >= min_provinces and METRIC_PATTERN.search(lowered) is not None
+
+
+def parse_toc_pages(text: str) -> List[int]:
+    """
+    Find the printed page numbers of provincial tables in a table of contents page.
+
+    Handles entries with the page number on the same line as the title as well as entries
+    whose page number is on the following line.
+
+    Args:
+        text: The text of the table of contents page
+
+    Returns:
+        The printed (one-based) page numbers of matching entries
+    """
+    pages = []
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        match = TOC_ENTRY_PATTERN.match(line)
+        if match:
+            title, page = match.group('title'), match.group('page')
+        elif line.isdigit() and i > 0:
+            title, page = lines[i - 1], line
+        else:
+            continue
+        if TOC_TITLE_PATTERN.search(title):
+            pages.append(int(page))
+    return pages
+
+
+def _printed_to_index(printed_page: int, labels: Dict[str, int], total_pages: int) -> List[int]:
+    # Page labels map printed numbers exactly; without them allow for a cover page or two
+    if str(printed_page) in labels:
+        return [labels[str(printed_page)]]
+    candidates = [printed_page - 1, printed_page, printed_page + 1]
+    return [n for n in candidates if 0 <= n < total_pages]
+
+
+def _toc_candidates(page_texts: Dict[int, str], labels: Dict[str, int], total_pages: int) -> Set[int]:
+    candidates = set()
+    for text in page_texts.values():
+        if TOC_PAGE_PATTERN.search(text):
+            for printed_page in parse_toc_pages(text):
+                candidates.update(_printed_to_index(printed_page, labels, total_pages))
+    return candidates
+
+
+def select_table_pages(pdf_path: str, prepass: bool = True, prepass_dpi: int = PREPASS_DPI,
+                       tesseract_cmd: Optional[str] = None, engine: str = DEFAULT_OCR_ENGINE,
+                       workers: int = 1) -> List[int]:
+    """
+    Pick the pages of a report that likely hold the provincial tables.
+
+    Args:
+        pdf_path: Path to the PDF file
+        prepass: Whether to run a low-resolution OCR pass over pages without a text layer or cached OCR text
+        prepass_dpi: The DPI of the OCR pre-pass
+        tesseract_cmd: Path to the tesseract executable, if not on the PATH
+        engine: The OCR engine for the pre-pass (see get_ocr_engine)
+        workers: The number of OCR worker processes for the pre-pass
+
+    Returns:
+        The sorted zero-based page numbers, or an empty list if no page could be identified
+    """
+    index = PageIndex.for_pdf(pdf_path)
+    total_pages = index.total_pages
+    with fitz.open(pdf_path) as pdf_document:
+        outline = pdf_document.get_toc()
+        labels = {}
+        if pdf_document.get_page_labels():
+            labels = {pdf_document[n].get_label(): n for n in range(total_pages)}
+
+    # Bookmarks point at physical pages already
+    candidates = {page - 1 for _, title, page in outline
+                  if TOC_TITLE_PATTERN.search(title) and 0 < page <= total_pages}
+
+    # Pages without a text layer or cached OCR text are indexed from a fast OCR pre-pass
+    scanned_pages = index.unindexed_pages()
+    if prepass and scanned_pages:
+        ocr_engine = get_ocr_engine(engine, tesseract_cmd)
+        page_cache = OcrPageCache.for_pdf(pdf_path, prepass_dpi, f"{ocr_engine.name}-{ocr_engine.version}")
+        prepass_texts = page_cache.get_many(scanned_pages)
+        prepass_texts.update(ocr_pages(pdf_path, [n for n in scanned_pages if n not in prepass_texts],
+                                       dpi=prepass_dpi, tesseract_cmd=tesseract_cmd, workers=workers,
+                                       engine=engine, page_cache=page_cache))
+        index.add_pages(prepass_texts)
+        index.save()
+
+    candidates.update(index.table_pages())
+    candidates.update(_toc_candidates(index.toc_texts, labels, total_pages))
+    return sorted(candidates)
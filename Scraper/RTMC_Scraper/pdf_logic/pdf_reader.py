@@ -5,14 +5,36 @@ This module provides functionality for extracting data from PDF files.
 """
 import os
 import re
-import tabula
 import pandas as pd
 import fitz  # PyMuPDF
-from PIL import Image
-import pytesseract
-import io
 from typing import List, Dict, Optional, Tuple
 from Scraper import AccidentRecord
+from .content_store import ContentStore
+from .ocr import ocr_pages, default_ocr_workers, text_layer_pages, DEFAULT_MIN_CONFIDENCE
+from .ocr_engine import DEFAULT_OCR_ENGINE, get_ocr_engine
+from .ocr_cache import OcrPageCache
+from .page_selection import select_table_pages
+from .page_index import PageIndex, HEADING_PATTERNS
+from .cell_ocr import ocr_table_cells
+from .tabula_reader import read_pdf_tables, java_available, jvm_started
+from .native_tables import extract_native_tables
+from .report_period import resolve_report_period
+from .backends import BACKENDS, ExtractionBackend, BackendDecision, register_backend, probe_pdf, rank_backends
+
+
+# Bump when the table extraction changes so content-keyed table caches are rebuilt
+TABLE_CACHE_VERSION = 3
+# "auto" picks the cheapest viable extraction backend per report, a backend name tries it first
+DEFAULT_TABLE_BACKEND = "auto"
+# Extractors for tables in the text layer: "tabula" (Java) or "pymupdf" (no JVM)
+TABLE_BACKENDS = ("tabula", "pymupdf")
+# Rough seconds per page of each extraction backend, used to try the cheapest one first
+TEXT_LAYER_PAGE_SECONDS = 0.01
+NATIVE_TABLE_PAGE_SECONDS = 0.05
+TABULA_PAGE_SECONDS = 0.3
+TABULA_STARTUP_SECONDS = 3.0
+CELL_OCR_PAGE_SECONDS = 1.5
+OCR_PAGE_SECONDS = 3.0
 
 
 def read_config() -> dict:
@@ -39,54 +61,114 @@ def read_config() -> dict:
         return {}
 
 
+def table_backend() -> str:
+    """
+    Get the extraction backend set with table_backend in config.txt.
+
+    Returns:
+        "auto" or the name of a registered backend, falling back to "auto" for unknown values
+    """
+    backend = read_config().get('table_backend', DEFAULT_TABLE_BACKEND).lower()
+    if backend != "auto" and backend not in BACKENDS:
+        print(f"[RTMC] Unknown table_backend {backend}, using {DEFAULT_TABLE_BACKEND}")
+        return DEFAULT_TABLE_BACKEND
+    return backend
+
+
+def read_text_layer_tables(pdf_path: str, pages: Optional[List[int]] = None,
+                           backend: Optional[str] = None) -> List[pd.DataFrame]:
+    """
+    Read the tables in the text layer of a PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: Zero-based page numbers to read, or None for every page (an empty list reads nothing)
+        backend: "tabula" or "pymupdf", None to use the configured table_backend (PyMuPDF
+            unless it is tabula)
+
+    Returns:
+        A list of pandas DataFrames containing the extracted tables
+    """
+    if pages is not None and not pages:
+        return []
+    if backend is None:
+        backend = table_backend()
+    if backend == "tabula":
+        return read_pdf_tables(pdf_path, pages=[n + 1 for n in pages] if pages else 'all')
+    return extract_native_tables(pdf_path, pages)
+
+
 def extract_year_from_pdf(pdf_path: str) -> Optional[int]:
     """
-    Extract the year from the PDF filename or content.
+    Extract the year from the PDF filename, metadata or first page.
 
     Args:
         pdf_path: Path to the PDF file
 
     Returns:
-        The extracted year as an integer, or None if no year could be extracted
+        The calendar year the report's period starts in, or None if no year could be extracted
     """
-    # First try to extract year from filename
-    filename = os.path.basename(pdf_path)
-    year_match = re.search(r'20\d{2}', filename)
-    if year_match:
-        return int(year_match.group(0))
+    period = resolve_report_period(pdf_path)
+    return period.year if period else None
+
+
+def content_cache_path(pdf_path: str, kind: str, suffix: str) -> Optional[str]:
+    """
+    Get the path of a downstream cache entry keyed by the PDF's content hash.
+
+    Args:
+        pdf_path: Path to the PDF file
+        kind: The name of the cache, e.g. "ocr" or "tables"
+        suffix: The file suffix of the cache entry
 
-    # If that fails, try to extract year from the PDF content
+    Returns:
+        The cache file path, or None if the PDF cannot be hashed
+    """
     try:
-        # Extract text from the first page
-        tables = tabula.read_pdf(pdf_path, pages=1, multiple_tables=True)
-        if tables:
-            # Convert tables to string and search for year
-            for table in tables:
-                table_str = str(table)
-                year_match = re.search(r'20\d{2}', table_str)
-                if year_match:
-                    return int(year_match.group(0))
+        store = ContentStore.for_pdf(pdf_path)
+        return os.path.join(store.cache_dir(kind), f"{store.hash_for(pdf_path)}{suffix}")
     except Exception as e:
-        print(f"[RTMC] Error extracting year from PDF {pdf_path}: {e}")
+        print(f"[RTMC] Error locating {kind} cache for {pdf_path}: {e}")
+        return None
 
-    # If all else fails, return None
-    return None
 
-
-def pdf_to_text_ocr(pdf_path: str, dpi: int = 150, save_output: bool = True) -> str:
+def pdf_to_text_ocr(pdf_path: str, dpi: int = 150, save_output: bool = True,
+                    workers: Optional[int] = None, use_text_layer: bool = True,
+                    pages: Optional[List[int]] = None, adaptive_dpi: Optional[int] = None,
+                    min_confidence: Optional[float] = None, preprocess: Optional[bool] = None,
+                    engine: Optional[str] = None) -> str:
     """
     Extract text from a PDF file using OCR.
 
+    Pages that carry a usable native text layer are read directly, the remaining pages are
+    OCRed in parallel on a process pool, and the text is reassembled in page order. OCR text
+    is cached per page by content hash, DPI and engine, so renamed or duplicate reports are
+    not OCRed again and an interrupted run resumes at the first page that was not finished.
+
     Args:
         pdf_path: Path to the PDF file
         dpi: DPI for rendering PDF pages as images
         save_output: Whether to save the extracted text to a file
+        workers: The number of OCR worker processes (defaults to the ocr_workers setting
+            in config.txt, or the number of CPUs)
+        use_text_layer: Whether to use the native text layer of pages that have one instead of OCR
+        pages: Zero-based page numbers to extract, or None for the whole document. The text of
+            a page selection is not saved to the _ocr.txt file, which always holds the whole document
+        adaptive_dpi: If set, pages are first OCRed at this lower DPI and only pages whose mean
+            word confidence is below min_confidence are OCRed again at dpi (defaults to the
+            ocr_adaptive_dpi setting in config.txt, off when absent)
+        min_confidence: The mean word confidence from 0 to 100 a low-DPI page needs to be kept
+            (defaults to the ocr_min_confidence setting in config.txt, or 75)
+        preprocess: Whether to binarize, deskew and crop scanned pages before OCR (defaults to
+            the ocr_preprocess setting in config.txt, off when absent)
+        engine: The OCR engine, "tesserocr", "pytesseract" or "auto" (defaults to the ocr_engine
+            setting in config.txt, or "auto")
 
     Returns:
         Extracted text as a string
     """
     text = ""
-    # Check if the output file already exists
+    # Check if the output file already exists, it holds every page so it also covers a page selection
     output_file = os.path.splitext(pdf_path)[0] + "_ocr.txt"
     if os.path.exists(output_file):
         print(f"[RTMC] OCR text file already exists for {pdf_path}, skipping OCR processing")
@@ -99,46 +181,91 @@ def pdf_to_text_ocr(pdf_path: str, dpi: int = 150, save_output: bool = True) ->
             # If there's an error reading the file, continue with OCR processing
 
     try:
-        # Get tesseract path from config
+        # Get tesseract path, OCR engine and worker count from config
         config = read_config()
         tesseract_cmd = config.get('tesseract_cmd')
-        if tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-
-        # Open the PDF file
-        pdf_document = fitz.open(pdf_path)
-        total_pages = len(pdf_document)
+        if engine is None:
+            engine = config.get('ocr_engine', DEFAULT_OCR_ENGINE)
+        if workers is None:
+            workers = default_ocr_workers(config)
+        if adaptive_dpi is None and config.get('ocr_adaptive_dpi'):
+            adaptive_dpi = int(config['ocr_adaptive_dpi'])
+        if min_confidence is None:
+            min_confidence = float(config.get('ocr_min_confidence', DEFAULT_MIN_CONFIDENCE))
+        if preprocess is None:
+            preprocess = config.get('ocr_preprocess', '').lower() in ('1', 'true', 'yes')
+        ocr_options = []
+        if adaptive_dpi and adaptive_dpi < dpi:
+            ocr_options.append(f"adaptive_dpi={adaptive_dpi},min_confidence={min_confidence}")
+        if preprocess:
+            ocr_options.append("preprocess")
+
+        # Read the native text layer, only pages without one need OCR
+        if use_text_layer:
+            total_pages, page_texts = text_layer_pages(pdf_path)
+        else:
+            with fitz.open(pdf_path) as pdf_document:
+                total_pages = len(pdf_document)
+            page_texts = {}
+        # Limit the work to the selected pages
+        if pages is None:
+            selected_pages = list(range(total_pages))
+        else:
+            selected_pages = sorted(n for n in set(pages) if 0 <= n < total_pages)
+        page_texts = {n: page_texts[n] for n in selected_pages if n in page_texts}
+        ocr_page_numbers = [n for n in selected_pages if n not in page_texts]
+
+        # Reuse the pages already recognised with the same content, DPI and engine
+        page_cache = None
+        cached_count = 0
+        if ocr_page_numbers:
+            ocr_engine = get_ocr_engine(engine, tesseract_cmd)
+            try:
+                page_cache = OcrPageCache.for_pdf(pdf_path, dpi, f"{ocr_engine.name}-{ocr_engine.version}",
+                                                  ";".join(ocr_options))
+                cached_texts = page_cache.get_many(ocr_page_numbers)
+            except Exception as e:
+                print(f"[RTMC] Error opening OCR page cache for {pdf_path}: {e}")
+                cached_texts = {}
+            cached_count = len(cached_texts)
+            page_texts.update(cached_texts)
+            ocr_page_numbers = [n for n in ocr_page_numbers if n not in cached_texts]
+        ocr_total = len(ocr_page_numbers)
         progress_bar_width = 50  # Width of the progress bar
 
-        print(f"[RTMC] Starting OCR processing for {os.path.basename(pdf_path)} ({total_pages} pages)")
+        print(f"[RTMC] Starting OCR processing for {os.path.basename(pdf_path)} ({len(selected_pages)} of {total_pages} pages, "
+              f"{len(selected_pages) - ocr_total - cached_count} with a text layer, {cached_count} cached, "
+              f"{ocr_total} to OCR with {workers} workers)")
 
-        for page_number in range(total_pages):
+        done = [0]
+
+        def show_progress(page_number: int, page_text: str) -> None:
             # Show OCR progress
-            progress = int(100 * page_number / total_pages)
-            filled_length = int(progress_bar_width * page_number // total_pages)
+            done[0] += 1
+            progress = int(100 * done[0] / ocr_total)
+            filled_length = int(progress_bar_width * done[0] // ocr_total)
             bar = '█' * filled_length + '░' * (progress_bar_width - filled_length)
-            print(f"\r[RTMC] OCR Progress: |{bar}| {progress}% (Page {page_number + 1}/{total_pages})", end="")
+            print(f"\r[RTMC] OCR Progress: |{bar}| {progress}% (Page {done[0]}/{ocr_total})", end="")
 
-            # Render page as an image
-            page = pdf_document[page_number]
-            pix = page.get_pixmap(dpi=dpi)
-            image = Image.open(io.BytesIO(pix.tobytes("png")))
+        page_texts.update(ocr_pages(pdf_path, ocr_page_numbers, dpi=dpi, tesseract_cmd=tesseract_cmd,
+                                    workers=workers, on_page_done=show_progress, engine=engine,
+                                    page_cache=page_cache, adaptive_dpi=adaptive_dpi,
+                                    min_confidence=min_confidence, preprocess=preprocess))
 
-            # Perform OCR on the image
-            ocr_text = pytesseract.image_to_string(image)
+        # Assemble the text in page order regardless of the order pages finished in
+        for page_number in selected_pages:
             text += f"--- Page {page_number + 1} ---\n"
-            text += ocr_text + "\n"
+            text += page_texts[page_number] + "\n"
 
         # Show final OCR progress
         bar = '█' * progress_bar_width
-        print(f"\r[RTMC] OCR Progress: |{bar}| 100% (Page {total_pages}/{total_pages})", end="")
+        print(f"\r[RTMC] OCR Progress: |{bar}| 100% (Page {ocr_total}/{ocr_total})", end="")
         print()  # New line after the progress bar
 
-        pdf_document.close()
         print(f"[RTMC] OCR processing completed for {pdf_path}")
 
         # Save the extracted text to a file if requested
-        if save_output and text:
+        if save_output and pages is None and text:
             with open(output_file, "w", encoding="utf-8") as f:
                 f.write(text)
             print(f"[RTMC] OCR text saved to {output_file}")
@@ -203,48 +330,234 @@ def text_to_dataframe(text: str) -> List[pd.DataFrame]:
     return tables
 
 
-def extract_tables_from_pdf(pdf_path: str) -> List[pd.DataFrame]:
+def extract_tables_from_pdf(pdf_path: str, full_document: bool = False) -> List[pd.DataFrame]:
     """
     Extract tables from a PDF file.
 
+    Only the pages picked by select_table_pages are extracted unless full_document is set.
+    Results are cached by the PDF's content hash, so a report seen before under any
+    name is not extracted again.
+
     Args:
         pdf_path: Path to the PDF file
+        full_document: Whether to extract every page instead of the likely table pages
 
     Returns:
         A list of pandas DataFrames containing the extracted tables
     """
-    try:
-        # First try to extract tables using tabula
-        tables = tabula.read_pdf(pdf_path, pages='all', multiple_tables=True)
-        if tables and len(tables) > 0:
-            print(f"[RTMC] Extracted {len(tables)} tables from {pdf_path} using tabula")
+    scope = "full" if full_document else "selected"
+    cache_file = content_cache_path(pdf_path, "tables", f".v{TABLE_CACHE_VERSION}.{table_backend()}.{scope}.pkl")
+    if cache_file and os.path.exists(cache_file):
+        try:
+            tables = pd.read_pickle(cache_file)
+            print(f"[RTMC] Loaded {len(tables)} cached tables for {pdf_path}")
             return tables
-        else:
-            print(f"[RTMC] No tables found in {pdf_path} using tabula, trying OCR...")
-            # If tabula fails, try OCR
-            text = pdf_to_text_ocr(pdf_path)
-            if text:
-                # Convert extracted text to DataFrames
-                tables = text_to_dataframe(text)
-                print(f"[RTMC] Extracted {len(tables)} tables from {pdf_path} using OCR")
-                return tables
-            else:
-                print(f"[RTMC] Failed to extract text from {pdf_path} using OCR")
-                return []
-    except Exception as e:
-        print(f"[RTMC] Error extracting tables from {pdf_path}: {e}")
-        # Try OCR as a fallback
+        except Exception as e:
+            print(f"[RTMC] Error reading cached tables for {pdf_path}: {e}")
+
+    tables = _extract_tables_uncached(pdf_path, full_document)
+    if cache_file and tables:
         try:
-            print(f"[RTMC] Trying OCR as fallback for {pdf_path}...")
-            text = pdf_to_text_ocr(pdf_path)
-            if text:
-                tables = text_to_dataframe(text)
-                print(f"[RTMC] Extracted {len(tables)} tables from {pdf_path} using OCR fallback")
-                return tables
-        except Exception as ocr_e:
-            print(f"[RTMC] OCR fallback also failed for {pdf_path}: {ocr_e}")
+            pd.to_pickle(tables, cache_file)
+        except Exception as e:
+            print(f"[RTMC] Error caching tables for {pdf_path}: {e}")
+    return tables
+
+
+def select_ocr_pages(pdf_path: str, full_document: bool = False, prepass: bool = True) -> Optional[List[int]]:
+    """
+    Pick the pages of a PDF to extract, using the OCR settings from config.txt for the pre-pass.
+
+    Args:
+        pdf_path: Path to the PDF file
+        full_document: Whether to use every page
+        prepass: Whether to run a low-resolution OCR pass over pages without a text layer
+
+    Returns:
+        The zero-based page numbers, or None for the whole document when full_document is set
+        or no candidate page was found
+    """
+    if full_document:
+        return None
+    try:
+        config = read_config()
+        pages = select_table_pages(pdf_path, prepass=prepass, tesseract_cmd=config.get('tesseract_cmd'),
+                                   engine=config.get('ocr_engine', DEFAULT_OCR_ENGINE),
+                                   workers=default_ocr_workers(config))
+    except Exception as e:
+        print(f"[RTMC] Error selecting table pages in {pdf_path}: {e}")
+        return None
+    if not pages:
+        print(f"[RTMC] No likely table pages found in {pdf_path}, using the whole document")
+        return None
+    print(f"[RTMC] Selected pages {', '.join(str(n + 1) for n in pages)} of {pdf_path}")
+    return pages
+
+
+def _ocr_table_cells(pdf_path: str, pages: Optional[List[int]]) -> List[pd.DataFrame]:
+    """
+    Read the tables on selected pages with digits-only cell OCR.
+
+    Only runs on a page selection, a whole document is left to full-page OCR. Can be turned
+    off with ocr_table_cells=false in config.txt.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: The selected zero-based page numbers, or None for the whole document
+
+    Returns:
+        The tables that hold at least one figure, or an empty list
+    """
+    config = read_config()
+    if not pages or config.get('ocr_table_cells', 'true').lower() in ('0', 'false', 'no'):
+        return []
+    try:
+        tables = ocr_table_cells(pdf_path, pages, tesseract_cmd=config.get('tesseract_cmd'),
+                                 engine=config.get('ocr_engine', DEFAULT_OCR_ENGINE))
+    except Exception as e:
+        print(f"[RTMC] Error reading table cells in {pdf_path}: {e}")
+        return []
+    tables = [table for table in tables if table.iloc[:, 1:].notna().any().any()]
+    if tables:
+        print(f"[RTMC] Extracted {len(tables)} tables from {pdf_path} using cell OCR")
+    return tables
+
+
+def text_layer_table_pages(pdf_path: str, full_document: bool = False) -> Optional[List[int]]:
+    """
+    Pick the pages the text layer table extractors read.
+
+    Args:
+        pdf_path: Path to the PDF file
+        full_document: Whether to read every page
+
+    Returns:
+        The selected table pages, or when none were selected the pages that mention a province
+        or region heading (possibly none). None for the whole document when full_document is set.
+    """
+    pages = select_ocr_pages(pdf_path, full_document, prepass=False)
+    if pages is not None or full_document:
+        return pages
+    # extract_accident_data_from_tables only reads tables with a province or region column
+    try:
+        pages = PageIndex.for_pdf(pdf_path).pages_with(*HEADING_PATTERNS)
+    except Exception as e:
+        print(f"[RTMC] Error looking up pages of {pdf_path} in the page index: {e}")
+        return None
+    print(f"[RTMC] Reading the {len(pages)} pages of {pdf_path} that mention a province or region")
+    return pages
+
+
+def _text_layer_tables(pdf_path: str, full_document: bool) -> List[pd.DataFrame]:
+    """Find tables in the plain text of the selected pages' text layer."""
+    pages = text_layer_table_pages(pdf_path, full_document)
+    _, texts = text_layer_pages(pdf_path)
+    page_numbers = sorted(texts if pages is None else set(pages) & set(texts))
+    text = "".join(f"--- Page {n + 1} ---\n{texts[n]}\n" for n in page_numbers)
+    return text_to_dataframe(text) if text else []
+
+
+def _native_tables(pdf_path: str, full_document: bool) -> List[pd.DataFrame]:
+    """Read the tables of the selected pages with PyMuPDF."""
+    return read_text_layer_tables(pdf_path, text_layer_table_pages(pdf_path, full_document), "pymupdf")
+
+
+def _tabula_tables(pdf_path: str, full_document: bool) -> List[pd.DataFrame]:
+    """Read the tables of the selected pages with tabula."""
+    return read_text_layer_tables(pdf_path, text_layer_table_pages(pdf_path, full_document), "tabula")
+
+
+def _cell_ocr_tables(pdf_path: str, full_document: bool) -> List[pd.DataFrame]:
+    """Read the tables of the selected pages with cell OCR."""
+    return _ocr_table_cells(pdf_path, select_ocr_pages(pdf_path, full_document))
+
+
+def _ocr_text_tables(pdf_path: str, full_document: bool) -> List[pd.DataFrame]:
+    """Find tables in the OCR text of the selected pages."""
+    text = pdf_to_text_ocr(pdf_path, pages=select_ocr_pages(pdf_path, full_document))
+    return text_to_dataframe(text) if text else []
+
+
+register_backend(ExtractionBackend(
+    "text_layer", _text_layer_tables,
+    cost=lambda probe: TEXT_LAYER_PAGE_SECONDS * probe['page_count'],
+    viable=lambda probe: probe['text_pages'] > 0))
+register_backend(ExtractionBackend(
+    "pymupdf", _native_tables,
+    cost=lambda probe: NATIVE_TABLE_PAGE_SECONDS * probe['text_pages'],
+    viable=lambda probe: probe['text_pages'] > 0))
+register_backend(ExtractionBackend(
+    "tabula", _tabula_tables,
+    cost=lambda probe: (0.0 if jvm_started() else TABULA_STARTUP_SECONDS) + TABULA_PAGE_SECONDS * probe['text_pages'],
+    viable=lambda probe: probe['text_pages'] > 0 and java_available()))
+register_backend(ExtractionBackend(
+    "cell_ocr", _cell_ocr_tables,
+    cost=lambda probe: CELL_OCR_PAGE_SECONDS * probe['scanned_pages'],
+    viable=lambda probe: probe['scanned_pages'] > 0))
+register_backend(ExtractionBackend(
+    "ocr", _ocr_text_tables,
+    cost=lambda probe: OCR_PAGE_SECONDS * probe['scanned_pages'],
+    viable=lambda probe: probe['scanned_pages'] > 0))
+
+
+def _extract_tables_uncached(pdf_path: str, full_document: bool = False) -> List[pd.DataFrame]:
+    """
+    Extract tables from a PDF file with the cheapest backend that finds accident tables.
+
+    The report is probed once and only the backends that can work on it are tried, cheapest
+    first. The outcome is remembered per content hash: the backend that worked is tried first
+    on later runs and backends that ran but found no accident tables in this report are not
+    tried again, unless the table_backend in config.txt names them. Backends that raised are
+    tried again on the next run.
+
+    Args:
+        pdf_path: Path to the PDF file
+        full_document: Whether to extract every page instead of the likely table pages
+
+    Returns:
+        A list of pandas DataFrames containing the extracted tables, or the tables of the first
+        backend that found any if none held accident data
+    """
+    decision = BackendDecision.for_pdf(pdf_path, "full" if full_document else "selected")
+    if decision.probe is None:
+        decision.probe = probe_pdf(pdf_path)
+    configured = table_backend()
+    preferred = configured if configured != "auto" else decision.backend
+    ranked = rank_backends(decision.probe, preferred)
+    if not ranked:
+        # Neither a text layer nor enough image coverage to count as scanned, OCR is the only option left
+        print(f"[RTMC] No extraction backend looks viable for {pdf_path}, trying OCR")
+        ranked = [BACKENDS["ocr"]]
+    candidates = [backend for backend in ranked
+                  if backend.name == configured or backend.name not in decision.failed]
+    if not candidates:
+        print(f"[RTMC] Skipping table extraction for {pdf_path}, no backend found tables in an earlier run")
         return []
 
+    fallback = []
+    for backend in candidates:
+        try:
+            tables = backend.extract(pdf_path, full_document)
+        except Exception as e:
+            # Errors are often the environment (no Java or Tesseract, a transient IO error), not
+            # the report, so the backend is not remembered as failed and is tried again next run
+            print(f"[RTMC] Error extracting tables from {pdf_path} using {backend.name}: {e}")
+            continue
+        if tables and extract_accident_data_from_tables(tables, 0, ""):
+            print(f"[RTMC] Extracted {len(tables)} tables from {pdf_path} using {backend.name}")
+            decision.backend = backend.name
+            decision.failed = [name for name in decision.failed if name != backend.name]
+            decision.save()
+            return tables
+        print(f"[RTMC] No accident tables found in {pdf_path} using {backend.name}")
+        if backend.name not in decision.failed:
+            decision.failed.append(backend.name)
+        fallback = fallback or tables
+
+    decision.backend = None
+    decision.save()
+    return fallback
+
 
 def extract_accident_data_from_tables(tables: List[pd.DataFrame], year: int, source_name: str) -> List[AccidentRecord]:
     """
@@ -294,13 +607,14 @@ def extract_accident_data_from_tables(tables: List[pd.DataFrame], year: int, sou
     return records
 
 
-def process_pdf_files(pdf_files: List[str], source_name: str) -> List[AccidentRecord]:
+def process_pdf_files(pdf_files: List[str], source_name: str, full_document: bool = False) -> List[AccidentRecord]:
     """
     Process a list of PDF files and extract accident records.
 
     Args:
         pdf_files: List of paths to PDF files
         source_name: The name of the data source
+        full_document: Whether to extract and OCR every page instead of the likely table pages
 
     Returns:
         A list of AccidentRecord objects
@@ -312,6 +626,8 @@ def process_pdf_files(pdf_files: List[str], source_name: str) -> List[AccidentRe
     progress_bar_width = 50  # Width of the progress bar
 
     print(f"[RTMC] Starting to process {total_pdfs} PDF files")
+    # Content hash of every report processed so far, so duplicates under other names are skipped
+    seen_content = {}
 
     for i, pdf_path in enumerate(pdf_files, 1):
         # Show overall processing progress
@@ -324,21 +640,29 @@ def process_pdf_files(pdf_files: List[str], source_name: str) -> List[AccidentRe
         try:
             print(f"[RTMC] Processing PDF {i}/{total_pdfs}: {os.path.basename(pdf_path)}")
 
-            # Extract year from PDF
+            try:
+                digest = ContentStore.for_pdf(pdf_path).hash_for(pdf_path)
+            except Exception:
+                digest = None
+            if digest and digest in seen_content:
+                print(f"[RTMC] Skipping {os.path.basename(pdf_path)}, same content as {os.path.basename(seen_content[digest])}")
+                processed_pdfs += 1
+                continue
+            if digest:
+                seen_content[digest] = pdf_path
+
+            # Work out the period the report covers from its filename, metadata or first page
             year = None
             try:
-                year = extract_year_from_pdf(pdf_path)
-                if not year:
-                    # Try to extract year from filename as fallback
-                    filename = os.path.basename(pdf_path)
-                    year_match = re.search(r'20\d{2}', filename)
-                    if year_match:
-                        year = int(year_match.group(0))
-                    else:
-                        # Use current year as last resort
-                        import datetime
-                        year = datetime.datetime.now().year
-                        print(f"[RTMC] Using current year ({year}) as fallback for {pdf_path}")
+                period = resolve_report_period(pdf_path)
+                if period:
+                    year = period.year
+                    print(f"[RTMC] Report period of {os.path.basename(pdf_path)}: {period.label} (from {period.source})")
+                else:
+                    # Use current year as last resort
+                    import datetime
+                    year = datetime.datetime.now().year
+                    print(f"[RTMC] Using current year ({year}) as fallback for {pdf_path}")
             except Exception as e:
                 print(f"[RTMC] Error extracting year from {pdf_path}: {e}")
                 # Use current year as fallback
@@ -349,11 +673,11 @@ def process_pdf_files(pdf_files: List[str], source_name: str) -> List[AccidentRe
             # Extract tables from PDF
             tables = []
             try:
-                tables = extract_tables_from_pdf(pdf_path)
+                tables = extract_tables_from_pdf(pdf_path, full_document)
                 if not tables:
                     print(f"[RTMC] No tables found in {pdf_path}, will try direct OCR")
                     # Try direct OCR as a last resort
-                    text = pdf_to_text_ocr(pdf_path)
+                    text = pdf_to_text_ocr(pdf_path, pages=select_ocr_pages(pdf_path, full_document))
                     if text:
                         # Try to extract data directly from text
                         # This is a simple implementation that looks for patterns like "Province: X, Accidents: Y"
@@ -0,0 +1,165 @@
+"""
+Image preprocessing module for the RTMC Scraper.
+
+This module cleans up scanned pages before OCR with vectorized numpy operations: grayscale
+conversion, adaptive (Bradley) binarization against uneven backgrounds, deskewing by
+projection profile, and cropping of blank borders so Tesseract only sees the printed area.
+"""
+from typing import Tuple
+import numpy as np
+from PIL import Image
+
+
+# Side of the local window for adaptive binarization, as a fraction of the page width
+THRESHOLD_WINDOW_FRACTION = 1 / 16
+# A pixel is ink when it is this much darker than the mean of its window
+THRESHOLD_SENSITIVITY = 0.15
+# Largest skew in degrees that is searched for and corrected
+MAX_SKEW_ANGLE = 5.0
+SKEW_ANGLE_STEP = 0.25
+# Ink pixels sampled to estimate skew, enough for a stable profile on a full page
+SKEW_SAMPLE_SIZE = 50000
+# Blank border kept around the content when cropping, in pixels
+CROP_MARGIN = 10
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    """
+    Convert a page image to an 8-bit grayscale array.
+
+    Args:
+        image: The page image in any mode
+
+    Returns:
+        A 2D uint8 array
+    """
+    if image.mode != "L":
+        image = image.convert("L")
+    return np.asarray(image, dtype=np.uint8)
+
+
+def adaptive_threshold(gray: np.ndarray, window: int = 0,
+                       sensitivity: float = THRESHOLD_SENSITIVITY) -> np.ndarray:
+    """
+    Binarize a grayscale page against the mean brightness of each pixel's neighbourhood.
+
+    Uses an integral image so every window mean costs four lookups regardless of window size.
+
+    Args:
+        gray: A 2D uint8 array
+        window: The side of the neighbourhood in pixels (0 derives it from the page width)
+        sensitivity: How much darker than its neighbourhood a pixel has to be to count as ink
+
+    Returns:
+        A 2D boolean array that is True for ink
+    """
+    height, width = gray.shape
+    if not window:
+        window = max(15, int(width * THRESHOLD_WINDOW_FRACTION))
+    half = window // 2
+
+    integral = np.zeros((height + 1, width + 1), dtype=np.int64)
+    integral[1:, 1:] = gray.cumsum(axis=0, dtype=np.int64).cumsum(axis=1)
+
+    rows = np.arange(height)
+    cols = np.arange(width)
+    top = np.clip(rows - half, 0, height)[:, None]
+    bottom = np.clip(rows + half + 1, 0, height)[:, None]
+    left = np.clip(cols - half, 0, width)[None, :]
+    right = np.clip(cols + half + 1, 0, width)[None, :]
+
+    sums = integral[bottom, right] - integral[top, right] - integral[bottom, left] + integral[top, left]
+    counts = (bottom - top) * (right - left)
+    return gray.astype(np.int64) * counts < sums * (1.0 - sensitivity)
+
+
+def estimate_skew(ink: np.ndarray, max_angle: float = MAX_SKEW_ANGLE,
+                  step: float = SKEW_ANGLE_STEP) -> float:
+    """
+    Estimate the skew of a page from the sharpness of its row projection profile.
+
+    Text lines give the sharpest profile when the ink coordinates are sheared by the page's
+    skew, so every candidate angle is scored on a sample of ink pixels at once.
+
+    Args:
+        ink: A 2D boolean array that is True for ink
+        max_angle: The largest skew to consider, in degrees
+        step: The angle resolution, in degrees
+
+    Returns:
+        The skew angle in degrees (counter-clockwise positive), or 0.0 for a blank page
+    """
+    ys, xs = np.nonzero(ink)
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > SKEW_SAMPLE_SIZE:
+        sample = np.random.default_rng(0).choice(len(ys), SKEW_SAMPLE_SIZE, replace=False)
+        ys, xs = ys[sample], xs[sample]
+
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    slopes = np.tan(np.radians(angles))
+    # Row of every sampled pixel under every candidate shear
+    sheared = np.rint(ys[None, :] + xs[None, :] * slopes[:, None]).astype(np.int64)
+    sheared -= sheared.min()
+    bins = sheared.max() + 1
+    offsets = (np.arange(len(angles)) * bins)[:, None]
+    profiles = np.bincount((sheared + offsets).ravel(), minlength=len(angles) * bins).reshape(len(angles), bins)
+    scores = (np.diff(profiles, axis=1).astype(np.int64) ** 2).sum(axis=1)
+    return float(angles[int(np.argmax(scores))])
+
+
+def content_box(ink: np.ndarray, margin: int = CROP_MARGIN) -> Tuple[int, int, int, int]:
+    """
+    Find the bounding box of the ink on a page.
+
+    Args:
+        ink: A 2D boolean array that is True for ink
+        margin: The blank border to keep around the content, in pixels
+
+    Returns:
+        The (left, top, right, bottom) box, or the whole page if it has no ink
+    """
+    height, width = ink.shape
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(rows) or not len(cols):
+        return 0, 0, width, height
+    return (max(0, int(cols[0]) - margin), max(0, int(rows[0]) - margin),
+            min(width, int(cols[-1]) + margin + 1), min(height, int(rows[-1]) + margin + 1))
+
+
+def preprocess_page(image: Image.Image, binarize: bool = True, deskew: bool = True,
+                    crop: bool = True) -> Image.Image:
+    """
+    Prepare a scanned page for OCR.
+
+    Args:
+        image: The rendered page
+        binarize: Whether to binarize the page with an adaptive threshold
+        deskew: Whether to rotate the page so its text lines are horizontal
+        crop: Whether to crop the blank borders around the content
+
+    Returns:
+        A new mode "L" image, black text on white when binarized
+    """
+    gray = to_grayscale(image)
+    ink = adaptive_threshold(gray)
+    pixels = np.where(ink, 0, 255).astype(np.uint8) if binarize else gray
+
+    if deskew:
+        angle = estimate_skew(ink)
+        if angle:
+            # Shearing by the skew straightened the lines, so rotating back by it levels the page
+            rotated = Image.fromarray(pixels).rotate(-angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+            pixels = np.asarray(rotated)
+            if binarize:
+                ink = pixels < 128
+                pixels = np.where(ink, 0, 255).astype(np.uint8)
+            else:
+                ink = adaptive_threshold(pixels)
+
+    if crop:
+        left, top, right, bottom = content_box(ink)
+        pixels = pixels[top:bottom, left:right]
+
+    return Image.fromarray(np.ascontiguousarray(pixels))
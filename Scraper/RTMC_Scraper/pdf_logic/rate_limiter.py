@@ -0,0 +1,194 @@
+"""
+Rate limiter module for the RTMC Scraper.
+
+This module provides an adaptive per-host token bucket shared by every request to the RTMC
+website. It limits requests per second and, optionally, bytes per second, backs off when the
+server answers 429 or 503 (honouring Retry-After) and speeds up again while responses are healthy.
+"""
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header into a number of seconds to wait.
+
+    Args:
+        value: The header value, either delay-seconds or an HTTP date
+        now: The current time as a UNIX timestamp (defaults to time.time())
+
+    Returns:
+        The number of seconds to wait, or None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class _HostBucket:
+    """
+    Token bucket state for one host.
+    """
+    def __init__(self, rate: float, burst: float, bytes_rate: Optional[float], now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.bytes_rate = bytes_rate
+        self.byte_tokens = bytes_rate or 0.0
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        if self.bytes_rate:
+            # Allow up to one second worth of bytes to accumulate
+            self.byte_tokens = min(self.bytes_rate, self.byte_tokens + elapsed * self.bytes_rate)
+        self.updated = now
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host token bucket that adapts its request rate to the server's responses.
+
+    The request rate grows additively after healthy responses and is cut multiplicatively
+    on 429 Too Many Requests or 503 Service Unavailable, when the host is also paused for
+    the Retry-After period if the server sent one.
+    """
+    def __init__(self, requests_per_second: float = 2.0, bytes_per_second: Optional[float] = None,
+                 burst: float = 4.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 increase_step: float = 0.25, decrease_factor: float = 0.5):
+        self.initial_rate = requests_per_second
+        self.bytes_per_second = bytes_per_second
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """
+        Get the host a URL belongs to.
+
+        Args:
+            url: The URL
+
+        Returns:
+            The network location of the URL
+        """
+        return urlparse(url).netloc
+
+    def _bucket(self, host: str, now: float) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _HostBucket(self.initial_rate, self.burst, self.bytes_per_second, now)
+            self._buckets[host] = bucket
+        bucket.refill(now)
+        return bucket
+
+    def reserve(self, host: str) -> float:
+        """
+        Reserve a request slot for a host.
+
+        Args:
+            host: The host the request goes to
+
+        Returns:
+            The number of seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket.tokens -= 1
+            wait = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+            return max(wait, bucket.blocked_until - now)
+
+    def reserve_bytes(self, host: str, nbytes: int) -> float:
+        """
+        Account for bytes received from a host against its bandwidth budget.
+
+        Args:
+            host: The host the bytes came from
+            nbytes: The number of bytes received
+
+        Returns:
+            The number of seconds to pause before reading more
+        """
+        if not self.bytes_per_second:
+            return 0.0
+        with self._lock:
+            bucket = self._bucket(host, time.monotonic())
+            bucket.byte_tokens -= nbytes
+            return 0.0 if bucket.byte_tokens >= 0 else -bucket.byte_tokens / bucket.bytes_rate
+
+    def acquire(self, host: str) -> None:
+        """
+        Block until a request to host is allowed.
+
+        Args:
+            host: The host the request goes to
+        """
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    def consume_bytes(self, host: str, nbytes: int) -> None:
+        """
+        Block until the bandwidth budget allows the bytes just received from host.
+
+        Args:
+            host: The host the bytes came from
+            nbytes: The number of bytes received
+        """
+        wait = self.reserve_bytes(host, nbytes)
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_response(self, host: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        Adapt the request rate of a host to the status of a response.
+
+        Args:
+            host: The host that sent the response
+            status_code: The HTTP status code
+            retry_after: The Retry-After header of the response, if any
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if status_code in (429, 503):
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+                # Drop the burst allowance so the next requests are spaced at the new rate
+                bucket.tokens = min(bucket.tokens, 0.0)
+                delay = parse_retry_after(retry_after)
+                if delay is not None:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            elif status_code < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase_step)
+
+    def current_rate(self, host: str) -> float:
+        """
+        Get the current request rate for a host.
+
+        Args:
+            host: The host
+
+        Returns:
+            The allowed requests per second
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            return bucket.rate if bucket else self.initial_rate
@@ -0,0 +1,245 @@
+"""
+Report period module for the RTMC Scraper.
+
+This module works out which period a report covers (year, calendar quarter, month range and
+financial year) without reading its tables. It tries the filename first, then the PDF metadata,
+then the text layer of the first page, and stops at the first source that names a period.
+Periods found in the PDF itself are stored per content hash, so each report is opened at most
+once and later lookups are a dictionary hit.
+"""
+import os
+import re
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote
+import fitz  # PyMuPDF
+from .content_store import ContentStore, content_hash
+
+
+# Bump when the patterns change so stored periods are resolved again
+REPORT_PERIOD_VERSION = 1
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+# Month names and abbreviations, matched inside glued names such as "JantoMarch2016" or "reportsept2017"
+MONTH = (r'(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+         r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+YEAR = r'(?<!\d)(20\d{2})(?!\d)'
+# "201516", "2015/16", "2020 2021" (from "2020---2021") or "2015/2016"
+FINANCIAL_YEAR_PATTERN = re.compile(r'(?<!\d)(20\d{2})\s*(?:/|to)?\s*(?:20)?(\d{2})(?!\d)')
+MONTH_RANGE_PATTERN = re.compile(MONTH + r'\s*(?:to)?\s*' + MONTH + r'\s*' + YEAR)
+MONTH_YEAR_PATTERN = re.compile(MONTH + r'\s*' + YEAR)
+QUARTER_PATTERN = re.compile(r'(?:\b([1-4])(?:st|nd|rd|th)|\b(first|second|third|fourth))\s*quarter'
+                             r'|quarter\s*([1-4])(?!\d)|(?<![a-z])q\s*([1-4])(?!\d)')
+QUARTER_WORDS = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4}
+# Months of the quarters of a financial year, which runs from April to March
+FINANCIAL_QUARTER_MONTHS = {1: (4, 6), 2: (7, 9), 3: (10, 12), 4: (1, 3)}
+# Metadata fields that can name the period; the creation date is only used as a last resort
+METADATA_FIELDS = ("title", "subject", "keywords")
+# Only the start of the first page is searched, where the cover names the period
+FIRST_PAGE_CHARS = 2000
+
+# Resolved periods by content hash, None when the PDF names no period
+_period_cache: Dict[str, Optional["ReportPeriod"]] = {}
+
+
+class ReportPeriod:
+    """
+    The period a report covers.
+
+    Args:
+        year: The calendar year the period starts in
+        quarter: The calendar quarter (1-4) for a quarterly report
+        months: The first and last calendar month covered, if known
+        financial_year: The financial year the report is labelled with, e.g. "2015/16"
+        source: Where the period was found: "filename", "metadata", "text" or "created"
+    """
+    def __init__(self, year: int, quarter: Optional[int] = None, months: Optional[Tuple[int, int]] = None,
+                 financial_year: Optional[str] = None, source: str = "filename"):
+        self.year = year
+        self.quarter = quarter
+        self.months = tuple(months) if months else None
+        self.financial_year = financial_year
+        self.source = source
+
+    @property
+    def label(self) -> str:
+        """A readable description of the period, e.g. "Apr-Jun 2015 (FY2015/16 Q1)"."""
+        if self.months:
+            first, last = self.months
+            end = f"{MONTH_NAMES[last - 1]} {self.year + 1 if last < first else self.year}"
+            label = f"{MONTH_NAMES[first - 1]} {self.year}-{end}" if last < first else f"{MONTH_NAMES[first - 1]}-{end}"
+        else:
+            label = str(self.year)
+        if self.financial_year:
+            fy_quarter = next((q for q, months in FINANCIAL_QUARTER_MONTHS.items() if months == self.months), None)
+            label += f" (FY{self.financial_year}" + (f" Q{fy_quarter})" if fy_quarter else ")")
+        return label
+
+    def to_dict(self) -> dict:
+        """
+        Convert the period to a dictionary for storage.
+
+        Returns:
+            A dictionary of the period's fields
+        """
+        return {'year': self.year, 'quarter': self.quarter, 'months': list(self.months) if self.months else None,
+                'financial_year': self.financial_year, 'source': self.source}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReportPeriod":
+        """
+        Create a period from a dictionary written by to_dict.
+
+        Args:
+            data: The stored fields
+
+        Returns:
+            The ReportPeriod
+        """
+        return cls(data['year'], data.get('quarter'), data.get('months'), data.get('financial_year'),
+                   data.get('source', "filename"))
+
+    def __repr__(self) -> str:
+        return f"ReportPeriod({self.label!r}, source={self.source!r})"
+
+
+def _month_number(name: str) -> int:
+    return [month.lower() for month in MONTH_NAMES].index(name[:3]) + 1
+
+
+def _quarter_of(month: int) -> int:
+    return (month - 1) // 3 + 1
+
+
+def parse_period(text: str, source: str = "filename") -> Optional[ReportPeriod]:
+    """
+    Find the period a filename, title or page names.
+
+    A financial year with a quarter ("1st quarter 201516", "2020-2021-Q2") is mapped to its
+    calendar months, then a month range ("Jan to Mar 2020"), then a quarter-end month
+    ("Mar 2008", "june2018"), then a quarter with a year, then a bare year.
+
+    Args:
+        text: The text to search
+        source: The source to record on the period
+
+    Returns:
+        The ReportPeriod, or None if the text names no year
+    """
+    text = re.sub(r'[\s_\-.,:;()–—]+', ' ', unquote(text).lower())
+    quarter_match = QUARTER_PATTERN.search(text)
+    quarter = None
+    if quarter_match:
+        number = next(group for group in quarter_match.groups() if group)
+        quarter = QUARTER_WORDS.get(number) or int(number)
+
+    for match in FINANCIAL_YEAR_PATTERN.finditer(text):
+        start = int(match.group(1))
+        if (start + 1) % 100 != int(match.group(2)):
+            continue
+        financial_year = f"{start}/{match.group(2)}"
+        if quarter:
+            first, last = FINANCIAL_QUARTER_MONTHS[quarter]
+            year = start + 1 if quarter == 4 else start
+            return ReportPeriod(year, _quarter_of(first), (first, last), financial_year, source)
+        return ReportPeriod(start, None, (4, 3), financial_year, source)
+
+    match = MONTH_RANGE_PATTERN.search(text)
+    if match:
+        first, last, year = _month_number(match.group(1)), _month_number(match.group(2)), int(match.group(3))
+        # A range that wraps into the next year (e.g. "Oct to Mar 2018") started the year before
+        if last < first:
+            year -= 1
+        is_quarter = last - first == 2 and first % 3 == 1
+        return ReportPeriod(year, _quarter_of(first) if is_quarter else None, (first, last), None, source)
+
+    for match in MONTH_YEAR_PATTERN.finditer(text):
+        month, year = _month_number(match.group(1)), int(match.group(2))
+        # Quarterly reports are named after the month their quarter ends in
+        if month % 3 == 0:
+            return ReportPeriod(year, _quarter_of(month), (month - 2, month), None, source)
+
+    match = re.search(YEAR, text)
+    if not match:
+        return None
+    year = int(match.group(1))
+    if quarter:
+        return ReportPeriod(year, quarter, (quarter * 3 - 2, quarter * 3), None, source)
+    return ReportPeriod(year, None, None, None, source)
+
+
+def _period_from_pdf(pdf_path: str) -> Optional[ReportPeriod]:
+    """
+    Find the period in the metadata or the first page of a PDF.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        The ReportPeriod, or None if the PDF names no period
+    """
+    with fitz.open(pdf_path) as pdf_document:
+        metadata = pdf_document.metadata or {}
+        period = parse_period(" ".join(metadata.get(field) or "" for field in METADATA_FIELDS), "metadata")
+        if period:
+            return period
+        if len(pdf_document):
+            period = parse_period(pdf_document[0].get_text()[:FIRST_PAGE_CHARS], "text")
+            if period:
+                return period
+    # Creation dates look like "D:20160712104512+02'00'"
+    created = re.match(r'(?:D:)?(20\d{2})', metadata.get("creationDate") or "")
+    return ReportPeriod(int(created.group(1)), source="created") if created else None
+
+
+def resolve_report_period(pdf_path: str) -> Optional[ReportPeriod]:
+    """
+    Work out the period a report covers from its filename, metadata or first page.
+
+    The filename is parsed without opening the PDF. Otherwise the result is looked up per
+    content hash in memory and in the content store, and only worked out on the first lookup.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        The ReportPeriod, or None if no source names a year
+    """
+    period = parse_period(os.path.splitext(os.path.basename(pdf_path))[0])
+    if period:
+        return period
+
+    path = digest = None
+    try:
+        # The hash is memoized on size and mtime, so a repeated lookup costs one stat call
+        digest = content_hash(pdf_path)
+        if digest in _period_cache:
+            return _period_cache[digest]
+        path = os.path.join(ContentStore.for_pdf(pdf_path).cache_dir("report_period"), f"{digest}.json")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == REPORT_PERIOD_VERSION:
+            period = ReportPeriod.from_dict(data['period']) if data['period'] else None
+            _period_cache[digest] = period
+            return period
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[RTMC] Error reading stored report period for {pdf_path}: {e}")
+
+    try:
+        period = _period_from_pdf(pdf_path)
+    except Exception as e:
+        print(f"[RTMC] Error reading report period from {pdf_path}: {e}")
+        return None
+
+    if digest:
+        _period_cache[digest] = period
+    if path:
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': REPORT_PERIOD_VERSION, 'period': period.to_dict() if period else None}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[RTMC] Error saving report period: {e}")
+    return period
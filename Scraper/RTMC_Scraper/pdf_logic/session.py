@@ -0,0 +1,56 @@
+"""
+HTTP session module for the RTMC Scraper.
+
+This module provides a pooled, keep-alive requests session that is shared by the index fetch
+and every PDF download, so connections to the RTMC website are reused instead of reopened.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+def create_session(pool_connections: int = 4, pool_maxsize: int = 8, max_retries: int = 2,
+                   backoff_factor: float = 0.5, keep_alive: bool = True) -> requests.Session:
+    """
+    Create a pooled HTTP session for talking to the RTMC website.
+
+    Args:
+        pool_connections: The number of per-host connection pools to cache
+        pool_maxsize: The maximum number of connections kept open per host
+        max_retries: The number of transport-level retries for connection errors and 500/502/504 responses
+        backoff_factor: The backoff factor for transport-level retries
+        keep_alive: Whether to reuse connections between requests
+
+    Returns:
+        A configured requests.Session
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        # 429 and 503 are left to the downloader's rate limiter, which honours Retry-After.
+        # urllib3 would otherwise retry any response carrying Retry-After itself, so the
+        # limiter would never see the throttling and never back off.
+        status_forcelist=(500, 502, 504),
+        respect_retry_after_header=False,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        # Hand the final response back to the caller instead of raising, the
+        # downloader decides what to do with it
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
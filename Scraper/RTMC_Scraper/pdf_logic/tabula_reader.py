@@ -0,0 +1,86 @@
+"""
+Tabula module for the RTMC Scraper.
+
+This module routes every tabula call of the RTMC extraction path through one helper so a run
+keeps a single Java VM. With jpype installed tabula-py starts the JVM inside this process on
+the first call and reuses it for every later call; without it every call launches a new java
+process, which costs several seconds per report.
+"""
+import shutil
+import importlib.util
+from typing import List, Union
+import pandas as pd
+import tabula
+
+
+# Whether the missing jpype has been reported for this process
+_backend_reported = False
+# Whether a tabula call has returned on the in-process JVM, which proves the JVM started
+_jvm_running = False
+
+
+def jvm_in_process() -> bool:
+    """
+    Check whether tabula can keep its JVM inside this process.
+
+    Returns:
+        True if jpype is installed, False if tabula will start java for every call
+    """
+    return importlib.util.find_spec("jpype") is not None
+
+
+def java_available() -> bool:
+    """
+    Check whether a Java runtime can be found for tabula.
+
+    Returns:
+        True if jpype can locate a JVM or java is on the PATH
+    """
+    if jvm_in_process():
+        try:
+            import jpype
+            jpype.getDefaultJVMPath()
+            return True
+        except Exception:
+            pass
+    return shutil.which("java") is not None
+
+
+def jvm_started() -> bool:
+    """
+    Check whether tabula's shared JVM is already running in this process.
+
+    Returns:
+        True if an earlier tabula call succeeded on the in-process JVM
+    """
+    return _jvm_running
+
+
+def read_pdf_tables(pdf_path: str, pages: Union[int, str, List[int]] = 'all') -> List[pd.DataFrame]:
+    """
+    Read the tables of a PDF with tabula in the shared JVM.
+
+    Args:
+        pdf_path: Path to the PDF file
+        pages: One-based page numbers, a single page, or 'all'
+
+    Returns:
+        A list of pandas DataFrames, one per table
+
+    Raises:
+        Exception: Whatever tabula raises for an unreadable PDF or a missing Java runtime
+    """
+    global _backend_reported, _jvm_running
+    in_process = jvm_in_process()
+    if not in_process and not _backend_reported:
+        _backend_reported = True
+        print("[RTMC] jpype is not installed, tabula will start a new JVM for every PDF "
+              "(install it with: pip install jpype1)")
+    # force_subprocess=False keeps tabula on the jpype JVM, which stays alive until the process exits.
+    # A failed JVM start raises here, so every failure reaches the caller and the JVM only counts
+    # as started once a call has returned.
+    tables = tabula.read_pdf(pdf_path, pages=pages, multiple_tables=True, force_subprocess=False)
+    if in_process and not _jvm_running:
+        _jvm_running = True
+        print("[RTMC] Reading tables with tabula in a shared in-process JVM")
+    return tables
@@ -0,0 +1,126 @@
+"""
+PDF validation module for the RTMC Scraper.
+
+This module provides a fast structural check for PDF files (header, trailer and cross-reference
+table) whose results are cached by path, size and modification time. A full PyPDF2 parse is
+available as an opt-in deep check.
+"""
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+import PyPDF2
+
+
+# How far from the start of the file the %PDF- header may appear
+HEADER_SEARCH_BYTES = 1024
+# How much of the end of the file to search for startxref and %%EOF
+TRAILER_SEARCH_BYTES = 2048
+
+_STARTXREF_PATTERN = re.compile(rb'startxref\s+(\d+)\s+%%EOF', re.DOTALL)
+_XREF_STREAM_PATTERN = re.compile(rb'\s*\d+\s+\d+\s+obj\b')
+
+# Maps an absolute path to ((size, mtime_ns), {'structural': bool, 'deep': bool})
+_validation_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, bool]]] = {}
+_validation_cache_lock = threading.Lock()
+
+
+def check_pdf_structure(path: str) -> bool:
+    """
+    Check that a file looks like a complete PDF without parsing its objects.
+
+    The file must start with a %PDF- header, end with a %%EOF marker after a startxref
+    entry, and the startxref offset must point at a cross-reference table or stream.
+
+    Args:
+        path: Path to the file to check
+
+    Returns:
+        True if the file passes the structural check, False otherwise
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            header_pos = f.read(HEADER_SEARCH_BYTES).find(b'%PDF-')
+            if header_pos < 0:
+                return False
+
+            f.seek(max(0, size - TRAILER_SEARCH_BYTES))
+            tail = f.read()
+            matches = list(_STARTXREF_PATTERN.finditer(tail))
+            if not matches:
+                return False
+            xref_offset = int(matches[-1].group(1))
+
+            # Offsets are usually absolute, but are relative to the header when junk precedes it
+            for offset in (xref_offset, xref_offset + header_pos):
+                if offset >= size:
+                    continue
+                f.seek(offset)
+                target = f.read(32)
+                if target.lstrip().startswith(b'xref') or _XREF_STREAM_PATTERN.match(target):
+                    return True
+        return False
+    except Exception:
+        return False
+
+
+def _deep_check(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            PyPDF2.PdfReader(f)
+        return True
+    except Exception:
+        return False
+
+
+def is_valid_pdf_file(path: str, deep: bool = False) -> bool:
+    """
+    Check if a file on disk is a valid PDF file, reusing earlier results for unchanged files.
+
+    Args:
+        path: Path to the file to check
+        deep: Whether to also parse the whole document with PyPDF2
+
+    Returns:
+        True if the file is a valid PDF, False otherwise
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+
+    key = os.path.abspath(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    check = 'deep' if deep else 'structural'
+
+    with _validation_cache_lock:
+        cached = _validation_cache.get(key)
+        if cached and cached[0] == signature and check in cached[1]:
+            return cached[1][check]
+
+    results = {'structural': check_pdf_structure(path)}
+    if deep:
+        results['deep'] = results['structural'] and _deep_check(path)
+
+    with _validation_cache_lock:
+        cached = _validation_cache.get(key)
+        if cached and cached[0] == signature:
+            cached[1].update(results)
+        else:
+            _validation_cache[key] = (signature, results)
+    return results[check]
+
+
+def clear_validation_cache(path: Optional[str] = None) -> None:
+    """
+    Forget cached validation results.
+
+    Args:
+        path: The file to forget, or None to clear the whole cache
+    """
+    with _validation_cache_lock:
+        if path is None:
+            _validation_cache.clear()
+        else:
+            _validation_cache.pop(os.path.abspath(path), None)
@@ -5,7 +5,7 @@ import random
 import os
 from typing import List, Dict, Optional
 from ..base_scraper import BaseScraper, AccidentRecord
-from .pdf_logic import download_pdfs, process_pdf_files
+from .pdf_logic import download_pdfs, process_pdf_files, create_session, AdaptiveRateLimiter
 
 
 class RTMCScraper(BaseScraper):
@@ -21,6 +21,15 @@ class RTMCScraper(BaseScraper):
         self.pdf_dir = os.path.join(script_dir, "pdf_downloads")
         self.downloaded_pdfs = []
         self.raw_data = None
+        # Number of concurrent downloads, and the cap on concurrent requests to any single host
+        self.download_workers = 4
+        self.max_downloads_per_host = 4
+        # Download on a single asyncio event loop instead of a thread pool (requires aiohttp)
+        self.use_async_downloads = False
+        # Adaptive per-host pacing shared by every request to the RTMC website
+        self.rate_limiter = AdaptiveRateLimiter()
+        # Extract and OCR every page of each report instead of only the likely table pages
+        self.full_document = False
 
     def fetch_data(self) -> None:
         """
@@ -32,10 +41,19 @@ class RTMCScraper(BaseScraper):
         3. Parses the HTML to find links to PDF files
         4. Downloads each PDF file and saves it to the pdf_dir directory
         5. Stores the paths to the downloaded PDFs in the downloaded_pdfs list
+
+        The index fetch and every PDF download share one pooled keep-alive session, which is
+        closed when the downloads are done.
         """
+        session = create_session(pool_maxsize=self.max_downloads_per_host)
         try:
             # Use the pdf_logic module to download PDFs
-            self.downloaded_pdfs = download_pdfs(self.pdf_url, self.pdf_dir)
+            self.downloaded_pdfs = download_pdfs(self.pdf_url, self.pdf_dir,
+                                                 max_workers=self.download_workers,
+                                                 max_per_host=self.max_downloads_per_host,
+                                                 session=session,
+                                                 use_async=self.use_async_downloads,
+                                                 rate_limiter=self.rate_limiter)
 
             if self.downloaded_pdfs:
                 # Store the raw data as the list of downloaded PDF paths
@@ -50,6 +68,8 @@ class RTMCScraper(BaseScraper):
             print(f"[RTMC] Error fetching data from {self.pdf_url}: {e}")
             # Fall back to simulated data for testing
             self.raw_data = "simulated_data"
+        finally:
+            session.close()
 
     def parse_data(self) -> None:
         """
@@ -74,7 +94,7 @@ class RTMCScraper(BaseScraper):
                 print(f"[RTMC] Parsing {len(self.raw_data)} PDF files")
 
                 # Use the pdf_logic module to process the PDF files
-                self.records = process_pdf_files(self.raw_data, self.source_name)
+                self.records = process_pdf_files(self.raw_data, self.source_name, full_document=self.full_document)
 
                 if not self.records:
                     print(f"[RTMC] Could not extract any accident records from PDFs")
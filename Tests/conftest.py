@@ -0,0 +1,25 @@
+import pytest
+from Tests.mock_rtmc_server import MockRTMCServer, make_pdf
+
+
+@pytest.fixture
+def mock_rtmc_server():
+    """
+    Factory fixture that starts a MockRTMCServer and stops it after the test.
+
+    Called with the number of PDFs (or a files mapping) and any MockRTMCServer options.
+    """
+    servers = []
+
+    def start(files=3, **options):
+        if isinstance(files, int):
+            files = {f"report_{2019 + i}.pdf": make_pdf(f"Report {2019 + i}", padding_bytes=64 * 1024)
+                     for i in range(files)}
+        server = MockRTMCServer(files, **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.stop()
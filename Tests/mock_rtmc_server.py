@@ -0,0 +1,253 @@
+"""
+In-process mock of the RTMC report listing for downloader tests and benchmarks.
+
+The server serves a listing page with links to a configurable set of PDFs and can inject
+per-request latency, a bandwidth cap, 429 responses with Retry-After and connections that
+drop part-way through a transfer. It supports ETag/Last-Modified revalidation and Range
+requests like the real site.
+"""
+import os
+import time
+import socket
+import hashlib
+import threading
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+import fitz
+
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def make_pdf(title: str, padding_bytes: int = 0) -> bytes:
+    """
+    Build a valid PDF, optionally padded with an incompressible attachment to reach a size.
+
+    Args:
+        title: Text written on the single page
+        padding_bytes: Number of random bytes to embed
+
+    Returns:
+        The PDF document as bytes
+    """
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), title)
+    if padding_bytes > 0:
+        document.embfile_add("padding.bin", os.urandom(padding_bytes))
+    content = document.tobytes()
+    document.close()
+    return content
+
+
+class MockRTMCServer:
+    """
+    Threaded HTTP server that imitates the RTMC traffic report listing.
+
+    Args:
+        files: Mapping of PDF filename to content
+        latency: Seconds to wait before answering each request
+        bandwidth: Maximum bytes per second per response, or None for unlimited
+        throttle_first: Number of initial requests per PDF that get a 429
+        retry_after: Value of the Retry-After header sent with 429 responses
+        drop_fraction: If set, the first transfer of each PDF is cut off after this fraction
+            of its bytes
+        listing_path: The path the listing is served under
+    """
+    def __init__(self, files: Dict[str, bytes], latency: float = 0.0, bandwidth: Optional[float] = None,
+                 throttle_first: int = 0, retry_after: str = "0", drop_fraction: Optional[float] = None,
+                 listing_path: str = "/fqyr"):
+        self.files = dict(files)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.drop_fraction = drop_fraction
+        self.listing_path = listing_path.rstrip('/')
+        self.lock = threading.Lock()
+        self.requests: List[dict] = []
+        self._attempts = defaultdict(int)
+        # First request start and last byte sent per PDF, for transfer latency
+        self.transfer_started: Dict[str, float] = {}
+        self.transfer_finished: Dict[str, float] = {}
+        self._server = None
+        self._thread = None
+
+    @property
+    def pdf_url(self) -> str:
+        """The URL of the listing page."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.listing_path}"
+
+    def etag(self, name: str) -> str:
+        """The ETag of a served PDF."""
+        return '"' + hashlib.sha1(self.files[name]).hexdigest() + '"'
+
+    def status_counts(self, name: Optional[str] = None) -> Dict[int, int]:
+        """
+        Count responses by status code.
+
+        Args:
+            name: Only count responses for this PDF, or None for all requests
+
+        Returns:
+            A mapping of status code to number of responses
+        """
+        counts = defaultdict(int)
+        with self.lock:
+            for entry in self.requests:
+                if name is None or entry['name'] == name:
+                    counts[entry['status']] += 1
+        return dict(counts)
+
+    def transfer_latencies(self) -> List[float]:
+        """Seconds from the first request for each PDF to the last byte of its completed transfer."""
+        with self.lock:
+            return [self.transfer_finished[name] - self.transfer_started[name]
+                    for name in self.transfer_finished if name in self.transfer_started]
+
+    def start(self) -> "MockRTMCServer":
+        """Start serving on a free local port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockRTMCServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _listing_html(self) -> str:
+        links = "\n".join(f'<a href="{name}">{name}</a>' for name in self.files)
+        return f"<html><body>{links}</body></html>"
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _record(self, name: str, status: int) -> None:
+                with mock.lock:
+                    mock.requests.append({'name': name, 'status': status, 'headers': dict(self.headers)})
+
+            def _send_bytes(self, body: bytes, limit: Optional[int] = None) -> bool:
+                """Write the body respecting the bandwidth cap, returning False if cut off at limit."""
+                chunk_size = 16 * 1024
+                sent = 0
+                while sent < len(body):
+                    chunk = body[sent:sent + chunk_size]
+                    if limit is not None and sent + len(chunk) > limit:
+                        self.wfile.write(chunk[:limit - sent])
+                        self.wfile.flush()
+                        return False
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    if mock.bandwidth:
+                        time.sleep(len(chunk) / mock.bandwidth)
+                return True
+
+            def _drop_connection(self) -> None:
+                self.close_connection = True
+                try:
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+            def do_GET(self):
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+                path = self.path.split('?')[0].rstrip('/')
+                if path == mock.listing_path:
+                    body = mock._listing_html().encode('utf-8')
+                    self._record('', 200)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self._send_bytes(body)
+                    return
+
+                name = path[len(mock.listing_path) + 1:] if path.startswith(mock.listing_path + '/') else None
+                if name not in mock.files:
+                    self._record(name or path, 404)
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                content = mock.files[name]
+                etag = mock.etag(name)
+                with mock.lock:
+                    mock._attempts[name] += 1
+                    attempt = mock._attempts[name]
+                    mock.transfer_started.setdefault(name, time.perf_counter())
+
+                if attempt <= mock.throttle_first:
+                    self._record(name, 429)
+                    self.send_response(429)
+                    self.send_header('Retry-After', mock.retry_after)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if self.headers.get('If-None-Match') == etag or (
+                        'If-None-Match' not in self.headers and self.headers.get('If-Modified-Since') == LAST_MODIFIED):
+                    self._record(name, 304)
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    with mock.lock:
+                        mock.transfer_finished[name] = time.perf_counter()
+                    return
+
+                start = 0
+                range_header = self.headers.get('Range')
+                if range_header and self.headers.get('If-Range', etag) in (etag, LAST_MODIFIED):
+                    start = int(range_header.split('=')[1].split('-')[0])
+                    if start >= len(content):
+                        self._record(name, 416)
+                        self.send_response(416)
+                        self.send_header('Content-Range', f"bytes */{len(content)}")
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+
+                body = content[start:]
+                status = 206 if start else 200
+                self._record(name, status)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/pdf')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', LAST_MODIFIED)
+                self.send_header('Accept-Ranges', 'bytes')
+                if start:
+                    self.send_header('Content-Range', f"bytes {start}-{len(content) - 1}/{len(content)}")
+                self.end_headers()
+
+                limit = None
+                if mock.drop_fraction is not None and attempt == mock.throttle_first + 1:
+                    limit = int(len(body) * mock.drop_fraction)
+                if not self._send_bytes(body, limit):
+                    self._drop_connection()
+                    return
+                with mock.lock:
+                    mock.transfer_finished[name] = time.perf_counter()
+
+        return Handler
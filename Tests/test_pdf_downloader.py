@@ -0,0 +1,431 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import os
+import threading
+import time
+import requests
+from Scraper.RTMC_Scraper.pdf_logic import downloader
+from Scraper.RTMC_Scraper.pdf_logic.session import create_session
+from Scraper.RTMC_Scraper.pdf_logic.manifest import DownloadManifest
+from Scraper.RTMC_Scraper.pdf_logic import validation
+from Scraper.RTMC_Scraper.pdf_logic.content_store import ContentStore
+from Scraper.RTMC_Scraper.pdf_logic.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from Scraper.RTMC_Scraper.pdf_logic.link_discovery import discover_pdf_links, extract_pdf_links
+import fitz
+
+
+LISTING_HTML = """
+<html>
+    <body>
+        <a href="report_2019.pdf">Report 2019</a>
+        <a href="report_2020.pdf">Report 2020</a>
+        <a href="report_2021.pdf">Report 2021</a>
+        <a href="report_2022.pdf">Report 2022</a>
+    </body>
+</html>
+"""
+
+
+def make_pdf_bytes(text: str = "Road Safety Report") -> bytes:
+    """Build a small, valid PDF document in memory."""
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), text)
+    content = document.tobytes()
+    document.close()
+    return content
+
+
+def make_response(status_code: int, content: bytes = b"", headers: dict = None):
+    """Build a mock streaming response usable as a context manager."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content.return_value = [content] if content else []
+    response.__enter__.return_value = response
+    return response
+
+
+class TestPdfDownloader:
+    """
+    Tests for the RTMC PDF downloader.
+    """
+
+    pdf_url = "https://www.rtmc.co.za/images/rtmc/docs/traffic_reports/fqyr"
+
+    def _listing_session(self):
+        response = MagicMock()
+        response.status_code = 200
+        response.text = LISTING_HTML
+        response.headers = {}
+        session = MagicMock()
+        session.get.return_value = response
+        return session
+
+    @patch('builtins.print')
+    def test_concurrent_download_keeps_listing_order(self, mock_print, tmp_path):
+        """Test that concurrent downloads return paths in listing order."""
+        delays = {"report_2019.pdf": 0.15, "report_2020.pdf": 0.0, "report_2021.pdf": 0.1, "report_2022.pdf": 0.05}
+
+        def fake_download(pdf_url, local_path, headers, **kwargs):
+            time.sleep(delays[os.path.basename(local_path)])
+            return True, "Success"
+
+        with patch.object(downloader, 'download_single_pdf', side_effect=fake_download):
+            paths = downloader.download_pdfs(self.pdf_url, str(tmp_path), session=self._listing_session(), max_workers=4)
+
+        assert [os.path.basename(path) for path in paths] == list(delays)
+
+    @patch('builtins.print')
+    def test_concurrent_download_respects_per_host_cap(self, mock_print, tmp_path):
+        """Test that no more than max_per_host downloads run against one host."""
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def fake_download(pdf_url, local_path, headers, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return True, "Success"
+
+        with patch.object(downloader, 'download_single_pdf', side_effect=fake_download):
+            paths = downloader.download_pdfs(self.pdf_url, str(tmp_path), session=self._listing_session(), max_workers=4, max_per_host=2)
+
+        assert len(paths) == 4
+        assert peak[0] <= 2
+
+    @patch('builtins.print')
+    def test_failed_downloads_are_left_out(self, mock_print, tmp_path):
+        """Test that failed downloads are dropped from the result."""
+        def fake_download(pdf_url, local_path, headers, **kwargs):
+            if "2020" in local_path:
+                return False, "Failed after 3 attempts"
+            return True, "Success"
+
+        with patch.object(downloader, 'download_single_pdf', side_effect=fake_download):
+            paths = downloader.download_pdfs(self.pdf_url, str(tmp_path), session=self._listing_session(), max_workers=3)
+
+        assert [os.path.basename(path) for path in paths] == ["report_2019.pdf", "report_2021.pdf", "report_2022.pdf"]
+
+    @patch('builtins.print')
+    def test_session_is_shared_by_index_fetch_and_downloads(self, mock_print, tmp_path):
+        """Test that the index fetch and every download go through the same session."""
+        session = self._listing_session()
+        sessions_used = []
+
+        def fake_download(pdf_url, local_path, headers, **kwargs):
+            sessions_used.append(kwargs.get('session'))
+            return True, "Success"
+
+        with patch.object(downloader, 'download_single_pdf', side_effect=fake_download):
+            downloader.download_pdfs(self.pdf_url, str(tmp_path), max_workers=2, session=session)
+
+        session.get.assert_called_once()
+        assert sessions_used == [session] * 4
+        # A caller-provided session is left open for reuse
+        session.close.assert_not_called()
+
+    def test_create_session_configures_pool_and_retries(self):
+        """Test that create_session mounts a pooled adapter with transport retries."""
+        session = create_session(pool_connections=2, pool_maxsize=6, max_retries=5, keep_alive=False)
+        adapter = session.get_adapter("https://www.rtmc.co.za/")
+
+        assert adapter._pool_maxsize == 6
+        assert adapter.max_retries.total == 5
+        assert session.headers["Connection"] == "close"
+        assert "User-Agent" in session.headers
+        session.close()
+
+    def test_session_hands_throttling_back_to_the_caller(self, mock_rtmc_server):
+        """Test that a 429 with Retry-After reaches the caller instead of being retried by the adapter."""
+        server = mock_rtmc_server(files=1, throttle_first=1)
+        session = create_session()
+        url = f"{server.pdf_url}/{next(iter(server.files))}"
+
+        assert session.get(url).status_code == 429
+        assert session.get(url).status_code == 200
+        assert server.status_counts()[429] == 1
+        session.close()
+
+    @patch('builtins.print')
+    def test_manifest_records_validators_and_uses_conditional_get(self, mock_print, tmp_path):
+        """Test that a second download sends the stored validators and keeps the file on 304."""
+        pdf_url = f"{self.pdf_url}/report_2020.pdf"
+        local_path = str(tmp_path / "report_2020.pdf")
+        content = make_pdf_bytes()
+        validators = {'ETag': '"abc123"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+
+        session = MagicMock()
+        session.get.return_value = make_response(200, content, validators)
+        manifest = DownloadManifest(str(tmp_path))
+        assert downloader.download_single_pdf(pdf_url, local_path, {}, session=session, manifest=manifest) == (True, "Success")
+
+        entry = DownloadManifest(str(tmp_path)).get("report_2020.pdf")
+        assert entry['etag'] == '"abc123"'
+        assert entry['size'] == len(content)
+
+        session.get.return_value = make_response(304)
+        manifest = DownloadManifest(str(tmp_path))
+        assert downloader.download_single_pdf(pdf_url, local_path, {}, session=session, manifest=manifest) == (True, "Not modified")
+
+        sent_headers = session.get.call_args.kwargs['headers']
+        assert sent_headers['If-None-Match'] == '"abc123"'
+        assert sent_headers['If-Modified-Since'] == validators['Last-Modified']
+        with open(local_path, 'rb') as f:
+            assert f.read() == content
+
+    def test_manifest_skips_conditional_get_when_file_changed_size(self, tmp_path):
+        """Test that a truncated local file is not revalidated but fetched in full."""
+        local_path = tmp_path / "report_2020.pdf"
+        local_path.write_bytes(make_pdf_bytes())
+        manifest = DownloadManifest(str(tmp_path))
+        manifest.record("http://host/report_2020.pdf", str(local_path), {'ETag': '"v1"'})
+
+        local_path.write_bytes(b"%PDF-1.7 truncated")
+        assert manifest.conditional_headers("http://host/report_2020.pdf", str(local_path)) == {}
+
+    @patch('time.sleep')
+    @patch('builtins.print')
+    def test_download_resumes_with_range_after_dropped_connection(self, mock_print, mock_sleep, tmp_path):
+        """Test that a retry resumes from the partial file and renames it into place."""
+        content = make_pdf_bytes()
+        half = len(content) // 2
+        local_path = str(tmp_path / "report_2020.pdf")
+
+        def dropped_stream(chunk_size=None):
+            yield content[:half]
+            raise requests.exceptions.ChunkedEncodingError("connection dropped")
+
+        first = make_response(200, headers={'content-length': str(len(content)), 'ETag': '"v1"'})
+        first.iter_content.side_effect = dropped_stream
+        second = make_response(206, content[half:], {'content-length': str(len(content) - half),
+                                                     'Content-Range': f"bytes {half}-{len(content) - 1}/{len(content)}",
+                                                     'ETag': '"v1"'})
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+
+        assert downloader.download_single_pdf("http://host/report_2020.pdf", local_path, {}, session=session) == (True, "Success")
+
+        resume_headers = session.get.call_args_list[1].kwargs['headers']
+        assert resume_headers['Range'] == f"bytes={half}-"
+        assert resume_headers['If-Range'] == '"v1"'
+        with open(local_path, 'rb') as f:
+            assert f.read() == content
+        assert not os.path.exists(local_path + ".part")
+
+    @patch('builtins.print')
+    def test_invalid_download_leaves_no_file_behind(self, mock_print, tmp_path):
+        """Test that content failing validation is neither renamed into place nor kept."""
+        local_path = str(tmp_path / "report_2020.pdf")
+        session = MagicMock()
+        session.get.return_value = make_response(200, b"<html>Not a PDF</html>")
+
+        assert downloader.download_single_pdf("http://host/report_2020.pdf", local_path, {}, session=session) == (False, "Invalid PDF content")
+        assert os.listdir(tmp_path) == []
+
+    def test_structural_check_accepts_pdf_and_rejects_truncated_file(self, tmp_path):
+        """Test the header/trailer/xref check on a valid and a truncated PDF."""
+        content = make_pdf_bytes()
+        valid_path = tmp_path / "valid.pdf"
+        valid_path.write_bytes(content)
+        truncated_path = tmp_path / "truncated.pdf"
+        truncated_path.write_bytes(content[:len(content) // 2])
+
+        assert validation.is_valid_pdf_file(str(valid_path))
+        assert validation.is_valid_pdf_file(str(valid_path), deep=True)
+        assert not validation.is_valid_pdf_file(str(truncated_path))
+        assert not validation.is_valid_pdf_file(str(tmp_path / "missing.pdf"))
+
+    def test_validation_result_is_cached_until_file_changes(self, tmp_path):
+        """Test that an unchanged file is not checked twice, but a rewritten one is."""
+        path = tmp_path / "report.pdf"
+        path.write_bytes(make_pdf_bytes())
+
+        with patch.object(validation, 'check_pdf_structure', wraps=validation.check_pdf_structure) as check:
+            assert validation.is_valid_pdf_file(str(path))
+            assert validation.is_valid_pdf_file(str(path))
+            assert check.call_count == 1
+
+            path.write_bytes(b"%PDF-1.7 rewritten and broken")
+            assert not validation.is_valid_pdf_file(str(path))
+            assert check.call_count == 2
+
+    def test_content_store_keeps_duplicate_reports_once(self, tmp_path):
+        """Test that two names with the same content share one stored object."""
+        content = make_pdf_bytes("Quarter 2 Report")
+        first = tmp_path / "Quarter%202%20Report.pdf"
+        second = tmp_path / "q2_report.pdf"
+        first.write_bytes(content)
+        second.write_bytes(content)
+
+        store = ContentStore(str(tmp_path / ".store"))
+        digest = store.add(str(first))
+        assert store.add(str(second)) == digest
+
+        assert os.path.samefile(str(first), str(second))
+        assert store.names_for(digest) == ["Quarter%202%20Report.pdf", "q2_report.pdf"]
+        assert ContentStore.for_pdf(str(second)).hash_for(str(second)) == digest
+
+    def test_rate_limiter_backs_off_on_429_and_recovers(self):
+        """Test that 429 halves the rate and honours Retry-After, and healthy responses raise it again."""
+        limiter = AdaptiveRateLimiter(requests_per_second=4.0, burst=1.0, increase_step=1.0)
+        host = "www.rtmc.co.za"
+
+        assert limiter.reserve(host) == 0.0
+        limiter.record_response(host, 429, "3")
+        assert limiter.current_rate(host) == 2.0
+        assert limiter.reserve(host) == pytest.approx(3.0, abs=0.1)
+
+        limiter.record_response(host, 200)
+        limiter.record_response(host, 304)
+        assert limiter.current_rate(host) == 4.0
+
+    def test_rate_limiter_paces_bandwidth(self):
+        """Test that the byte budget asks for a pause once it is exhausted."""
+        limiter = AdaptiveRateLimiter(bytes_per_second=1000)
+        assert limiter.reserve_bytes("host", 1000) == 0.0
+        assert limiter.reserve_bytes("host", 500) == pytest.approx(0.5, abs=0.05)
+
+    def test_parse_retry_after_accepts_seconds_and_dates(self):
+        """Test both Retry-After formats."""
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480.0) == 30.0
+        assert parse_retry_after("soon") is None
+
+    def test_extract_pdf_links_only_keeps_pdf_anchors(self):
+        """Test that only anchors pointing at PDFs are returned, in page order."""
+        html = '<p>intro</p><a href="b.PDF">B</a><a>no href</a><a href="page.html">x</a><a href="a.pdf">A</a>'
+        assert extract_pdf_links(html) == ["b.PDF", "a.pdf"]
+
+    @patch('builtins.print')
+    def test_link_discovery_uses_cache_within_ttl_and_revalidates_after(self, mock_print, tmp_path):
+        """Test that a warm run skips the listing request and an expired cache sends validators."""
+        session = self._listing_session()
+        session.get.return_value.headers = {'ETag': '"listing-v1"'}
+
+        links = discover_pdf_links(self.pdf_url, str(tmp_path), session, {})
+        assert links == ["report_2019.pdf", "report_2020.pdf", "report_2021.pdf", "report_2022.pdf"]
+        assert discover_pdf_links(self.pdf_url, str(tmp_path), session, {}) == links
+        assert session.get.call_count == 1
+
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        not_modified.headers = {}
+        session.get.return_value = not_modified
+        assert discover_pdf_links(self.pdf_url, str(tmp_path), session, {}, ttl=0) == links
+        assert session.get.call_args.kwargs['headers']['If-None-Match'] == '"listing-v1"'
+
+    @patch('builtins.print')
+    def test_link_discovery_does_not_cache_an_empty_listing(self, mock_print, tmp_path):
+        """Test that a listing without links keeps the previously cached links instead of replacing them."""
+        session = self._listing_session()
+        links = discover_pdf_links(self.pdf_url, str(tmp_path), session, {})
+
+        session.get.return_value.text = "<html><body>Down for maintenance</body></html>"
+        assert discover_pdf_links(self.pdf_url, str(tmp_path), session, {}, ttl=0) == links
+        assert discover_pdf_links(self.pdf_url, str(tmp_path / "empty"), session, {}) == []
+        assert discover_pdf_links(self.pdf_url, str(tmp_path / "empty"), session, {}) == []
+        assert session.get.call_count == 4
+
+    def _fast_limiter(self):
+        return AdaptiveRateLimiter(requests_per_second=100.0, burst=20.0)
+
+    @pytest.mark.parametrize("mode", ["sequential", "threads", "async"])
+    @patch('builtins.print')
+    def test_download_modes_recover_from_drops_and_429(self, mock_print, mode, tmp_path, mock_rtmc_server):
+        """Test every download mode against throttling and dropped connections on the mock server."""
+        if mode == "async":
+            pytest.importorskip("aiohttp")
+        server = mock_rtmc_server(files=3, throttle_first=1, drop_fraction=0.5)
+        # Start at the maximum rate, so the rate can only be below it if a 429 reached the limiter
+        limiter = AdaptiveRateLimiter(requests_per_second=100.0, burst=20.0, max_rate=100.0)
+        host = AdaptiveRateLimiter.host_of(server.pdf_url)
+
+        with patch.object(limiter, 'record_response', wraps=limiter.record_response) as spy:
+            paths = downloader.download_pdfs(server.pdf_url, str(tmp_path),
+                                             max_workers=1 if mode == "sequential" else 3,
+                                             use_async=mode == "async", rate_limiter=limiter)
+
+        assert [os.path.basename(path) for path in paths] == list(server.files)
+        for path in paths:
+            with open(path, 'rb') as f:
+                assert f.read() == server.files[os.path.basename(path)]
+        counts = server.status_counts()
+        assert counts[429] == 3
+        assert counts[206] == 3
+        assert [c.args[1] for c in spy.call_args_list].count(429) == 3
+        assert limiter.current_rate(host) < 100.0
+
+    @patch('builtins.print')
+    def test_async_mode_keeps_file_work_off_the_event_loop(self, mock_print, tmp_path, mock_rtmc_server):
+        """Test that async mode defaults to several transfers and validates and hashes files in worker threads."""
+        pytest.importorskip("aiohttp")
+        from Scraper.RTMC_Scraper.pdf_logic import async_downloader
+        server = mock_rtmc_server(files=3)
+        threads = []
+
+        def spy(function):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return function(*args, **kwargs)
+            return wrapper
+
+        with patch.object(async_downloader, 'run_download_pdfs_async',
+                          wraps=async_downloader.run_download_pdfs_async) as mock_run, \
+                patch.object(async_downloader, '_use_local_copy', spy(async_downloader._use_local_copy)), \
+                patch.object(async_downloader, 'is_valid_pdf_file', spy(async_downloader.is_valid_pdf_file)):
+            paths = downloader.download_pdfs(server.pdf_url, str(tmp_path), use_async=True,
+                                             rate_limiter=self._fast_limiter())
+
+        assert len(paths) == 3
+        assert mock_run.call_args.kwargs['max_concurrency'] == downloader.DEFAULT_ASYNC_CONCURRENCY
+        assert len(threads) == 6
+        assert threading.main_thread() not in threads
+
+    @pytest.mark.parametrize("mode", ["threads", "async"])
+    @patch('builtins.print')
+    def test_local_copies_used_when_server_is_down(self, mock_print, mode, tmp_path, mock_rtmc_server):
+        """Test that reports that cannot be revalidated are still returned while their local copies are valid."""
+        if mode == "async":
+            pytest.importorskip("aiohttp")
+        server = mock_rtmc_server(files=3)
+        pdf_url = server.pdf_url
+        first = downloader.download_pdfs(pdf_url, str(tmp_path), max_workers=3, use_async=mode == "async",
+                                         rate_limiter=self._fast_limiter())
+        server.stop()
+
+        with patch.object(downloader.time, 'sleep'):
+            second = downloader.download_pdfs(pdf_url, str(tmp_path), max_workers=3,
+                                              use_async=mode == "async", rate_limiter=self._fast_limiter())
+
+        assert len(first) == 3
+        assert second == first
+
+    @patch('builtins.print')
+    def test_async_mode_falls_back_to_threads_without_aiohttp(self, mock_print, tmp_path, mock_rtmc_server):
+        """Test that use_async downloads with threads instead of raising when aiohttp is not installed."""
+        from Scraper.RTMC_Scraper.pdf_logic import async_downloader
+        server = mock_rtmc_server(files=3)
+
+        with patch.object(async_downloader, 'aiohttp', None):
+            paths = downloader.download_pdfs(server.pdf_url, str(tmp_path), use_async=True,
+                                             rate_limiter=self._fast_limiter())
+
+        assert [os.path.basename(path) for path in paths] == list(server.files)
+
+    @patch('builtins.print')
+    def test_warm_refresh_costs_one_conditional_request_per_report(self, mock_print, tmp_path, mock_rtmc_server):
+        """Test that a second run skips the listing and gets a 304 for every report."""
+        server = mock_rtmc_server(files=3)
+        downloader.download_pdfs(server.pdf_url, str(tmp_path), max_workers=3, rate_limiter=self._fast_limiter())
+        first_run = len(server.requests)
+
+        paths = downloader.download_pdfs(server.pdf_url, str(tmp_path), max_workers=3, rate_limiter=self._fast_limiter())
+
+        assert len(paths) == 3
+        second_run = server.requests[first_run:]
+        assert [entry['status'] for entry in second_run] == [304, 304, 304]
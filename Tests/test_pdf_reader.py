@@ -0,0 +1,749 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import os
+from Scraper.RTMC_Scraper.pdf_logic import pdf_reader
+from Scraper.RTMC_Scraper.pdf_logic import ocr
+from Scraper.RTMC_Scraper.pdf_logic import ocr_engine
+from Scraper.RTMC_Scraper.pdf_logic import ocr_cache
+from Scraper.RTMC_Scraper.pdf_logic import preprocess
+from Scraper.RTMC_Scraper.pdf_logic import cell_ocr
+from Scraper.RTMC_Scraper.pdf_logic import page_selection
+from Scraper.RTMC_Scraper.pdf_logic import tabula_reader
+from Scraper.RTMC_Scraper.pdf_logic import native_tables
+from Scraper.RTMC_Scraper.pdf_logic import backends
+from Scraper.RTMC_Scraper.pdf_logic import page_index
+from Scraper.RTMC_Scraper.pdf_logic import report_period
+import fitz
+import numpy as np
+from PIL import Image
+
+
+@pytest.fixture(autouse=True)
+def pytesseract_engine():
+    """
+    Run every test on the pytesseract engine, whose calls the tests mock.
+
+    "auto" prefers tesserocr, which would bypass the mocks when the tesserocr extra is installed.
+    Tests of tesserocr patch it back in themselves.
+    """
+    ocr_engine._engines.cache = {}
+    with patch.object(ocr_engine, 'tesserocr', None):
+        yield
+    ocr_engine._engines.cache = {}
+
+
+def make_scanned_pdf(path: str, pages: int = 3, text_pages: tuple = ()) -> str:
+    """
+    Write a multi-page PDF of image-only pages, like a scanned report.
+
+    Pages listed in text_pages keep a native text layer instead.
+    """
+    document = fitz.open()
+    for number in range(pages):
+        source = fitz.open()
+        source_page = source.new_page()
+        source_page.insert_text((72, 72), f"Page {number + 1} of the road safety report")
+        page = document.new_page()
+        if number in text_pages:
+            page.insert_text((72, 72), f"Page {number + 1} of the road safety report")
+        else:
+            page.insert_image(page.rect, pixmap=source_page.get_pixmap(dpi=72))
+        source.close()
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestPdfReaderOcr:
+    """
+    Tests for OCR of scanned RTMC reports.
+    """
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        return make_scanned_pdf(str(tmp_path / "report_2021.pdf"), pages=3)
+
+    @patch('builtins.print')
+    def test_ocr_pages_in_order(self, mock_print, pdf_path):
+        """Test that OCR text is assembled with one header per page in page order."""
+        calls = []
+
+        def fake_ocr(image, *args, **kwargs):
+            calls.append(image.size)
+            return f"text {len(calls)}"
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', side_effect=fake_ocr):
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, workers=1)
+
+        assert text == "--- Page 1 ---\ntext 1\n--- Page 2 ---\ntext 2\n--- Page 3 ---\ntext 3\n"
+        assert len(calls) == 3
+        assert os.path.exists(pdf_path.replace('.pdf', '_ocr.txt'))
+
+    @patch('builtins.print')
+    def test_ocr_skipped_when_output_exists(self, mock_print, pdf_path):
+        """Test that an existing _ocr.txt file is reused without running OCR."""
+        with open(pdf_path.replace('.pdf', '_ocr.txt'), 'w', encoding='utf-8') as f:
+            f.write("--- Page 1 ---\ncached\n")
+
+        with patch.object(ocr_engine.pytesseract, 'image_to_string') as mock_ocr:
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, workers=1)
+
+        assert text == "--- Page 1 ---\ncached\n"
+        mock_ocr.assert_not_called()
+
+    @patch('builtins.print')
+    def test_text_layer_pages_skip_ocr(self, mock_print, tmp_path):
+        """Test that pages with a native text layer are read directly and only the rest are OCRed."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2022.pdf"), pages=3, text_pages=(0, 2))
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="scanned") as mock_ocr:
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, save_output=False)
+
+        assert mock_ocr.call_count == 1
+        pages = text.split("--- Page ")[1:]
+        assert [page.split(" ---")[0] for page in pages] == ["1", "2", "3"]
+        assert "Page 1 of the road safety report" in pages[0]
+        assert pages[1] == "2 ---\nscanned\n"
+        assert "Page 3 of the road safety report" in pages[2]
+
+    @patch('builtins.print')
+    def test_interrupted_ocr_resumes_at_next_page(self, mock_print, pdf_path):
+        """Test that pages finished before a crash are not OCRed again."""
+        def crash_on_second_page(image, *args, **kwargs):
+            if crash_on_second_page.calls == 1:
+                raise RuntimeError("tesseract crashed")
+            crash_on_second_page.calls += 1
+            return "first"
+        crash_on_second_page.calls = 0
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', side_effect=crash_on_second_page):
+            assert pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, save_output=False) == ""
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="rest") as mock_ocr:
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, save_output=False)
+
+        assert mock_ocr.call_count == 2
+        assert text == "--- Page 1 ---\nfirst\n--- Page 2 ---\nrest\n--- Page 3 ---\nrest\n"
+
+    @patch('builtins.print')
+    def test_page_cache_keyed_on_dpi(self, mock_print, pdf_path):
+        """Test that cached pages are reused at the same DPI and redone at a different one."""
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="text") as mock_ocr:
+            pdf_reader.pdf_to_text_ocr(pdf_path, dpi=100, workers=1, save_output=False)
+            pdf_reader.pdf_to_text_ocr(pdf_path, dpi=100, workers=1, save_output=False)
+            assert mock_ocr.call_count == 3
+
+            pdf_reader.pdf_to_text_ocr(pdf_path, dpi=120, workers=1, save_output=False)
+            assert mock_ocr.call_count == 6
+
+    @patch('builtins.print')
+    def test_adaptive_dpi_reocrs_low_confidence_pages(self, mock_print, pdf_path):
+        """Test that only pages with low confidence at the low DPI are OCRed again at full DPI."""
+        def fake_data(image, *args, **kwargs):
+            # Page 2 is only readable at full resolution
+            fake_data.calls += 1
+            low_res = image.size[0] < 1000
+            confidence = 40 if low_res and fake_data.calls == 2 else 92
+            return {'text': ['Gauteng', '2500'], 'conf': [confidence, confidence],
+                    'block_num': [1, 1], 'par_num': [1, 1], 'line_num': [1, 1]}
+        fake_data.calls = 0
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_data', side_effect=fake_data):
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, dpi=150, adaptive_dpi=75, workers=1, save_output=False)
+
+        assert fake_data.calls == 4
+        assert text.count("Gauteng 2500") == 3
+
+        engine = ocr_engine.get_ocr_engine()
+        cache = ocr_cache.OcrPageCache.for_pdf(pdf_path, 150, f"{engine.name}-{engine.version}",
+                                               "adaptive_dpi=75,min_confidence=75.0")
+        entries = [cache.get_entry(n) for n in range(3)]
+        assert [entry['dpi'] for entry in entries] == [75, 150, 75]
+        assert [entry['confidence'] for entry in entries] == [92, 92, 92]
+        assert all(entry['seconds'] >= 0 for entry in entries)
+
+    @patch('builtins.print')
+    def test_ocr_pages_reports_every_page(self, mock_print, pdf_path):
+        """Test that the completion callback sees each requested page exactly once."""
+        done = []
+        with patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="ok"):
+            results = ocr.ocr_pages(pdf_path, [2, 0], workers=1,
+                                    on_page_done=lambda number, text: done.append(number))
+
+        assert results == {0: "ok", 2: "ok"}
+        assert sorted(done) == [0, 2]
+
+    def test_pixmap_to_image_is_grayscale_view(self, pdf_path):
+        """Test that pages are rendered to grayscale images that match the pixmap samples."""
+        with fitz.open(pdf_path) as document:
+            pix = ocr.render_page(document[0], dpi=72)
+            image = ocr.pixmap_to_image(pix)
+            try:
+                assert image.mode == "L"
+                assert image.size == (pix.width, pix.height)
+                assert image.tobytes() == pix.samples
+            finally:
+                image.close()
+
+    def test_split_batches_keeps_pages_contiguous(self):
+        """Test that page batches are contiguous and cover every page once."""
+        batches = ocr._split_batches(list(range(10)), workers=2)
+
+        assert [page for batch in batches for page in batch] == list(range(10))
+        assert len(batches) <= 8
+
+    def test_default_ocr_workers(self):
+        """Test that the ocr_workers setting overrides the CPU count."""
+        assert ocr.default_ocr_workers({'ocr_workers': '3'}) == 3
+        assert ocr.default_ocr_workers({}) == (os.cpu_count() or 1)
+
+
+class TestOcrEngine:
+    """
+    Tests for selecting and reusing OCR engines.
+    """
+
+    def test_tesserocr_handle_reused_across_pages(self, tmp_path):
+        """Test that one Tesseract API handle is created per worker and reused for every page."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2021.pdf"), pages=3)
+        fake_tesserocr = MagicMock()
+        api = fake_tesserocr.PyTessBaseAPI.return_value
+        api.GetUTF8Text.return_value = "page text"
+
+        with patch.object(ocr_engine, 'tesserocr', fake_tesserocr):
+            results = ocr.ocr_pages(pdf_path, [0, 1, 2], workers=1)
+
+        assert results == {0: "page text", 1: "page text", 2: "page text"}
+        fake_tesserocr.PyTessBaseAPI.assert_called_once()
+        assert api.SetImage.call_count == 3
+
+    @patch('builtins.print')
+    def test_falls_back_to_pytesseract(self, mock_print):
+        """Test that pytesseract is used when tesserocr is missing or fails to start."""
+        with patch.object(ocr_engine, 'tesserocr', None):
+            assert ocr_engine.get_ocr_engine("auto").name == "pytesseract"
+
+        broken_tesserocr = MagicMock()
+        broken_tesserocr.PyTessBaseAPI.side_effect = RuntimeError("no tessdata")
+        with patch.object(ocr_engine, 'tesserocr', broken_tesserocr):
+            assert ocr_engine.get_ocr_engine("tesserocr").name == "pytesseract"
+
+    def test_pytesseract_confidence_rebuilds_lines(self):
+        """Test that text rebuilt from word data keeps lines and paragraphs and averages confidences."""
+        data = {'text': ['', 'Fatal', 'crashes', 'Gauteng', '2500'], 'conf': [-1, 90, 80, 70, 60],
+                'block_num': [1, 1, 1, 2, 2], 'par_num': [1, 1, 1, 1, 1], 'line_num': [0, 1, 1, 1, 1]}
+        with patch.object(ocr_engine.pytesseract, 'image_to_data', return_value=data):
+            text, confidence = ocr_engine.PytesseractEngine().image_to_string_with_confidence(MagicMock())
+
+        assert text == "Fatal crashes\n\nGauteng 2500"
+        assert confidence == 75.0
+
+    def test_pytesseract_engine_requested(self):
+        """Test that the pytesseract engine is used when requested even if tesserocr is installed."""
+        with patch.object(ocr_engine, 'tesserocr', MagicMock()):
+            engine = ocr_engine.get_ocr_engine("pytesseract")
+
+        assert engine.name == "pytesseract"
+        assert ocr_engine.get_ocr_engine("pytesseract") is engine
+
+
+PROVINCE_TABLE = ("Table 4: Fatal crashes per province\n"
+                  "Eastern Cape 1200\nFree State 800\nGauteng 2500\nKwaZulu-Natal 2100\nLimpopo 1100\n")
+
+
+def make_report_pdf(path: str, pages: dict, total: int = 6) -> str:
+    """Write a born-digital PDF with the given text on the given zero-based pages."""
+    document = fitz.open()
+    for number in range(total):
+        page = document.new_page()
+        text = pages.get(number, f"Narrative section {number + 1} about road safety programmes.")
+        page.insert_text((72, 72), text)
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestPageSelection:
+    """
+    Tests for picking the pages that hold provincial tables.
+    """
+
+    def test_text_layer_table_page_selected(self, tmp_path):
+        """Test that pages naming several provinces and a crash metric are selected."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"), {3: PROVINCE_TABLE})
+
+        assert page_selection.select_table_pages(pdf_path, prepass=False) == [3]
+
+    def test_toc_entries_parsed(self):
+        """Test that table of contents entries for provincial tables are found on either layout."""
+        toc = ("Table of Contents\n"
+               "1. Introduction ........ 3\n"
+               "Table 4: Fatal crashes per province ........ 23\n"
+               "Figure 2: Fatalities by region\n"
+               "27\n")
+
+        assert page_selection.parse_toc_pages(toc) == [23, 27]
+
+    @patch('builtins.print')
+    def test_prepass_selects_scanned_pages(self, mock_print, tmp_path):
+        """Test that scanned pages are picked from a low-resolution OCR pre-pass."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2019.pdf"), pages=4)
+
+        def fake_ocr(image, *args, **kwargs):
+            fake_ocr.calls += 1
+            return PROVINCE_TABLE if fake_ocr.calls == 3 else "Foreword by the minister"
+        fake_ocr.calls = 0
+
+        with patch.object(ocr_engine.pytesseract, 'image_to_string', side_effect=fake_ocr):
+            assert page_selection.select_table_pages(pdf_path, prepass_dpi=30) == [2]
+            # The pre-pass is cached per page
+            assert page_selection.select_table_pages(pdf_path, prepass_dpi=30) == [2]
+
+        assert fake_ocr.calls == 4
+
+    @patch('builtins.print')
+    def test_page_selection_limits_ocr(self, mock_print, tmp_path):
+        """Test that OCR of a page selection covers only those pages and does not write _ocr.txt."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2021.pdf"), pages=3)
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="table") as mock_ocr:
+            text = pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, pages=[1])
+
+        assert text == "--- Page 2 ---\ntable\n"
+        assert mock_ocr.call_count == 1
+        assert not os.path.exists(pdf_path.replace('.pdf', '_ocr.txt'))
+
+    @patch('builtins.print')
+    def test_select_ocr_pages_full_document_override(self, mock_print, tmp_path):
+        """Test that full_document skips the selection and no candidates falls back to every page."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"), {})
+
+        with patch.object(pdf_reader, 'read_config', return_value={}):
+            assert pdf_reader.select_ocr_pages(pdf_path, full_document=True) is None
+            assert pdf_reader.select_ocr_pages(pdf_path) is None
+
+
+class TestPreprocess:
+    """
+    Tests for cleaning up scanned pages before OCR.
+    """
+
+    @pytest.fixture
+    def page_image(self):
+        document = fitz.open()
+        page = document.new_page()
+        for line in range(25):
+            page.insert_text((60, 80 + line * 22), "Gauteng 2500 fatal crashes per province in the year")
+        pix = page.get_pixmap(dpi=100, colorspace=fitz.csGRAY)
+        image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        document.close()
+        return image
+
+    def test_adaptive_threshold_ignores_uneven_background(self):
+        """Test that ink is found on both a light and a dark part of the page."""
+        gray = np.full((60, 120), 230, dtype=np.uint8)
+        gray[:, 60:] = 120  # shadowed half of the scan
+        gray[28:32, 20:40] = 150
+        gray[28:32, 80:100] = 40
+
+        ink = preprocess.adaptive_threshold(gray, window=15)
+
+        assert ink[30, 30] and ink[30, 90]
+        assert not ink[5, 10] and not ink[5, 110]
+
+    @pytest.mark.parametrize("angle", [2.0, -3.0, 0.0])
+    def test_deskew_levels_rotated_page(self, page_image, angle):
+        """Test that the skew of a rotated page is found and removed."""
+        rotated = page_image.rotate(angle, expand=True, fillcolor=255)
+        ink = preprocess.adaptive_threshold(preprocess.to_grayscale(rotated))
+
+        assert preprocess.estimate_skew(ink) == pytest.approx(angle, abs=0.25)
+        cleaned = preprocess.preprocess_page(rotated)
+        assert preprocess.estimate_skew(np.asarray(cleaned) < 128) == pytest.approx(0.0, abs=0.25)
+
+    def test_crop_removes_blank_borders(self, page_image):
+        """Test that the preprocessed page is binary and cropped to the text."""
+        cleaned = preprocess.preprocess_page(page_image, deskew=False)
+        pixels = np.asarray(cleaned)
+
+        assert cleaned.width < page_image.width and cleaned.height < page_image.height
+        assert set(np.unique(pixels)) <= {0, 255}
+
+    @patch('builtins.print')
+    def test_preprocessed_pages_sent_to_ocr(self, mock_print, tmp_path):
+        """Test that the OCR engine receives the cropped page when preprocessing is on."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2020.pdf"), pages=1)
+        sizes = []
+
+        def fake_ocr(image, *args, **kwargs):
+            sizes.append(image.size)
+            return "text"
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(ocr_engine.pytesseract, 'image_to_string', side_effect=fake_ocr):
+            pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, save_output=False, preprocess=True)
+            pdf_reader.pdf_to_text_ocr(pdf_path, workers=1, save_output=False, preprocess=False)
+
+        assert sizes[0][0] < sizes[1][0] and sizes[0][1] < sizes[1][1]
+
+
+def make_table_pdf(path: str) -> str:
+    """Write a one-page PDF with a title line and a ruled provincial table."""
+    rows = [("Province", "Fatal crashes", "Deaths"), ("Eastern Cape", "1 200", "1410"),
+            ("Free State", "800", ""), ("Gauteng", "2500", "2730")]
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 60), "Table 4: Fatal crashes per province in the year under review")
+    for i, row in enumerate(rows):
+        for x, text in zip((72, 260, 400), row):
+            if text:
+                page.insert_text((x, 100 + i * 24), text)
+    page.draw_line((60, 106), (480, 106))
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestCellOcr:
+    """
+    Tests for reading table cells with digits-only OCR.
+    """
+
+    def test_detect_table_cells_grid(self, tmp_path):
+        """Test that the table grid is found below the title, with empty cells left out."""
+        pdf_path = make_table_pdf(str(tmp_path / "report_2019.pdf"))
+        with fitz.open(pdf_path) as document:
+            pix = ocr.render_page(document[0], 150)
+            ink = np.asarray(Image.frombytes("L", (pix.width, pix.height), pix.samples)) < 128
+
+        grid = cell_ocr.detect_table_cells(ink)
+
+        assert len(grid) == 4
+        assert all(len(row) == 3 for row in grid)
+        assert grid[2][2] is None
+        assert all(box is not None for row in (grid[0], grid[1], grid[3]) for box in row)
+
+    @patch('builtins.print')
+    def test_ocr_table_cells_builds_dataframe(self, mock_print, tmp_path):
+        """Test that label cells and digit cells are read in one batch each and returned as a table."""
+        pdf_path = make_table_pdf(str(tmp_path / "report_2019.pdf"))
+        labels = ["Province", "Fatal crashes", "Deaths", "Eastern Cape", "Free State", "Gauteng"]
+        figures = ["1 200", "1410", "800", "2500", "2730"]
+        engine = MagicMock()
+        engine.recognize_cells.side_effect = lambda image, boxes, whitelist=None: figures if whitelist else labels
+
+        with patch.object(cell_ocr, 'get_ocr_engine', return_value=engine):
+            tables = cell_ocr.ocr_table_cells(pdf_path, [0])
+
+        assert engine.recognize_cells.call_count == 2
+        assert engine.recognize_cells.call_args.kwargs['whitelist'] == cell_ocr.DIGIT_WHITELIST
+        table = tables[0]
+        assert list(table.columns) == ["Province", "Fatal crashes", "Deaths"]
+        assert table["Fatal crashes"].tolist() == [1200, 800, 2500]
+        records = pdf_reader.extract_accident_data_from_tables(tables, 2019, "RTMC")
+        assert [(record.region, record.accident_count) for record in records] == \
+            [("Eastern Cape", 1200), ("Free State", 800), ("Gauteng", 2500)]
+
+    def test_pytesseract_cells_stacked_into_one_run(self):
+        """Test that pytesseract reads all inked cells with one run and skips blank cells."""
+        image = Image.new("L", (200, 100), 255)
+        image.paste(0, (10, 10, 40, 30))
+        image.paste(0, (10, 60, 40, 80))
+        boxes = [(5, 5, 45, 35), (100, 5, 140, 35), (5, 55, 45, 85)]
+
+        with patch.object(ocr_engine.pytesseract, 'image_to_string', return_value="12\n\n34\n") as mock_ocr:
+            texts = ocr_engine.PytesseractEngine().recognize_cells(image, boxes, whitelist="0123456789")
+
+        assert texts == ["12", "", "34"]
+        mock_ocr.assert_called_once()
+        assert "tessedit_char_whitelist=0123456789" in mock_ocr.call_args.kwargs['config']
+
+
+class TestTabulaReader:
+    """Tests for the shared tabula JVM."""
+
+    @patch('builtins.print')
+    def test_every_call_uses_in_process_jvm(self, mock_print):
+        """Test that tabula is never forced into a subprocess and the backend is reported once."""
+        with patch.object(tabula_reader, '_jvm_running', False), \
+                patch.object(tabula_reader, 'jvm_in_process', return_value=True), \
+                patch.object(tabula_reader.tabula, 'read_pdf', return_value=[]) as mock_read_pdf:
+            tabula_reader.read_pdf_tables("first.pdf", pages=1)
+            tabula_reader.read_pdf_tables("second.pdf", pages=[2, 3])
+
+        assert [call.kwargs['force_subprocess'] for call in mock_read_pdf.call_args_list] == [False, False]
+        assert mock_read_pdf.call_args_list[1].kwargs['pages'] == [2, 3]
+        mock_print.assert_called_once_with("[RTMC] Reading tables with tabula in a shared in-process JVM")
+
+    @patch('builtins.print')
+    def test_failed_jvm_start_not_counted_as_started(self, mock_print):
+        """Test that the JVM only counts as started once a tabula call has succeeded."""
+        with patch.object(tabula_reader, '_jvm_running', False), \
+                patch.object(tabula_reader, 'jvm_in_process', return_value=True), \
+                patch.object(tabula_reader.tabula, 'read_pdf', side_effect=[OSError("JVM failed to start"), []]):
+            with pytest.raises(OSError):
+                tabula_reader.read_pdf_tables("first.pdf", pages=1)
+            assert not tabula_reader.jvm_started()
+            tabula_reader.read_pdf_tables("second.pdf", pages=1)
+            assert tabula_reader.jvm_started()
+
+
+def make_ruled_table_pdf(path: str, rows: list) -> str:
+    """Write a born-digital PDF with a ruled table on its second page."""
+    document = fitz.open()
+    document.new_page().insert_text((72, 72), "Foreword by the minister")
+    page = document.new_page()
+    edges = [72, 220, 340]
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            page.insert_text((edges[c] + 4, 100 + r * 20 + 14), cell)
+    right = edges[-1] + 120
+    for r in range(len(rows) + 1):
+        page.draw_line((edges[0], 100 + r * 20), (right, 100 + r * 20))
+    for x in edges + [right]:
+        page.draw_line((x, 100), (x, 100 + len(rows) * 20))
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestNativeTables:
+    """
+    Tests for reading tables with PyMuPDF instead of tabula.
+    """
+
+    ROWS = [["Province", "Fatal crashes", "Change"],
+            ["Eastern Cape", "1 200", "-2.5"],
+            ["Gauteng", "2,500", ""]]
+
+    def test_ruled_table_read_like_tabula(self, tmp_path):
+        """Test that a ruled table becomes a DataFrame with the header as columns and figures as numbers."""
+        pdf_path = make_ruled_table_pdf(str(tmp_path / "report_2021.pdf"), self.ROWS)
+
+        tables = native_tables.extract_native_tables(pdf_path)
+
+        assert len(tables) == 1
+        assert list(tables[0].columns) == ["Province", "Fatal crashes", "Change"]
+        assert tables[0]["Fatal crashes"].tolist() == [1200, 2500]
+        records = pdf_reader.extract_accident_data_from_tables(tables, 2021, "RTMC")
+        assert [(record.region, record.accident_count) for record in records] == \
+            [("Eastern Cape", 1200), ("Gauteng", 2500)]
+
+    def test_only_requested_pages_read(self, tmp_path):
+        """Test that pages outside the selection are not searched."""
+        pdf_path = make_ruled_table_pdf(str(tmp_path / "report_2021.pdf"), self.ROWS)
+
+        assert native_tables.extract_native_tables(pdf_path, pages=[0]) == []
+
+    @patch('builtins.print')
+    def test_pymupdf_backend_skips_tabula(self, mock_print, tmp_path):
+        """Test that the pymupdf table_backend extracts tables without calling tabula."""
+        pdf_path = make_ruled_table_pdf(str(tmp_path / "report_2021.pdf"), self.ROWS)
+
+        with patch.object(pdf_reader, 'read_config', return_value={'table_backend': 'pymupdf'}), \
+                patch.object(tabula_reader.tabula, 'read_pdf') as mock_read_pdf:
+            tables = pdf_reader.extract_tables_from_pdf(pdf_path, full_document=True)
+
+        mock_read_pdf.assert_not_called()
+        assert len(tables) == 1
+
+
+class TestExtractionBackends:
+    """
+    Tests for picking the extraction backend per report.
+    """
+
+    OCR_TABLE_TEXT = "--- Page 1 ---\nProvince  Fatal crashes\nGauteng  2500\nLimpopo  1100\n"
+
+    def test_probe_counts_text_and_scanned_pages(self, tmp_path):
+        """Test that the probe tells pages with a text layer from scanned pages."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2021.pdf"), pages=3, text_pages=(1,))
+
+        probe = backends.probe_pdf(pdf_path)
+
+        assert probe['page_count'] == 3
+        assert probe['text_pages'] == 1
+        assert probe['scanned_pages'] == 2
+        assert probe['image_coverage'] == pytest.approx(2 / 3)
+
+    @patch('builtins.print')
+    def test_scanned_report_goes_straight_to_ocr(self, mock_print, tmp_path):
+        """Test that a scanned report skips the text layer backends and reuses the backend that worked."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2021.pdf"), pages=3)
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(pdf_reader, 'java_available', return_value=True), \
+                patch.object(pdf_reader, 'select_ocr_pages', return_value=None), \
+                patch.object(tabula_reader.tabula, 'read_pdf') as mock_read_pdf, \
+                patch.object(pdf_reader, '_ocr_table_cells', return_value=[]) as mock_cells, \
+                patch.object(pdf_reader, 'pdf_to_text_ocr', return_value=self.OCR_TABLE_TEXT):
+            first = pdf_reader._extract_tables_uncached(pdf_path)
+            second = pdf_reader._extract_tables_uncached(pdf_path)
+
+        mock_read_pdf.assert_not_called()
+        assert mock_cells.call_count == 1
+        assert len(first) == len(second) == 1
+        decision = backends.BackendDecision.for_pdf(pdf_path, "selected")
+        assert decision.backend == "ocr"
+        assert decision.failed == ["cell_ocr"]
+
+    @patch('builtins.print')
+    def test_ocr_tried_when_no_backend_looks_viable(self, mock_print, tmp_path):
+        """Test that a report with neither a text layer nor a scanned page still goes through OCR."""
+        pdf_path = str(tmp_path / "report_2021.pdf")
+        document = fitz.open()
+        document.new_page()
+        document.save(pdf_path)
+        document.close()
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(pdf_reader, 'select_ocr_pages', return_value=None), \
+                patch.object(pdf_reader, 'pdf_to_text_ocr', return_value=self.OCR_TABLE_TEXT) as mock_ocr:
+            tables = pdf_reader._extract_tables_uncached(pdf_path)
+
+        mock_ocr.assert_called_once()
+        assert len(tables) == 1
+        assert backends.BackendDecision.for_pdf(pdf_path, "selected").backend == "ocr"
+
+    @patch('builtins.print')
+    def test_failed_backends_not_retried(self, mock_print, tmp_path):
+        """Test that a report where no backend found tables is not extracted again."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"),
+                                   {1: "Crashes per province fell this year, see the annexure."}, total=2)
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(pdf_reader, 'java_available', return_value=True), \
+                patch.object(tabula_reader.tabula, 'read_pdf', return_value=[]) as mock_read_pdf:
+            assert pdf_reader._extract_tables_uncached(pdf_path) == []
+            assert pdf_reader._extract_tables_uncached(pdf_path) == []
+
+        assert mock_read_pdf.call_count == 1
+        decision = backends.BackendDecision.for_pdf(pdf_path, "selected")
+        assert decision.backend is None
+        assert decision.failed == ["text_layer", "pymupdf", "tabula"]
+
+    @patch('builtins.print')
+    def test_backend_errors_not_remembered(self, mock_print, tmp_path):
+        """Test that a backend that raised, e.g. without a Java runtime, is tried again on the next run."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"),
+                                   {1: "Crashes per province fell this year, see the annexure."}, total=2)
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(pdf_reader, 'java_available', return_value=True), \
+                patch.object(tabula_reader.tabula, 'read_pdf', side_effect=OSError("java not found")) as mock_read_pdf:
+            assert pdf_reader._extract_tables_uncached(pdf_path) == []
+            assert pdf_reader._extract_tables_uncached(pdf_path) == []
+
+        assert mock_read_pdf.call_count == 2
+        decision = backends.BackendDecision.for_pdf(pdf_path, "selected")
+        assert decision.failed == ["text_layer", "pymupdf"]
+
+
+class TestPageIndex:
+    """
+    Tests for the keyword page index.
+    """
+
+    def test_keywords_mapped_to_pages(self, tmp_path):
+        """Test that table pages and column headings are looked up from the index."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"),
+                                   {1: "Crashes per province fell this year.", 3: PROVINCE_TABLE})
+
+        index = page_index.PageIndex.for_pdf(pdf_path)
+
+        assert index.table_pages() == [3]
+        assert index.pages_with("province", "region") == [1, 3]
+        assert index.pages_with("gauteng") == [3]
+        assert index.unindexed_pages() == []
+
+    def test_cached_ocr_text_indexed(self, tmp_path):
+        """Test that scanned pages are indexed once their OCR text is cached."""
+        pdf_path = make_scanned_pdf(str(tmp_path / "report_2019.pdf"), pages=3)
+        assert page_index.PageIndex.for_pdf(pdf_path).unindexed_pages() == [0, 1, 2]
+
+        ocr_cache.OcrPageCache.for_pdf(pdf_path, 150, "pytesseract-5.3").put(1, PROVINCE_TABLE, dpi=150)
+        index = page_index.PageIndex.for_pdf(pdf_path)
+
+        assert index.table_pages() == [1]
+        assert index.unindexed_pages() == [0, 2]
+
+    @patch('builtins.print')
+    def test_tabula_reads_only_pages_with_headings(self, mock_print, tmp_path):
+        """Test that tabula only reads the pages that mention a province or region when none were selected."""
+        pdf_path = make_report_pdf(str(tmp_path / "report_2022.pdf"),
+                                   {2: "Fatalities by region are listed below."}, total=5)
+
+        with patch.object(pdf_reader, 'read_config', return_value={}), \
+                patch.object(tabula_reader.tabula, 'read_pdf', return_value=[]) as mock_read_pdf:
+            pdf_reader.read_text_layer_tables(pdf_path, pdf_reader.text_layer_table_pages(pdf_path), "tabula")
+
+        assert mock_read_pdf.call_args.kwargs['pages'] == [3]
+
+
+class TestReportPeriod:
+    """
+    Tests for resolving the period a report covers.
+    """
+
+    @pytest.mark.parametrize("filename, label, year, quarter", [
+        ("1st%20quarter%20201516Report.pdf", "Apr-Jun 2015 (FY2015/16 Q1)", 2015, 2),
+        ("4th%20quarter%20201415%20Report.pdf", "Jan-Mar 2015 (FY2014/15 Q4)", 2015, 1),
+        ("2020---2021-Q2-State-of-Road-Safety-Report.pdf", "Jul-Sep 2020 (FY2020/21 Q2)", 2020, 3),
+        ("Traffic_Report_JantoMarch2016.pdf", "Jan-Mar 2016", 2016, 1),
+        ("Oct%20-%20Dec%202017.pdf", "Oct-Dec 2017", 2017, 4),
+        ("Q4-Jan-to-Mar-2020-final-report-August-2020.pdf", "Jan-Mar 2020", 2020, 1),
+        ("State-of-Road-Safety-Report-Jan-to-Jun-2020.pdf", "Jan-Jun 2020", 2020, None),
+        ("Quarter%202%20Road%20Traffic%20Reportsept2017.pdf", "Jul-Sep 2017", 2017, 3),
+        ("Mar%202008%20Report.pdf", "Jan-Mar 2008", 2008, 1),
+        ("q2016.pdf", "2016", 2016, None),
+    ])
+    def test_period_from_filename(self, filename, label, year, quarter):
+        """Test that quarters, month ranges and financial years are read from report filenames."""
+        with patch.object(report_period.fitz, 'open') as mock_open:
+            period = report_period.resolve_report_period(os.path.join("pdf_downloads", filename))
+
+        mock_open.assert_not_called()
+        assert (period.label, period.year, period.quarter, period.source) == (label, year, quarter, "filename")
+
+    def test_period_from_metadata_then_first_page(self, tmp_path):
+        """Test that the metadata is used before the first page when the filename names no period."""
+        pdf_path = str(tmp_path / "traffic%20report.pdf")
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), "State of Road Safety Report, July to September 2019")
+        document.set_metadata({"title": "Road Traffic Report 2nd quarter 2018/19"})
+        document.save(pdf_path)
+        document.close()
+        assert report_period.resolve_report_period(pdf_path).label == "Jul-Sep 2018 (FY2018/19 Q2)"
+
+        pdf_path = str(tmp_path / "3rd%20Quarter%20report.pdf")
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), "State of Road Safety Report, July to September 2019")
+        document.save(pdf_path)
+        document.close()
+        period = report_period.resolve_report_period(pdf_path)
+        assert (period.label, period.source) == ("Jul-Sep 2019", "text")
+
+    @patch('builtins.print')
+    def test_period_stored_per_content_hash(self, mock_print, tmp_path):
+        """Test that the PDF is only opened the first time its period is resolved."""
+        pdf_path = str(tmp_path / "c.pdf")
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), "Road Traffic Report, October to December 2021")
+        document.save(pdf_path)
+        document.close()
+        assert pdf_reader.extract_year_from_pdf(pdf_path) == 2021
+
+        report_period._period_cache.clear()
+        with patch.object(report_period.fitz, 'open') as mock_open, \
+                patch.object(tabula_reader.tabula, 'read_pdf') as mock_read_pdf:
+            assert pdf_reader.extract_year_from_pdf(pdf_path) == 2021
+
+        mock_open.assert_not_called()
+        mock_read_pdf.assert_not_called()
+        assert os.listdir(tmp_path / ".store" / "report_period")
@@ -29,6 +29,18 @@ class TestRTMCScraper:
         assert scraper.downloaded_pdfs == []
         assert scraper.raw_data is None
 
+    @patch('builtins.print')
+    def test_fetch_data_closes_session(self, mock_print):
+        """Test that the pooled session is shared by the downloads and closed afterwards, even on errors."""
+        scraper = RTMCScraper()
+        with patch('Scraper.RTMC_Scraper.scraper.create_session') as mock_create_session, \
+                patch('Scraper.RTMC_Scraper.scraper.download_pdfs', side_effect=RuntimeError("offline")) as mock_download:
+            scraper.fetch_data()
+
+        session = mock_create_session.return_value
+        assert mock_download.call_args.kwargs['session'] is session
+        session.close.assert_called_once()
+
     @patch('requests.get')
     @patch('builtins.print')
     def test_fetch_data_no_pdfs(self, mock_print, mock_get):
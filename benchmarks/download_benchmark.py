@@ -0,0 +1,143 @@
+"""
+Download throughput benchmark for the RTMC PDF downloader.
+
+Runs download_pdfs against the in-process mock RTMC server in each download mode and
+reports files/sec, MB/sec and per-file transfer latency percentiles. Every run starts from
+an empty download directory so it measures a cold-cache refresh.
+
+Usage:
+    python -m benchmarks.download_benchmark --files 45 --size-kb 800 --latency 0.05 --modes sequential threads:8 async:16
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import io
+from typing import Dict, List, Tuple
+
+from Tests.mock_rtmc_server import MockRTMCServer, make_pdf
+from Scraper.RTMC_Scraper.pdf_logic import download_pdfs, AdaptiveRateLimiter
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Get a percentile of a list of values using the nearest-rank method.
+
+    Args:
+        values: The values
+        fraction: The percentile as a fraction between 0 and 1
+
+    Returns:
+        The percentile, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def parse_mode(mode: str) -> Tuple[str, int]:
+    """
+    Parse a mode such as "sequential", "threads:8" or "async:16".
+
+    Args:
+        mode: The mode string
+
+    Returns:
+        A tuple of (mode name, number of workers)
+    """
+    name, _, workers = mode.partition(':')
+    if name not in ("sequential", "threads", "async"):
+        raise argparse.ArgumentTypeError(f"Unknown mode '{mode}'")
+    return name, 1 if name == "sequential" else int(workers or 8)
+
+
+def run_mode(files: Dict[str, bytes], mode: str, workers: int, server_options: dict,
+             max_per_host: int, requests_per_second: float) -> dict:
+    """
+    Download every file from a fresh mock server in one mode.
+
+    Args:
+        files: Mapping of PDF filename to content
+        mode: "sequential", "threads" or "async"
+        workers: The number of concurrent downloads
+        server_options: Options passed to MockRTMCServer
+        max_per_host: The per-host concurrency cap
+        requests_per_second: The starting rate of the rate limiter
+
+    Returns:
+        A dictionary with the measured results
+    """
+    download_dir = tempfile.mkdtemp(prefix="rtmc_bench_")
+    try:
+        with MockRTMCServer(files, **server_options) as server:
+            limiter = AdaptiveRateLimiter(requests_per_second=requests_per_second, burst=max(4.0, workers))
+            start = time.perf_counter()
+            # The downloader reports progress per file, keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                paths = download_pdfs(server.pdf_url, download_dir, max_workers=workers, max_per_host=max_per_host,
+                                      use_async=mode == "async", rate_limiter=limiter)
+            elapsed = time.perf_counter() - start
+            latencies = server.transfer_latencies()
+            statuses = server.status_counts()
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    total_bytes = sum(len(files[os.path.basename(path)]) for path in paths)
+    return {
+        'mode': f"{mode}:{workers}" if mode != "sequential" else mode,
+        'files': len(paths),
+        'seconds': elapsed,
+        'files_per_sec': len(paths) / elapsed if elapsed else 0.0,
+        'mb_per_sec': total_bytes / 1024 / 1024 / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'requests': sum(statuses.values()),
+    }
+
+
+def main():
+    """
+    Run the benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the RTMC PDF downloader against a local mock server")
+    parser.add_argument("--files", type=int, default=20, help="Number of PDFs on the mock listing")
+    parser.add_argument("--size-kb", type=int, default=500, help="Approximate size of each PDF in KB")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of latency added to every request")
+    parser.add_argument("--bandwidth-kbps", type=float, default=None, help="Per-connection bandwidth cap in KB/s")
+    parser.add_argument("--throttle-first", type=int, default=0, help="Initial requests per PDF answered with 429")
+    parser.add_argument("--retry-after", default="0", help="Retry-After value sent with 429 responses")
+    parser.add_argument("--drop-fraction", type=float, default=None,
+                        help="Cut the first transfer of each PDF after this fraction of its bytes")
+    parser.add_argument("--max-per-host", type=int, default=8, help="Per-host concurrency cap")
+    parser.add_argument("--requests-per-second", type=float, default=20.0, help="Starting rate limit per host")
+    parser.add_argument("--modes", nargs="+", type=parse_mode, default=["sequential", "threads:8", "async:8"],
+                        help="Modes to run: sequential, threads:N, async:N")
+    args = parser.parse_args()
+
+    modes = [parse_mode(mode) if isinstance(mode, str) else mode for mode in args.modes]
+    files = {f"report_{i:03d}.pdf": make_pdf(f"Report {i}", padding_bytes=args.size_kb * 1024)
+             for i in range(args.files)}
+    server_options = {
+        'latency': args.latency,
+        'bandwidth': args.bandwidth_kbps * 1024 if args.bandwidth_kbps else None,
+        'throttle_first': args.throttle_first,
+        'retry_after': args.retry_after,
+        'drop_fraction': args.drop_fraction,
+    }
+
+    print(f"Benchmarking {args.files} PDFs of ~{args.size_kb} KB, latency {args.latency}s")
+    print(f"{'mode':<12} {'files':>5} {'seconds':>8} {'files/s':>8} {'MB/s':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'reqs':>5}")
+    for mode, workers in modes:
+        result = run_mode(files, mode, workers, server_options, args.max_per_host, args.requests_per_second)
+        print(f"{result['mode']:<12} {result['files']:>5} {result['seconds']:>8.2f} {result['files_per_sec']:>8.2f} "
+              f"{result['mb_per_sec']:>8.2f} {result['p50']:>7.3f} {result['p95']:>7.3f} {result['p99']:>7.3f} "
+              f"{result['requests']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+OCR throughput benchmark for the RTMC PDF reader.
+
+Builds synthetic scanned reports by rendering the committed pdf_downloads/*_ocr.txt corpus
+onto image-only pages, then runs pdf_to_text_ocr over a matrix of backends, DPIs and worker
+counts. Each configuration runs in a fresh process against an empty OCR cache and reports
+pages/sec, per-page p50/p95 latency, peak RSS and the character error rate against the text
+that was rendered.
+
+Backends are an OCR engine name with optional modifiers, e.g. "pytesseract", "tesserocr",
+"pytesseract+preprocess" or "tesserocr+adaptive=75".
+
+Usage:
+    python -m benchmarks.ocr_benchmark --documents 2 --pages 5 --dpi 100 150 200 --workers 1 4 --backends pytesseract tesserocr
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import contextlib
+import io
+import multiprocessing
+from queue import Empty
+from typing import Dict, List, Optional
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from benchmarks.download_benchmark import percentile
+from Scraper.RTMC_Scraper.pdf_logic.pdf_reader import pdf_to_text_ocr
+from Scraper.RTMC_Scraper.pdf_logic.content_store import STORE_DIRNAME
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdf_downloads")
+PAGE_HEADER_PATTERN = re.compile(r'^--- Page \d+ ---$', re.MULTILINE)
+# Layout of the synthetic pages
+FONT_SIZE = 9
+LINE_HEIGHT = 12
+MARGIN = 50
+MAX_LINE_CHARS = 95
+
+
+def load_corpus(corpus_dir: str = CORPUS_DIR, documents: int = 2, pages: int = 5,
+                min_chars: int = 200) -> List[List[str]]:
+    """
+    Load page texts from the committed OCR output of real reports.
+
+    Args:
+        corpus_dir: The directory holding the *_ocr.txt files
+        documents: The number of documents to use
+        pages: The number of pages to take from each document
+        min_chars: Pages with less text than this are skipped
+
+    Returns:
+        A list of documents, each a list of page texts
+    """
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*_ocr.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            page_texts = [text.strip() for text in PAGE_HEADER_PATTERN.split(f.read())]
+        page_texts = [text for text in page_texts if len(text) >= min_chars][:pages]
+        if page_texts:
+            corpus.append(page_texts)
+        if len(corpus) == documents:
+            break
+    return corpus
+
+
+def _page_lines(text: str, max_lines: int) -> List[str]:
+    lines = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if line:
+            lines.append(line[:MAX_LINE_CHARS])
+    return lines[:max_lines]
+
+
+def make_scanned_pdf(path: str, page_texts: List[str], scan_dpi: int = 200, noise: float = 0.02,
+                     max_skew: float = 1.0, seed: int = 0) -> List[str]:
+    """
+    Write an image-only PDF that looks like a scan of the given page texts.
+
+    Each page is typeset, rasterized, rotated by a small random angle, sprinkled with speckle
+    noise and embedded as an image, so the PDF has no text layer.
+
+    Args:
+        path: Where to write the PDF
+        page_texts: The text of each page
+        scan_dpi: The resolution of the simulated scan
+        noise: The fraction of pixels flipped to black
+        max_skew: The largest rotation of a page in degrees
+        seed: The seed for the skew and noise
+
+    Returns:
+        The text actually placed on each page, to score OCR against
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    truths = []
+    scanned = fitz.open()
+    for text in page_texts:
+        source = fitz.open()
+        page = source.new_page()
+        max_lines = int((page.rect.height - 2 * MARGIN) // LINE_HEIGHT)
+        lines = _page_lines(text, max_lines)
+        for i, line in enumerate(lines):
+            page.insert_text((MARGIN, MARGIN + (i + 1) * LINE_HEIGHT), line, fontsize=FONT_SIZE)
+        truths.append("\n".join(lines))
+
+        pix = page.get_pixmap(dpi=scan_dpi, colorspace=fitz.csGRAY)
+        image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        image = image.rotate(rng.uniform(-max_skew, max_skew), resample=Image.BILINEAR, fillcolor=255)
+        pixels = np.array(image)
+        pixels[np_rng.random(pixels.shape) < noise] = 0
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+
+        target = scanned.new_page(width=page.rect.width, height=page.rect.height)
+        target.insert_image(target.rect, stream=buffer.getvalue())
+        source.close()
+    scanned.save(path)
+    scanned.close()
+    return truths
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Compute the edit distance between two strings.
+
+    Uses the bit-parallel algorithm of Myers and Hyyrö with Python integers as bit vectors,
+    so a page of text is compared in milliseconds.
+
+    Args:
+        a: The first string
+        b: The second string
+
+    Returns:
+        The number of insertions, deletions and substitutions that turn a into b
+    """
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    pv, mv, score = full, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def character_error_rate(truth: str, recognized: str) -> float:
+    """
+    Get the character error rate of OCR output, ignoring differences in whitespace.
+
+    Args:
+        truth: The text that was rendered
+        recognized: The OCR output
+
+    Returns:
+        The edit distance divided by the length of the truth
+    """
+    truth = " ".join(truth.split())
+    recognized = " ".join(recognized.split())
+    return levenshtein(truth, recognized) / max(1, len(truth))
+
+
+def parse_backend(backend: str) -> dict:
+    """
+    Parse a backend such as "tesserocr", "pytesseract+preprocess" or "tesserocr+adaptive=75".
+
+    Args:
+        backend: The backend string
+
+    Returns:
+        The pdf_to_text_ocr keyword arguments for the backend
+    """
+    engine, *modifiers = backend.split('+')
+    if engine not in ("pytesseract", "tesserocr", "auto"):
+        raise argparse.ArgumentTypeError(f"Unknown OCR engine '{engine}'")
+    options = {'engine': engine, 'preprocess': False, 'adaptive_dpi': None}
+    for modifier in modifiers:
+        name, _, value = modifier.partition('=')
+        if name == "preprocess":
+            options['preprocess'] = True
+        elif name == "adaptive":
+            options['adaptive_dpi'] = int(value or 75)
+        else:
+            raise argparse.ArgumentTypeError(f"Unknown backend modifier '{modifier}'")
+    return options
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Get the peak resident set size of this process and of its largest child, in MB.
+
+    Returns:
+        The peak RSS, or None where the resource module is not available
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_config(pdf_paths: List[str], truths: List[List[str]], backend: str, dpi: int, workers: int) -> dict:
+    """
+    OCR every synthetic report with one configuration and measure the results.
+
+    Args:
+        pdf_paths: The synthetic scanned reports
+        truths: The rendered text of each page of each report
+        backend: The backend string (see parse_backend)
+        dpi: The DPI to OCR at
+        workers: The number of OCR worker processes
+
+    Returns:
+        A dictionary with the measured results
+    """
+    options = parse_backend(backend)
+    work_dir = tempfile.mkdtemp(prefix="rtmc_ocr_bench_")
+    latencies, error_rates, pages, elapsed = [], [], 0, 0.0
+    try:
+        for pdf_path, page_truths in zip(pdf_paths, truths):
+            # A fresh copy has an empty content store, so nothing is served from cache
+            local_path = os.path.join(work_dir, os.path.basename(pdf_path))
+            shutil.copy(pdf_path, local_path)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                text = pdf_to_text_ocr(local_path, dpi=dpi, save_output=False, workers=workers, **options)
+            elapsed += time.perf_counter() - start
+
+            page_texts = PAGE_HEADER_PATTERN.split(text)[1:]
+            for truth, recognized in zip(page_truths, page_texts + [""] * len(page_truths)):
+                error_rates.append(character_error_rate(truth, recognized))
+            pages += len(page_truths)
+
+            # The store only holds this run's pages, each cache entry records how long its page took
+            store_dir = os.path.join(work_dir, STORE_DIRNAME)
+            for entry_path in glob.glob(os.path.join(store_dir, "ocr_pages", "*", "*.json")):
+                with open(entry_path, "r", encoding="utf-8") as f:
+                    seconds = json.load(f).get('seconds')
+                if seconds is not None:
+                    latencies.append(seconds)
+            shutil.rmtree(store_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'backend': backend,
+        'dpi': dpi,
+        'workers': workers,
+        'pages': pages,
+        'seconds': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'rss_mb': peak_rss_mb(),
+        'cer': sum(error_rates) / len(error_rates) if error_rates else 1.0,
+    }
+
+
+def _run_child(queue, function, *args) -> None:
+    try:
+        queue.put(function(*args))
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def run_isolated(function, *args) -> dict:
+    """
+    Run a benchmark function in a fresh process so peak RSS and engine caches are per configuration.
+
+    Args:
+        function: A module-level function returning a dictionary of results
+        *args: The arguments of function
+
+    Returns:
+        The results of function, or a dictionary with an error message
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_child, args=(queue, function) + args)
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            # A child that died without reporting (e.g. killed for memory) would block forever
+            if not process.is_alive():
+                result = {'error': f"benchmark process exited with code {process.exitcode}"}
+                break
+    process.join()
+    return result
+
+
+def main():
+    """
+    Run the benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark OCR of synthetic scanned RTMC reports")
+    parser.add_argument("--corpus-dir", default=CORPUS_DIR, help="Directory holding the *_ocr.txt corpus")
+    parser.add_argument("--documents", type=int, default=2, help="Number of synthetic reports")
+    parser.add_argument("--pages", type=int, default=5, help="Pages per synthetic report")
+    parser.add_argument("--scan-dpi", type=int, default=200, help="Resolution of the simulated scans")
+    parser.add_argument("--noise", type=float, default=0.02, help="Fraction of speckled pixels")
+    parser.add_argument("--max-skew", type=float, default=1.0, help="Largest page rotation in degrees")
+    parser.add_argument("--dpi", nargs="+", type=int, default=[150], help="OCR DPIs to run")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, os.cpu_count() or 1],
+                        help="OCR worker counts to run")
+    parser.add_argument("--backends", nargs="+", default=["auto"],
+                        help="Backends to run, e.g. pytesseract tesserocr pytesseract+preprocess tesserocr+adaptive=75")
+    args = parser.parse_args()
+
+    for backend in args.backends:
+        parse_backend(backend)
+    corpus = load_corpus(args.corpus_dir, args.documents, args.pages)
+    if not corpus:
+        parser.error(f"No *_ocr.txt files found in {args.corpus_dir}")
+
+    source_dir = tempfile.mkdtemp(prefix="rtmc_ocr_corpus_")
+    try:
+        pdf_paths, truths = [], []
+        for i, page_texts in enumerate(corpus):
+            pdf_path = os.path.join(source_dir, f"scanned_{i:02d}.pdf")
+            truths.append(make_scanned_pdf(pdf_path, page_texts, args.scan_dpi, args.noise, args.max_skew, seed=i))
+            pdf_paths.append(pdf_path)
+
+        total_pages = sum(len(page_truths) for page_truths in truths)
+        print(f"Benchmarking OCR of {len(pdf_paths)} synthetic scanned reports, {total_pages} pages")
+        print(f"{'backend':<28} {'dpi':>4} {'workers':>7} {'pages/s':>8} {'p50 s':>7} {'p95 s':>7} {'RSS MB':>7} {'CER':>6}")
+        for backend in args.backends:
+            for dpi in args.dpi:
+                for workers in args.workers:
+                    result = run_isolated(run_config, pdf_paths, truths, backend, dpi, workers)
+                    if 'error' in result:
+                        print(f"{backend:<28} {dpi:>4} {workers:>7} failed: {result['error']}")
+                        continue
+                    rss = f"{result['rss_mb']:>7.0f}" if result['rss_mb'] is not None else f"{'n/a':>7}"
+                    print(f"{backend:<28} {dpi:>4} {workers:>7} {result['pages_per_sec']:>8.2f} {result['p50']:>7.3f} "
+                          f"{result['p95']:>7.3f} {rss} {result['cer']:>6.3f}")
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Table extraction benchmark for the RTMC PDF reader.
+
+Compares the text layer table extractors, tabula (Java) and PyMuPDF's native table finder, on
+the report corpus. Real reports are used when pdf_downloads/ holds PDFs; otherwise born-digital
+reports are built from the committed *_ocr.txt corpus with a ruled provincial table of known
+figures on one page. Each backend runs in a fresh process, so the first document includes
+tabula's JVM start-up, and reports documents/sec, per-document p50/p95 latency, peak RSS, the
+tables and accident records found and, for synthetic reports, the share of table figures recovered.
+
+Usage:
+    python -m benchmarks.table_benchmark --documents 5 --pages 8 --backends tabula pymupdf
+"""
+import os
+import io
+import glob
+import time
+import random
+import argparse
+import tempfile
+import shutil
+import contextlib
+from typing import Dict, List, Optional
+import fitz  # PyMuPDF
+
+from benchmarks.download_benchmark import percentile
+from benchmarks.ocr_benchmark import CORPUS_DIR, load_corpus, peak_rss_mb, run_isolated, _page_lines
+from Scraper.RTMC_Scraper.pdf_logic.pdf_reader import (
+    TABLE_BACKENDS, read_text_layer_tables, text_layer_table_pages, extract_accident_data_from_tables,
+)
+
+
+PROVINCE_NAMES = ["Eastern Cape", "Free State", "Gauteng", "KwaZulu-Natal", "Limpopo", "Mpumalanga",
+                  "North West", "Northern Cape", "Western Cape"]
+TABLE_HEADER = ["Province", "Fatal crashes", "Change %"]
+# Layout of the synthetic pages and table
+FONT_SIZE = 9
+LINE_HEIGHT = 12
+MARGIN = 50
+ROW_HEIGHT = 18
+COLUMN_WIDTHS = [150, 110, 80]
+
+
+def make_report_pdf(path: str, page_texts: List[str], seed: int = 0) -> Dict[str, int]:
+    """
+    Write a born-digital report with the given page texts and one ruled provincial table.
+
+    Args:
+        path: Where to write the PDF
+        page_texts: The text of each page
+        seed: The seed for the table page and its figures
+
+    Returns:
+        The fatal crashes of each province in the table
+    """
+    rng = random.Random(seed)
+    truth = {province: rng.randint(100, 3000) for province in PROVINCE_NAMES}
+    table_page = rng.randrange(len(page_texts))
+
+    document = fitz.open()
+    for number, text in enumerate(page_texts):
+        page = document.new_page()
+        if number != table_page:
+            max_lines = int((page.rect.height - 2 * MARGIN) // LINE_HEIGHT)
+            for i, line in enumerate(_page_lines(text, max_lines)):
+                page.insert_text((MARGIN, MARGIN + (i + 1) * LINE_HEIGHT), line, fontsize=FONT_SIZE)
+            continue
+
+        page.insert_text((MARGIN, MARGIN + LINE_HEIGHT), "Table 1: Fatal crashes per province", fontsize=FONT_SIZE + 2)
+        rows = [TABLE_HEADER] + [[province, f"{count:,}".replace(",", " "), f"{rng.uniform(-9, 9):.1f}"]
+                                 for province, count in truth.items()]
+        top = MARGIN + 2 * LINE_HEIGHT
+        edges = [MARGIN]
+        for width in COLUMN_WIDTHS:
+            edges.append(edges[-1] + width)
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                page.insert_text((edges[c] + 4, top + r * ROW_HEIGHT + ROW_HEIGHT - 5), cell, fontsize=FONT_SIZE)
+        bottom = top + len(rows) * ROW_HEIGHT
+        for r in range(len(rows) + 1):
+            page.draw_line((edges[0], top + r * ROW_HEIGHT), (edges[-1], top + r * ROW_HEIGHT))
+        for x in edges:
+            page.draw_line((x, top), (x, bottom))
+    document.save(path)
+    document.close()
+    return truth
+
+
+def run_backend(pdf_paths: List[str], truths: List[Optional[Dict[str, int]]], backend: str,
+                full_document: bool = False) -> dict:
+    """
+    Extract the tables of every report with one backend and measure the results.
+
+    Args:
+        pdf_paths: The reports
+        truths: The fatal crashes per province of each report, or None for real reports
+        backend: "tabula" or "pymupdf"
+        full_document: Whether to read every page instead of the likely table pages
+
+    Returns:
+        A dictionary with the measured results
+    """
+    latencies, tables_found, records_found, found, expected = [], 0, 0, 0, 0
+    for pdf_path, truth in zip(pdf_paths, truths):
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Both backends read the same pages, so only the extraction itself is timed
+            pages = text_layer_table_pages(pdf_path, full_document)
+            start = time.perf_counter()
+            tables = read_text_layer_tables(pdf_path, pages, backend)
+            latencies.append(time.perf_counter() - start)
+            records = extract_accident_data_from_tables(tables, 2020, "benchmark")
+        tables_found += len(tables)
+        records_found += len(records)
+        if truth:
+            extracted = {(str(record.region), record.accident_count) for record in records}
+            found += sum((province, count) in extracted for province, count in truth.items())
+            expected += len(truth)
+
+    elapsed = sum(latencies)
+    return {
+        'backend': backend,
+        'documents': len(pdf_paths),
+        'seconds': elapsed,
+        'first': latencies[0] if latencies else 0.0,
+        'docs_per_sec': len(pdf_paths) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'rss_mb': peak_rss_mb(),
+        'tables': tables_found,
+        'records': records_found,
+        'recall': found / expected if expected else None,
+    }
+
+
+def main():
+    """
+    Run the benchmark from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark tabula against PyMuPDF table extraction")
+    parser.add_argument("--pdf-dir", default=CORPUS_DIR, help="Directory of real reports to use if it holds PDFs")
+    parser.add_argument("--corpus-dir", default=CORPUS_DIR, help="Directory holding the *_ocr.txt corpus")
+    parser.add_argument("--documents", type=int, default=5, help="Number of synthetic reports")
+    parser.add_argument("--pages", type=int, default=8, help="Pages per synthetic report")
+    parser.add_argument("--full-document", action="store_true", help="Read every page instead of the table pages")
+    parser.add_argument("--backends", nargs="+", default=list(TABLE_BACKENDS), choices=TABLE_BACKENDS,
+                        help="Backends to run")
+    args = parser.parse_args()
+
+    source_dir = tempfile.mkdtemp(prefix="rtmc_table_corpus_")
+    try:
+        pdf_paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+        truths = [None] * len(pdf_paths)
+        if pdf_paths:
+            print(f"Benchmarking table extraction on {len(pdf_paths)} reports in {args.pdf_dir}")
+        else:
+            corpus = load_corpus(args.corpus_dir, args.documents, args.pages)
+            if not corpus:
+                parser.error(f"No PDFs in {args.pdf_dir} and no *_ocr.txt files in {args.corpus_dir}")
+            for i, page_texts in enumerate(corpus):
+                pdf_path = os.path.join(source_dir, f"report_{i:02d}.pdf")
+                truths.append(make_report_pdf(pdf_path, page_texts, seed=i))
+                pdf_paths.append(pdf_path)
+            print(f"Benchmarking table extraction on {len(pdf_paths)} synthetic reports")
+
+        print(f"{'backend':<10} {'docs/s':>7} {'first s':>8} {'p50 s':>7} {'p95 s':>7} {'RSS MB':>7} "
+              f"{'tables':>7} {'records':>8} {'recall':>7}")
+        for backend in args.backends:
+            result = run_isolated(run_backend, pdf_paths, truths, backend, args.full_document)
+            if 'error' in result:
+                print(f"{backend:<10} failed: {result['error']}")
+                continue
+            rss = f"{result['rss_mb']:>7.0f}" if result['rss_mb'] is not None else f"{'n/a':>7}"
+            recall = f"{result['recall']:>7.2f}" if result['recall'] is not None else f"{'n/a':>7}"
+            print(f"{backend:<10} {result['docs_per_sec']:>7.2f} {result['first']:>8.3f} {result['p50']:>7.3f} "
+                  f"{result['p95']:>7.3f} {rss} {result['tables']:>7} {result['records']:>8} {recall}")
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()